@@ -5,14 +5,16 @@ import os
 import sys
 from time import time
 from collections import OrderedDict
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, Iterable, List
 
 import voluptuous as vol
 
 from homeassistant import (
-    core, config as conf_util, config_entries, components as core_components)
+    core, config as conf_util, config_entries, components as core_components,
+    loader, requirements)
 from homeassistant.components import persistent_notification
 from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.helpers import config_per_platform, template
 from homeassistant.setup import async_setup_component
 from homeassistant.util.logging import AsyncHandler
 from homeassistant.util.package import async_get_user_site, is_virtual_env
@@ -128,6 +130,12 @@ async def async_from_config_dict(config: Dict[str, Any],
                      if key != core.DOMAIN)
     components.update(hass.config_entries.async_domains())
 
+    # Install the requirements of all components at once. Components whose
+    # requirements are still missing install them during their own setup.
+    if not skip_pip:
+        await requirements.async_process_requirements_batch(
+            hass, _collect_requirements(hass, config, components))
+
     # setup components
     res = await core_components.async_setup(hass, config)
     if not res:
@@ -157,6 +165,7 @@ async def async_from_config_dict(config: Dict[str, Any],
 
     stop = time()
     _LOGGER.info("Home Assistant initialized in %.2fs", stop-start)
+    _LOGGER.debug("Template caches: %s", template.cache_info(hass))
 
     return hass
 
@@ -325,3 +334,53 @@ async def async_mount_local_lib_path(config_dir: str) -> str:
     if lib_dir not in sys.path:
         sys.path.insert(0, lib_dir)
     return deps_dir
+
+
+def _collect_requirements(hass: core.HomeAssistant, config: Dict[str, Any],
+                          components: Iterable[str]) -> Dict[str, List[str]]:
+    """Return the requirements of the components and configured platforms.
+
+    Includes the requirements of the dependencies of the components.
+    Async friendly.
+    """
+    reqs = {}  # type: Dict[str, List[str]]
+    to_check = list(components)
+
+    # Modules importing their requirements at the top level can't be loaded
+    # before these are installed. Their setup loads them again and reports
+    # the errors that remain then.
+    loader_logger = logging.getLogger(loader.__name__)
+    loader_logger.addFilter(_drop_errors)
+    try:
+        while to_check:
+            domain = to_check.pop()
+            if domain in reqs:
+                continue
+
+            component = loader.get_component(hass, domain)
+            if component is None:
+                continue
+
+            reqs[domain] = getattr(component, 'REQUIREMENTS', [])
+            to_check.extend(getattr(component, 'DEPENDENCIES', []))
+
+            for p_name, _ in config_per_platform(config, domain):
+                name = '{}.{}'.format(domain, p_name)
+                if p_name is None or name in reqs:
+                    continue
+
+                platform = loader.get_platform(hass, domain, p_name)
+                if platform is None:
+                    continue
+
+                reqs[name] = getattr(platform, 'REQUIREMENTS', [])
+                to_check.extend(getattr(platform, 'DEPENDENCIES', []))
+    finally:
+        loader_logger.removeFilter(_drop_errors)
+
+    return reqs
+
+
+def _drop_errors(record: logging.LogRecord) -> bool:
+    """Filter out log records of level error and above."""
+    return record.levelno < logging.ERROR
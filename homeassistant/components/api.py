@@ -14,17 +14,18 @@ import async_timeout
 from homeassistant.bootstrap import DATA_LOGGING
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
-    EVENT_HOMEASSISTANT_STOP, EVENT_TIME_CHANGED, HTTP_BAD_REQUEST,
-    HTTP_CREATED, HTTP_NOT_FOUND, MATCH_ALL, URL_API, URL_API_COMPONENTS,
-    URL_API_CONFIG, URL_API_DISCOVERY_INFO, URL_API_ERROR_LOG, URL_API_EVENTS,
-    URL_API_SERVICES, URL_API_STATES, URL_API_STATES_ENTITY, URL_API_STREAM,
-    URL_API_TEMPLATE, __version__)
+    EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED,
+    HTTP_BAD_REQUEST, HTTP_CREATED, HTTP_NOT_FOUND, MATCH_ALL, URL_API,
+    URL_API_COMPONENTS, URL_API_CONFIG, URL_API_DISCOVERY_INFO,
+    URL_API_ERROR_LOG, URL_API_EVENTS, URL_API_SERVICES, URL_API_STATES,
+    URL_API_STATES_ENTITY, URL_API_STREAM, URL_API_TEMPLATE, __version__)
 import homeassistant.core as ha
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers import template
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.state import AsyncTrackStates
 from homeassistant.helpers.json import JSONEncoder
+from homeassistant.util.coalescing_queue import CoalescingQueue
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,6 +39,7 @@ DEPENDENCIES = ['http']
 
 STREAM_PING_PAYLOAD = 'ping'
 STREAM_PING_INTERVAL = 50  # seconds
+STREAM_MAX_PENDING = 512
 
 
 def setup(hass, config):
@@ -83,13 +85,22 @@ class APIEventStream(HomeAssistantView):
         """Provide a streaming interface for the event bus."""
         hass = request.app['hass']
         stop_obj = object()
-        to_write = asyncio.Queue(loop=hass.loop)
+        # Pending state changes of an entity are replaced by newer ones
+        to_write = CoalescingQueue(hass.loop, STREAM_MAX_PENDING)
+
+        # Py3.7+
+        if hasattr(asyncio, 'current_task'):
+            # pylint: disable=no-member
+            stream_task = asyncio.current_task()
+        else:
+            stream_task = asyncio.Task.current_task(loop=hass.loop)
 
         restrict = request.query.get('restrict')
         if restrict:
             restrict = restrict.split(',') + [EVENT_HOMEASSISTANT_STOP]
 
-        async def forward_events(event):
+        @ha.callback
+        def forward_events(event):
             """Forward events to the open request."""
             if event.event_type == EVENT_TIME_CHANGED:
                 return
@@ -99,12 +110,20 @@ class APIEventStream(HomeAssistantView):
 
             _LOGGER.debug("STREAM %s FORWARDING %s", id(stop_obj), event)
 
+            key = None
             if event.event_type == EVENT_HOMEASSISTANT_STOP:
                 data = stop_obj
             else:
                 data = json.dumps(event, cls=JSONEncoder)
+                if event.event_type == EVENT_STATE_CHANGED:
+                    key = event.data.get('entity_id')
 
-            await to_write.put(data)
+            try:
+                to_write.put_nowait(data, key)
+            except asyncio.QueueFull:
+                _LOGGER.error("STREAM %s exceeded max pending messages: %s",
+                              id(stop_obj), STREAM_MAX_PENDING)
+                stream_task.cancel()
 
         response = web.StreamResponse()
         response.content_type = 'text/event-stream'
@@ -116,29 +135,35 @@ class APIEventStream(HomeAssistantView):
             _LOGGER.debug("STREAM %s ATTACHED", id(stop_obj))
 
             # Fire off one message so browsers fire open event right away
-            await to_write.put(STREAM_PING_PAYLOAD)
+            to_write.put_nowait(STREAM_PING_PAYLOAD)
 
-            while True:
+            stop = False
+            while not stop:
                 try:
                     with async_timeout.timeout(STREAM_PING_INTERVAL,
                                                loop=hass.loop):
-                        payload = await to_write.get()
+                        payloads = await to_write.get_batch()
 
-                    if payload is stop_obj:
-                        break
+                    # All pending messages are written at once
+                    if stop_obj in payloads:
+                        stop = True
+                        payloads = payloads[:payloads.index(stop_obj)]
 
-                    msg = "data: {}\n\n".format(payload)
+                    msg = "".join(
+                        "data: {}\n\n".format(payload) for payload in payloads)
                     _LOGGER.debug(
                         "STREAM %s WRITING %s", id(stop_obj), msg.strip())
                     await response.write(msg.encode('UTF-8'))
                 except asyncio.TimeoutError:
-                    await to_write.put(STREAM_PING_PAYLOAD)
+                    to_write.put_nowait(STREAM_PING_PAYLOAD)
 
         except asyncio.CancelledError:
             _LOGGER.debug("STREAM %s ABORT", id(stop_obj))
 
         finally:
-            _LOGGER.debug("STREAM %s RESPONSE CLOSED", id(stop_obj))
+            _LOGGER.debug("STREAM %s RESPONSE CLOSED, max %s messages "
+                          "pending, %s coalesced", id(stop_obj),
+                          to_write.max_qsize, to_write.coalesced)
             unsub_stream()
 
         return response
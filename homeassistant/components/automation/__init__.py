@@ -6,7 +6,9 @@ https://home-assistant.io/components/automation/
 """
 import asyncio
 from functools import partial
+import hashlib
 import importlib
+import json
 import logging
 
 import voluptuous as vol
@@ -156,8 +158,8 @@ async def async_setup(hass, config):
             await asyncio.wait(tasks, loop=hass.loop)
 
     async def reload_service_handler(service_call):
-        """Remove all automations and load new ones from config."""
-        conf = await component.async_prepare_reload()
+        """Replace the automations whose config changed."""
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
         await _async_process_config(hass, conf, component)
@@ -185,6 +187,9 @@ async def async_setup(hass, config):
 class AutomationEntity(ToggleEntity):
     """Entity to show status of entity."""
 
+    # Identifies the config the automation was created from
+    config_hash = None
+
     def __init__(self, automation_id, name, async_attach_triggers, cond_func,
                  async_action, hidden, initial_state):
         """Initialize an automation entity."""
@@ -316,12 +321,34 @@ class AutomationEntity(ToggleEntity):
         }
 
 
+def _config_hash(name, config_block):
+    """Return a hash of the validated config of an automation.
+
+    Returns None if the config can not be serialized, such automations are
+    always treated as changed.
+    """
+    try:
+        dumped = json.dumps(
+            [name, config_block], sort_keys=True,
+            default=lambda value: getattr(value, 'template', str(value)))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(dumped.encode('utf-8')).hexdigest()
+
+
 async def _async_process_config(hass, config, component):
     """Process config and add automations.
 
+    Automations whose config is unchanged are kept running, automations
+    that are no longer in the config are removed.
+
     This method is a coroutine.
     """
     entities = []
+    unchanged = {}
+
+    for entity in component.entities:
+        unchanged.setdefault(entity.config_hash, []).append(entity)
 
     for config_key in extract_domain_configs(config, DOMAIN):
         conf = config[config_key]
@@ -331,6 +358,11 @@ async def _async_process_config(hass, config, component):
             name = config_block.get(CONF_ALIAS) or "{} {}".format(config_key,
                                                                   list_no)
 
+            config_hash = _config_hash(name, config_block)
+            if config_hash is not None and unchanged.get(config_hash):
+                unchanged[config_hash].pop()
+                continue
+
             hidden = config_block[CONF_HIDE_ENTITY]
             initial_state = config_block.get(CONF_INITIAL_STATE)
 
@@ -354,9 +386,16 @@ async def _async_process_config(hass, config, component):
             entity = AutomationEntity(
                 automation_id, name, async_attach_triggers, cond_func, action,
                 hidden, initial_state)
+            entity.config_hash = config_hash
 
             entities.append(entity)
 
+    # Remove the old automations first, so changed automations keep their
+    # entity ids.
+    for removed in unchanged.values():
+        for entity in removed:
+            await component.async_remove_entity(entity.entity_id)
+
     if entities:
         await component.async_add_entities(entities)
 
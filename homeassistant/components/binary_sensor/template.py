@@ -16,11 +16,10 @@ from homeassistant.const import (
     ATTR_FRIENDLY_NAME, ATTR_ENTITY_ID, CONF_VALUE_TEMPLATE,
     CONF_ICON_TEMPLATE, CONF_ENTITY_PICTURE_TEMPLATE,
     CONF_SENSORS, CONF_DEVICE_CLASS, EVENT_HOMEASSISTANT_START, MATCH_ALL)
-from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import async_generate_entity_id
 from homeassistant.helpers.event import (
-    async_track_state_change, async_track_same_state)
+    RenderInfoTracker, async_track_state_change, async_track_same_state)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -55,31 +54,12 @@ async def async_setup_platform(hass, config, async_add_entities,
         icon_template = device_config.get(CONF_ICON_TEMPLATE)
         entity_picture_template = device_config.get(
             CONF_ENTITY_PICTURE_TEMPLATE)
-        entity_ids = set()
-        manual_entity_ids = device_config.get(ATTR_ENTITY_ID)
-
-        for template in (
-                value_template,
-                icon_template,
-                entity_picture_template,
-        ):
-            if template is None:
-                continue
-            template.hass = hass
-
-            if manual_entity_ids is not None:
-                continue
-
-            template_entity_ids = template.extract_entities()
-            if template_entity_ids == MATCH_ALL:
-                entity_ids = MATCH_ALL
-            elif entity_ids != MATCH_ALL:
-                entity_ids |= set(template_entity_ids)
+        entity_ids = device_config.get(ATTR_ENTITY_ID)
 
-        if manual_entity_ids is not None:
-            entity_ids = manual_entity_ids
-        elif entity_ids != MATCH_ALL:
-            entity_ids = list(entity_ids)
+        for template in (value_template, icon_template,
+                         entity_picture_template):
+            if template is not None:
+                template.hass = hass
 
         friendly_name = device_config.get(ATTR_FRIENDLY_NAME, device)
         device_class = device_config.get(CONF_DEVICE_CLASS)
@@ -121,25 +101,36 @@ class BinarySensorTemplate(BinarySensorDevice):
         self._entities = entity_ids
         self._delay_on = delay_on
         self._delay_off = delay_off
+        self._tracker = None
 
     async def async_added_to_hass(self):
         """Register callbacks."""
         @callback
-        def template_bsensor_state_listener(entity, old_state, new_state):
+        def template_bsensor_state_listener(*args):
             """Handle the target device state changes."""
             self.async_check_state()
 
         @callback
         def template_bsensor_startup(event):
             """Update template on startup."""
-            async_track_state_change(
-                self.hass, self._entities, template_bsensor_state_listener)
+            if self._entities is not None:
+                async_track_state_change(
+                    self.hass, self._entities, template_bsensor_state_listener)
+            else:
+                # Follow the states accessed by the last render
+                self._tracker = RenderInfoTracker(
+                    self.hass, template_bsensor_state_listener)
 
             self.hass.async_add_job(self.async_check_state)
 
         self.hass.bus.async_listen_once(
             EVENT_HOMEASSISTANT_START, template_bsensor_startup)
 
+    async def async_will_remove_from_hass(self):
+        """Stop following the states accessed by the templates."""
+        if self._tracker is not None:
+            self._tracker.async_remove()
+
     @property
     def name(self):
         """Return the name of the sensor."""
@@ -173,16 +164,30 @@ class BinarySensorTemplate(BinarySensorDevice):
     @callback
     def _async_render(self):
         """Get the state of template."""
+        render_infos = []
+        state = self._async_render_templates(render_infos)
+
+        if self._tracker is not None:
+            self._tracker.async_update(*render_infos)
+
+        return state
+
+    @callback
+    def _async_render_templates(self, render_infos):
+        """Render the templates, adding their render infos to the list."""
         state = None
-        try:
-            state = (self._template.async_render().lower() == 'true')
-        except TemplateError as ex:
-            if ex.args and ex.args[0].startswith(
-                    "UndefinedError: 'None' has no attribute"):
-                # Common during HA startup - so just a warning
-                _LOGGER.warning("Could not render template %s, "
-                                "the state is unknown", self._name)
-                return
+        render_info = self._template.async_render_to_info()
+        render_infos.append(render_info)
+        ex = render_info.exception
+        if ex is None:
+            state = (render_info.result.lower() == 'true')
+        elif ex.args and ex.args[0].startswith(
+                "UndefinedError: 'None' has no attribute"):
+            # Common during HA startup - so just a warning
+            _LOGGER.warning("Could not render template %s, "
+                            "the state is unknown", self._name)
+            return
+        else:
             _LOGGER.error("Could not render template %s: %s", self._name, ex)
 
         for property_name, template in (
@@ -191,20 +196,24 @@ class BinarySensorTemplate(BinarySensorDevice):
             if template is None:
                 continue
 
-            try:
-                setattr(self, property_name, template.async_render())
-            except TemplateError as ex:
-                friendly_property_name = property_name[1:].replace('_', ' ')
-                if ex.args and ex.args[0].startswith(
-                        "UndefinedError: 'None' has no attribute"):
-                    # Common during HA startup - so just a warning
-                    _LOGGER.warning('Could not render %s template %s,'
-                                    ' the state is unknown.',
-                                    friendly_property_name, self._name)
-                else:
-                    _LOGGER.error('Could not render %s template %s: %s',
-                                  friendly_property_name, self._name, ex)
-                return state
+            render_info = template.async_render_to_info()
+            render_infos.append(render_info)
+            ex = render_info.exception
+            if ex is None:
+                setattr(self, property_name, render_info.result)
+                continue
+
+            friendly_property_name = property_name[1:].replace('_', ' ')
+            if ex.args and ex.args[0].startswith(
+                    "UndefinedError: 'None' has no attribute"):
+                # Common during HA startup - so just a warning
+                _LOGGER.warning('Could not render %s template %s,'
+                                ' the state is unknown.',
+                                friendly_property_name, self._name)
+            else:
+                _LOGGER.error('Could not render %s template %s: %s',
+                              friendly_property_name, self._name, ex)
+            return state
 
         return state
 
@@ -230,6 +239,12 @@ class BinarySensorTemplate(BinarySensorDevice):
             return
 
         period = self._delay_on if state else self._delay_off
+        if self._entities is not None:
+            entity_ids = self._entities
+        elif self._tracker is not None:
+            entity_ids = self._tracker.entity_ids
+        else:
+            entity_ids = MATCH_ALL
         async_track_same_state(
-            self.hass, period, set_state, entity_ids=self._entities,
+            self.hass, period, set_state, entity_ids=entity_ids,
             async_check_same_func=lambda *args: self._async_render() == state)
@@ -59,6 +59,7 @@ _RND = SystemRandom()
 
 FALLBACK_STREAM_INTERVAL = 1  # seconds
 MIN_STREAM_INTERVAL = 0.5  # seconds
+FRAME_CACHE_TTL = 0.5  # seconds
 
 CAMERA_SERVICE_SCHEMA = vol.Schema({
     vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
@@ -83,6 +84,63 @@ class Image:
     content = attr.ib(type=bytes)
 
 
+class FrameBroker:
+    """Share the images of a camera between everyone watching it.
+
+    An image is fetched from the camera at most once per FRAME_CACHE_TTL,
+    requests that come in while it is being fetched wait for that fetch.
+    Keeps track of the number of fetched and served images.
+    """
+
+    def __init__(self, camera):
+        """Initialize the frame broker."""
+        self.camera = camera
+        self.fetches = 0
+        self.serves = 0
+        self._image = None
+        self._fetched = None
+        self._fetch = None
+
+    async def async_get_image(self):
+        """Return the latest image of the camera.
+
+        This method must be run in the event loop.
+        """
+        loop = self.camera.hass.loop
+        self.serves += 1
+
+        if self._fetched is not None and \
+                loop.time() - self._fetched < FRAME_CACHE_TTL:
+            return self._image
+
+        if self._fetch is None:
+            self._fetch = loop.create_task(self._async_fetch_image())
+            self._fetch.add_done_callback(self._fetch_done)
+
+        # A viewer that goes away doesn't cancel the fetch of the others
+        return await asyncio.shield(self._fetch, loop=loop)
+
+    async def _async_fetch_image(self):
+        """Fetch an image from the camera."""
+        self.fetches += 1
+        try:
+            image = await self.camera.async_camera_image()
+        finally:
+            self._fetch = None
+
+        if image:
+            self._image = image
+            self._fetched = self.camera.hass.loop.time()
+
+        return image
+
+    def _fetch_done(self, fetch):
+        """Retrieve the error of a fetch all waiters gave up on."""
+        if not fetch.cancelled() and fetch.exception() is not None:
+            _LOGGER.debug("Error fetching image of %s: %s",
+                          self.camera.entity_id, fetch.exception())
+
+
 @bind_hass
 async def async_get_image(hass, entity_id, timeout=10):
     """Fetch an image from a camera entity."""
@@ -90,7 +148,7 @@ async def async_get_image(hass, entity_id, timeout=10):
 
     with suppress(asyncio.CancelledError, asyncio.TimeoutError):
         with async_timeout.timeout(timeout, loop=hass.loop):
-            image = await camera.async_camera_image()
+            image = await camera.frame_broker.async_get_image()
 
             if image:
                 return Image(camera.content_type, image)
@@ -225,6 +283,8 @@ async def async_unload_entry(hass, entry):
 class Camera(Entity):
     """The base class for camera entities."""
 
+    _frame_broker = None
+
     def __init__(self):
         """Initialize a camera."""
         self.is_streaming = False
@@ -267,6 +327,13 @@ class Camera(Entity):
         """Return the camera model."""
         return None
 
+    @property
+    def frame_broker(self):
+        """Return the frame broker that shares images of this camera."""
+        if self._frame_broker is None:
+            self._frame_broker = FrameBroker(self)
+        return self._frame_broker
+
     @property
     def frame_interval(self):
         """Return the interval between frames of the mjpeg stream."""
@@ -289,8 +356,9 @@ class Camera(Entity):
 
         This method must be run in the event loop.
         """
-        return await async_get_still_stream(request, self.async_camera_image,
-                                            self.content_type, interval)
+        return await async_get_still_stream(
+            request, self.frame_broker.async_get_image, self.content_type,
+            interval)
 
     async def handle_async_mjpeg_stream(self, request):
         """Serve an HTTP MJPEG stream from the camera.
@@ -420,7 +488,7 @@ class CameraImageView(CameraView):
         """Serve camera image."""
         with suppress(asyncio.CancelledError, asyncio.TimeoutError):
             with async_timeout.timeout(10, loop=request.app['hass'].loop):
-                image = await camera.async_camera_image()
+                image = await camera.frame_broker.async_get_image()
 
             if image:
                 return web.Response(body=image,
@@ -9,7 +9,6 @@ import logging
 
 import voluptuous as vol
 
-from homeassistant import core as ha
 from homeassistant.const import (
     ATTR_ENTITY_ID, CONF_ICON, CONF_NAME, STATE_CLOSED, STATE_HOME,
     STATE_NOT_HOME, STATE_OFF, STATE_ON, STATE_OPEN, STATE_LOCKED,
@@ -26,6 +25,9 @@ from homeassistant.util.async_ import run_coroutine_threadsafe
 DOMAIN = 'group'
 
 ENTITY_ID_FORMAT = DOMAIN + '.{}'
+ENTITY_ID_PREFIX = DOMAIN + '.'
+
+DATA_EXPANDED = 'group_expanded'
 
 CONF_ENTITIES = 'entities'
 CONF_VIEW = 'view'
@@ -131,35 +133,84 @@ def expand_entity_ids(hass, entity_ids):
     Async friendly.
     """
     found_ids = []
+    found = set()
     for entity_id in entity_ids:
         if not isinstance(entity_id, str):
             continue
 
         entity_id = entity_id.lower()
 
-        try:
-            # If entity_id points at a group, expand it
-            domain, _ = ha.split_entity_id(entity_id)
+        # If entity_id points at a group, expand it
+        if entity_id.startswith(ENTITY_ID_PREFIX):
+            members = _expand_group(hass, entity_id)
+        else:
+            members = (entity_id,)
 
-            if domain == DOMAIN:
-                child_entities = get_entity_ids(hass, entity_id)
-                if entity_id in child_entities:
-                    child_entities = list(child_entities)
-                    child_entities.remove(entity_id)
-                found_ids.extend(
-                    ent_id for ent_id
-                    in expand_entity_ids(hass, child_entities)
-                    if ent_id not in found_ids)
+        for member in members:
+            if member not in found:
+                found.add(member)
+                found_ids.append(member)
 
-            else:
-                if entity_id not in found_ids:
-                    found_ids.append(entity_id)
+    return found_ids
 
-        except AttributeError:
-            # Raised by split_entity_id if entity_id is not a string
-            pass
 
-    return found_ids
+def _group_members(hass, entity_id):
+    """Return the entity_id attribute of a group state or None."""
+    group = hass.states.get(entity_id)
+
+    if group is None:
+        return None
+
+    return group.attributes.get(ATTR_ENTITY_ID)
+
+
+def _expand_group(hass, entity_id):
+    """Return the flattened members of a group.
+
+    The result is cached together with the member attributes of every group
+    it was expanded from. A group state written with new members, e.g. by
+    the set or reload services, holds a new attribute object and so
+    invalidates all cached expansions that include it.
+
+    Async friendly.
+    """
+    cache = hass.data.setdefault(DATA_EXPANDED, {})
+    cached = cache.get(entity_id)
+
+    if cached is not None:
+        sources, members = cached
+        if all(_group_members(hass, group_id) is group_members
+               for group_id, group_members in sources):
+            return members
+
+    sources = []
+    members = tuple(_expand_group_members(
+        hass, entity_id, sources, set()))
+    cache[entity_id] = (sources, members)
+    return members
+
+
+def _expand_group_members(hass, entity_id, sources, seen):
+    """Yield the members of a group, expanding nested groups."""
+    group_members = _group_members(hass, entity_id)
+    sources.append((entity_id, group_members))
+    seen.add(entity_id)
+
+    for member in group_members or ():
+        if not isinstance(member, str):
+            continue
+
+        member = member.lower()
+
+        if member in seen:
+            # The group itself or a group that is already expanded
+            continue
+
+        if member.startswith(ENTITY_ID_PREFIX):
+            yield from _expand_group_members(
+                hass, member, sources, seen)
+        else:
+            yield member
 
 
 @bind_hass
@@ -358,6 +409,10 @@ class Group(Entity):
         self._order = order
         self._assumed_state = False
         self._async_unsub_state_changed = None
+        # Per member (is on, is assumed) and their running totals
+        self._member_counts = {}
+        self._on_count = 0
+        self._assumed_count = 0
 
     @staticmethod
     def create_group(hass, name, entity_ids=None, user_defined=True,
@@ -537,66 +592,82 @@ class Group(Entity):
 
         return states
 
+    @callback
+    def _async_count_member(self, entity_id, state):
+        """Replace the contribution of a member to the group counters.
+
+        This method must be run in the event loop.
+        """
+        previous = self._member_counts.pop(entity_id, None)
+        if previous is not None:
+            self._on_count -= previous[0]
+            self._assumed_count -= previous[1]
+
+        if state is None:
+            return
+
+        counts = (state.state == self.group_on,
+                  bool(state.attributes.get(ATTR_ASSUMED_STATE)))
+        self._member_counts[entity_id] = counts
+        self._on_count += counts[0]
+        self._assumed_count += counts[1]
+
+    @callback
+    def _async_count_members(self):
+        """Recount the contributions of all members.
+
+        This method must be run in the event loop.
+        """
+        self._member_counts = {}
+        self._on_count = 0
+        self._assumed_count = 0
+
+        for entity_id in self.tracking:
+            self._async_count_member(
+                entity_id, self.hass.states.get(entity_id))
+
     @callback
     def _async_update_group_state(self, tr_state=None):
         """Update group state.
 
-        Optionally you can provide the only state changed since last update
-        allowing this method to take shortcuts.
+        Optionally you can provide the only state changed since last update,
+        then only the contribution of that member is counted again instead
+        of querying all members.
 
         This method must be run in the event loop.
         """
-        # To store current states of group entities. Might not be needed.
-        states = None
-        gr_state = self._state
-        gr_on = self.group_on
-        gr_off = self.group_off
-
         # We have not determined type of group yet
-        if gr_on is None:
+        if self.group_on is None:
             if tr_state is None:
-                states = self._tracking_states
-
-                for state in states:
-                    gr_on, gr_off = \
-                        _get_group_on_off(state.state)
+                for state in self._tracking_states:
+                    gr_on, gr_off = _get_group_on_off(state.state)
                     if gr_on is not None:
                         break
+                else:
+                    gr_on, gr_off = None, None
             else:
                 gr_on, gr_off = _get_group_on_off(tr_state.state)
 
-            if gr_on is not None:
-                self.group_on, self.group_off = gr_on, gr_off
+            # We cannot determine state of the group
+            if gr_on is None:
+                return
 
-        # We cannot determine state of the group
-        if gr_on is None:
-            return
-
-        # pylint: disable=too-many-boolean-expressions
-        if tr_state is None or ((gr_state == gr_on and
-                                 tr_state.state == gr_off) or
-                                (gr_state == gr_off and
-                                 tr_state.state == gr_on) or
-                                tr_state.state not in (gr_on, gr_off)):
-            if states is None:
-                states = self._tracking_states
-
-            if self.mode(state.state == gr_on for state in states):
-                self._state = gr_on
-            else:
-                self._state = gr_off
+            self.group_on, self.group_off = gr_on, gr_off
+            # Members were not counted without knowing the on state
+            tr_state = None
 
-        elif tr_state.state in (gr_on, gr_off):
-            self._state = tr_state.state
+        if tr_state is None:
+            self._async_count_members()
+        else:
+            self._async_count_member(tr_state.entity_id, tr_state)
 
-        if tr_state is None or self._assumed_state and \
-           not tr_state.attributes.get(ATTR_ASSUMED_STATE):
-            if states is None:
-                states = self._tracking_states
+        members = len(self._member_counts)
 
-            self._assumed_state = self.mode(
-                state.attributes.get(ATTR_ASSUMED_STATE) for state
-                in states)
+        if self.mode is all:
+            member_on = self._on_count == members
+            self._assumed_state = self._assumed_count == members
+        else:
+            member_on = self._on_count > 0
+            self._assumed_state = self._assumed_count > 0
 
-        elif tr_state.attributes.get(ATTR_ASSUMED_STATE):
-            self._assumed_state = True
+        self._state = self.group_on if member_on else self.group_off
@@ -8,6 +8,7 @@ from collections import defaultdict
 from datetime import timedelta
 from itertools import groupby
 import logging
+import math
 import time
 
 import voluptuous as vol
@@ -18,6 +19,7 @@ import homeassistant.util.dt as dt_util
 from homeassistant.components import recorder, script
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import ATTR_HIDDEN
+from homeassistant.core import EXECUTOR_DATABASE
 from homeassistant.components.recorder.util import session_scope, execute
 import homeassistant.helpers.config_validation as cv
 
@@ -34,6 +36,14 @@ CONFIG_SCHEMA = vol.Schema({
     })
 }, extra=vol.ALLOW_EXTRA)
 
+AGGREGATION_LAST = 'last'
+AGGREGATION_LTTB = 'lttb'
+AGGREGATION_MAX = 'max'
+AGGREGATION_MEAN = 'mean'
+AGGREGATION_MIN = 'min'
+AGGREGATIONS = (AGGREGATION_LAST, AGGREGATION_LTTB, AGGREGATION_MAX,
+                AGGREGATION_MEAN, AGGREGATION_MIN)
+
 SIGNIFICANT_DOMAINS = ('thermostat', 'climate')
 IGNORE_DOMAINS = ('zone', 'scene',)
 
@@ -63,9 +73,12 @@ def get_significant_states(hass, start_time, end_time=None, entity_ids=None,
     """
     timer_start = time.perf_counter()
     from homeassistant.components.recorder.models import States
+    from sqlalchemy.orm import joinedload
 
     with session_scope(hass=hass) as session:
-        query = session.query(States).filter(
+        query = session.query(States).options(
+            joinedload(States.state_attributes)
+        ).filter(
             (States.domain.in_(SIGNIFICANT_DOMAINS) |
              (States.last_changed == States.last_updated)) &
             (States.last_updated > start_time))
@@ -97,9 +110,12 @@ def state_changes_during_period(hass, start_time, end_time=None,
                                 entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
     from homeassistant.components.recorder.models import States
+    from sqlalchemy.orm import joinedload
 
     with session_scope(hass=hass) as session:
-        query = session.query(States).filter(
+        query = session.query(States).options(
+            joinedload(States.state_attributes)
+        ).filter(
             (States.last_changed == States.last_updated) &
             (States.last_updated > start_time))
 
@@ -120,11 +136,14 @@ def state_changes_during_period(hass, start_time, end_time=None,
 def get_last_state_changes(hass, number_of_states, entity_id):
     """Return the last number_of_states."""
     from homeassistant.components.recorder.models import States
+    from sqlalchemy.orm import joinedload
 
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        query = session.query(States).filter(
+        query = session.query(States).options(
+            joinedload(States.state_attributes)
+        ).filter(
             (States.last_changed == States.last_updated))
 
         if entity_id is not None:
@@ -154,6 +173,7 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None,
             return []
 
     from sqlalchemy import and_, func
+    from sqlalchemy.orm import joinedload
 
     with session_scope(hass=hass) as session:
         if entity_ids and len(entity_ids) == 1:
@@ -203,7 +223,9 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None,
 
         most_recent_state_ids = most_recent_state_ids.subquery()
 
-        query = session.query(States).join(
+        query = session.query(States).options(
+            joinedload(States.state_attributes)
+        ).join(
             most_recent_state_ids,
             States.state_id == most_recent_state_ids.c.max_state_id
         ).filter((~States.domain.in_(IGNORE_DOMAINS)))
@@ -252,6 +274,186 @@ def states_to_json(
     return result
 
 
+def get_numeric_states(hass, start_time, end_time=None, entity_ids=None,
+                       filters=None, include_start_time_state=True,
+                       resolution=None, aggregation=AGGREGATION_LAST):
+    """Return numeric state changes during UTC period as compact arrays.
+
+    Only the entity_id, last_updated and state columns are selected, the
+    attributes are never decoded, so hidden entities are not filtered out.
+    States that are not numbers are skipped.
+    The result is {'entity_id': {'timestamps': [...], 'values': [...]}}
+    with UNIX timestamps in seconds.
+
+    If resolution (in seconds) is given, the values are aggregated in a
+    single pass over the rows. For min, max, mean and last one value is
+    returned per period of that length, timestamped at the period start.
+    For lttb the series is decimated with Largest-Triangle-Three-Buckets
+    to at most one point per period, keeping the shape of the curve.
+    """
+    timer_start = time.perf_counter()
+    from homeassistant.components.recorder.models import States
+
+    result = defaultdict(lambda: _NumericSeries(resolution, aggregation))
+
+    if include_start_time_state:
+        start_timestamp = start_time.timestamp()
+        for state in get_states(hass, start_time, entity_ids, filters=filters):
+            value = _numeric_value(state.state)
+            if value is not None:
+                result[state.entity_id].add(start_timestamp, value)
+
+    with session_scope(hass=hass) as session:
+        query = session.query(
+            States.entity_id, States.last_updated, States.state
+        ).filter(
+            (States.last_changed == States.last_updated) &
+            (States.last_updated > start_time))
+
+        if filters:
+            query = filters.apply(query, entity_ids)
+        elif entity_ids is not None:
+            query = query.filter(States.entity_id.in_(entity_ids))
+
+        if end_time is not None:
+            query = query.filter(States.last_updated < end_time)
+
+        query = query.order_by(States.entity_id, States.last_updated)
+
+        for entity_id, last_updated, state in query.yield_per(1000):
+            value = _numeric_value(state)
+            if value is None:
+                continue
+
+            if last_updated.tzinfo is None:
+                last_updated = last_updated.replace(tzinfo=dt_util.UTC)
+
+            result[entity_id].add(last_updated.timestamp(), value)
+
+    threshold = None
+    if resolution and aggregation == AGGREGATION_LTTB:
+        period = (end_time or dt_util.utcnow()) - start_time
+        threshold = math.ceil(period.total_seconds() / resolution)
+
+    numeric = {entity_id: series.as_dict(threshold)
+               for entity_id, series in result.items()}
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug(
+            'get_numeric_states took %fs', elapsed)
+
+    return numeric
+
+
+class _NumericSeries:
+    """Collect the values of one entity, aggregated per period."""
+
+    def __init__(self, resolution, aggregation):
+        """Initialize the series."""
+        self.timestamps = []
+        self.values = []
+        self._resolution = resolution
+        self._aggregation = aggregation
+        self._period = None
+        self._count = 0
+
+    def add(self, timestamp, value):
+        """Add a value, samples must be added in chronological order."""
+        if not self._resolution or self._aggregation == AGGREGATION_LTTB:
+            self.timestamps.append(timestamp)
+            self.values.append(value)
+            return
+
+        period = timestamp // self._resolution
+        if period != self._period:
+            self._period = period
+            self._count = 1
+            self.timestamps.append(period * self._resolution)
+            self.values.append(value)
+            return
+
+        self._count += 1
+        if self._aggregation == AGGREGATION_MIN:
+            self.values[-1] = min(self.values[-1], value)
+        elif self._aggregation == AGGREGATION_MAX:
+            self.values[-1] = max(self.values[-1], value)
+        elif self._aggregation == AGGREGATION_MEAN:
+            self.values[-1] += (value - self.values[-1]) / self._count
+        else:
+            self.values[-1] = value
+
+    def as_dict(self, threshold=None):
+        """Return the series, decimated to threshold points if given."""
+        timestamps, values = self.timestamps, self.values
+        if threshold is not None:
+            timestamps, values = _lttb(timestamps, values, threshold)
+        return {'timestamps': timestamps, 'values': values}
+
+
+def _lttb(timestamps, values, threshold):
+    """Decimate a series with Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept, from every bucket in between the
+    point forming the largest triangle with the previously selected point
+    and the average of the next bucket is selected. Thresholds below three
+    leave no bucket in between and only return the first and last points.
+    """
+    count = len(values)
+    if threshold >= count:
+        return timestamps, values
+
+    if threshold < 3:
+        return [timestamps[0], timestamps[-1]], [values[0], values[-1]]
+
+    every = (count - 2) / (threshold - 2)
+    sampled_timestamps = [timestamps[0]]
+    sampled_values = [values[0]]
+    selected = 0
+
+    for bucket in range(threshold - 2):
+        avg_start = int((bucket + 1) * every) + 1
+        avg_end = min(int((bucket + 2) * every) + 1, count)
+        avg_length = avg_end - avg_start
+        avg_timestamp = sum(timestamps[avg_start:avg_end]) / avg_length
+        avg_value = sum(values[avg_start:avg_end]) / avg_length
+
+        sel_timestamp = timestamps[selected]
+        sel_value = values[selected]
+        max_area = -1
+        for index in range(int(bucket * every) + 1,
+                           int((bucket + 1) * every) + 1):
+            area = abs(
+                (sel_timestamp - avg_timestamp) *
+                (values[index] - sel_value) -
+                (sel_timestamp - timestamps[index]) *
+                (avg_value - sel_value))
+            if area > max_area:
+                max_area = area
+                next_selected = index
+
+        selected = next_selected
+        sampled_timestamps.append(timestamps[selected])
+        sampled_values.append(values[selected])
+
+    sampled_timestamps.append(timestamps[-1])
+    sampled_values.append(values[-1])
+    return sampled_timestamps, sampled_values
+
+
+def _numeric_value(state):
+    """Return the state as a float or None if it is not a number."""
+    try:
+        value = float(state)
+    except (ValueError, TypeError):
+        return None
+
+    # NaN and infinity can not be represented in JSON
+    if not math.isfinite(value):
+        return None
+    return value
+
+
 def get_state(hass, utc_point_in_time, entity_id, run=None):
     """Return a state at a specific point in time."""
     states = list(get_states(hass, utc_point_in_time, (entity_id,), run))
@@ -327,9 +529,35 @@ class HistoryPeriodView(HomeAssistantView):
 
         hass = request.app['hass']
 
-        result = await hass.async_add_job(
+        if 'numeric' in request.query:
+            resolution = request.query.get('resolution')
+            if resolution is not None:
+                try:
+                    resolution = int(resolution)
+                except ValueError:
+                    return self.json_message(
+                        'Invalid resolution', HTTP_BAD_REQUEST)
+                if resolution <= 0:
+                    return self.json_message(
+                        'Invalid resolution', HTTP_BAD_REQUEST)
+
+            aggregation = request.query.get('aggregation', AGGREGATION_LAST)
+            if aggregation not in AGGREGATIONS:
+                return self.json_message(
+                    'Invalid aggregation', HTTP_BAD_REQUEST)
+
+            numeric = await hass.async_add_executor_job(
+                get_numeric_states, hass, start_time, end_time,
+                entity_ids, self.filters, include_start_time_state,
+                resolution, aggregation, executor=EXECUTOR_DATABASE)
+            return await hass.async_add_job(self.json, [
+                {'entity_id': entity_id, **series}
+                for entity_id, series in numeric.items()])
+
+        result = await hass.async_add_executor_job(
             get_significant_states, hass, start_time, end_time,
-            entity_ids, self.filters, include_start_time_state)
+            entity_ids, self.filters, include_start_time_state,
+            executor=EXECUTOR_DATABASE)
         result = list(result.values())
         if _LOGGER.isEnabledFor(logging.DEBUG):
             elapsed = time.perf_counter() - timer_start
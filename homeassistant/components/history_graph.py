@@ -12,6 +12,7 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.const import CONF_ENTITIES, CONF_NAME, ATTR_ENTITY_ID
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.components.history import AGGREGATIONS, AGGREGATION_LTTB
 
 DEPENDENCIES = ['history']
 
@@ -21,8 +22,12 @@ DOMAIN = 'history_graph'
 
 CONF_HOURS_TO_SHOW = 'hours_to_show'
 CONF_REFRESH = 'refresh'
+CONF_RESOLUTION = 'resolution'
+CONF_AGGREGATION = 'aggregation'
 ATTR_HOURS_TO_SHOW = CONF_HOURS_TO_SHOW
 ATTR_REFRESH = CONF_REFRESH
+ATTR_RESOLUTION = CONF_RESOLUTION
+ATTR_AGGREGATION = CONF_AGGREGATION
 
 
 GRAPH_SCHEMA = vol.Schema({
@@ -30,6 +35,9 @@ GRAPH_SCHEMA = vol.Schema({
     vol.Optional(CONF_NAME): cv.string,
     vol.Optional(CONF_HOURS_TO_SHOW, default=24): vol.Range(min=1),
     vol.Optional(CONF_REFRESH, default=0): vol.Range(min=0),
+    vol.Optional(CONF_RESOLUTION): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Optional(CONF_AGGREGATION, default=AGGREGATION_LTTB):
+        vol.In(AGGREGATIONS),
 })
 
 
@@ -63,6 +71,8 @@ class HistoryGraphEntity(Entity):
         self._hours = cfg[CONF_HOURS_TO_SHOW]
         self._refresh = cfg[CONF_REFRESH]
         self._entities = cfg[CONF_ENTITIES]
+        self._resolution = cfg.get(CONF_RESOLUTION)
+        self._aggregation = cfg[CONF_AGGREGATION]
 
     @property
     def should_poll(self):
@@ -82,4 +92,7 @@ class HistoryGraphEntity(Entity):
             ATTR_REFRESH: self._refresh,
             ATTR_ENTITY_ID: self._entities,
         }
+        if self._resolution is not None:
+            attrs[ATTR_RESOLUTION] = self._resolution
+            attrs[ATTR_AGGREGATION] = self._aggregation
         return attrs
@@ -12,11 +12,12 @@ import voluptuous as vol
 
 from homeassistant.const import (
     ATTR_ENTITY_ID, ATTR_NAME, CONF_ENTITY_ID, CONF_NAME)
-from homeassistant.core import callback
+from homeassistant.core import EXECUTOR_IMAGE_PROCESSING, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.util.async_ import run_callback_threadsafe
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,6 +27,8 @@ DEPENDENCIES = ['camera']
 
 SCAN_INTERVAL = timedelta(seconds=10)
 
+DATA_PIPELINE = 'image_processing_pipeline'
+
 DEVICE_CLASSES = [
     'alpr',        # Automatic license plate recognition
     'face',        # Face
@@ -68,6 +71,7 @@ SERVICE_SCAN_SCHEMA = vol.Schema({
 
 async def async_setup(hass, config):
     """Set up the image processing."""
+    hass.data[DATA_PIPELINE] = ImageProcessingPipeline(hass)
     component = EntityComponent(_LOGGER, DOMAIN, hass, SCAN_INTERVAL)
 
     await component.async_setup(config)
@@ -88,11 +92,127 @@ async def async_setup(hass, config):
     return True
 
 
+class CameraFeed:
+    """Entities that process the images of a camera at the same interval."""
+
+    def __init__(self, camera_entity):
+        """Initialize the camera feed."""
+        self.camera_entity = camera_entity
+        self.entities = []
+        self.unsub = None
+        self.frames = 0
+        self.skipped = 0
+
+
+class ImageProcessingPipeline:
+    """Feed camera images to the image processing entities.
+
+    Every interval the image of a camera is fetched once and handed to all
+    entities that process that camera. An entity that is still busy with
+    the previous image skips the new one instead of queueing it.
+    """
+
+    def __init__(self, hass):
+        """Initialize the pipeline."""
+        self.hass = hass
+        self.feeds = {}
+        self._entity_feeds = {}
+        self._busy = set()
+
+    @callback
+    def async_add_entity(self, entity, interval):
+        """Start feeding images to an entity."""
+        key = (entity.camera_entity, interval)
+        feed = self.feeds.get(key)
+
+        if feed is None:
+            feed = self.feeds[key] = CameraFeed(entity.camera_entity)
+
+            @callback
+            def feed_tick(now):
+                """Process the next image of the camera."""
+                self.hass.async_create_task(self._async_feed(feed))
+
+            feed.unsub = async_track_time_interval(
+                self.hass, feed_tick, interval)
+
+        feed.entities.append(entity)
+        self._entity_feeds[entity.entity_id] = key
+
+    @callback
+    def async_remove_entity(self, entity):
+        """Stop feeding images to an entity."""
+        key = self._entity_feeds.pop(entity.entity_id, None)
+        if key is None:
+            return
+
+        feed = self.feeds[key]
+        feed.entities = [ent for ent in feed.entities if ent is not entity]
+
+        if not feed.entities:
+            feed.unsub()
+            del self.feeds[key]
+
+    async def _async_feed(self, feed):
+        """Fetch an image and hand it to the entities that are not busy."""
+        entities = [entity for entity in feed.entities
+                    if entity.entity_id not in self._busy]
+        feed.skipped += len(feed.entities) - len(entities)
+
+        if not entities:
+            _LOGGER.debug("Skipping image of %s, processing is behind",
+                          feed.camera_entity)
+            return
+
+        entity_ids = set(entity.entity_id for entity in entities)
+        self._busy.update(entity_ids)
+
+        image = None
+        try:
+            image = await self.hass.components.camera.async_get_image(
+                feed.camera_entity,
+                timeout=max(entity.timeout for entity in entities))
+        except HomeAssistantError as err:
+            _LOGGER.error("Error on receive image from entity: %s", err)
+        finally:
+            # Without an image the entities are not processing anything
+            if image is None:
+                self._busy.difference_update(entity_ids)
+
+        if image is None:
+            return
+
+        feed.frames += 1
+
+        for entity in entities:
+            self.hass.async_create_task(
+                self._async_process(entity, image.content))
+
+    async def _async_process(self, entity, image):
+        """Process an image with an entity and write its state."""
+        try:
+            await entity.async_process_image(image)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error processing image with %s",
+                              entity.entity_id)
+            return
+        finally:
+            self._busy.discard(entity.entity_id)
+
+        if entity.entity_id in self._entity_feeds:
+            await entity.async_update_ha_state()
+
+
 class ImageProcessingEntity(Entity):
     """Base entity class for image processing."""
 
     timeout = DEFAULT_TIMEOUT
 
+    @property
+    def should_poll(self):
+        """Return False, images are fed by the image processing pipeline."""
+        return False
+
     @property
     def camera_entity(self):
         """Return camera entity id from process pictures."""
@@ -112,7 +232,17 @@ class ImageProcessingEntity(Entity):
 
         This method must be run in the event loop and returns a coroutine.
         """
-        return self.hass.async_add_job(self.process_image, image)
+        return self.hass.async_add_executor_job(
+            self.process_image, image, executor=EXECUTOR_IMAGE_PROCESSING)
+
+    async def async_added_to_hass(self):
+        """Start receiving camera images."""
+        self.hass.data[DATA_PIPELINE].async_add_entity(
+            self, self.platform.scan_interval)
+
+    async def async_will_remove_from_hass(self):
+        """Stop receiving camera images."""
+        self.hass.data[DATA_PIPELINE].async_remove_entity(self)
 
     async def async_update(self):
         """Update image and process it.
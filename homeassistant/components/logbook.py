@@ -19,7 +19,8 @@ from homeassistant.const import (
     EVENT_HOMEASSISTANT_STOP, EVENT_LOGBOOK_ENTRY, EVENT_STATE_CHANGED,
     HTTP_BAD_REQUEST, STATE_NOT_HOME, STATE_OFF, STATE_ON)
 from homeassistant.core import (
-    DOMAIN as HA_DOMAIN, State, callback, split_entity_id)
+    DOMAIN as HA_DOMAIN, EXECUTOR_DATABASE, State, callback,
+    split_entity_id)
 from homeassistant.components.alexa.smart_home import EVENT_ALEXA_SMART_HOME
 from homeassistant.components.homekit.const import (
     ATTR_DISPLAY_NAME, ATTR_VALUE, DOMAIN as DOMAIN_HOMEKIT,
@@ -152,7 +153,8 @@ class LogbookView(HomeAssistantView):
             return self.json(list(
                 _get_events(hass, self.config, start_day, end_day, entity_id)))
 
-        return await hass.async_add_job(json_events)
+        return await hass.async_add_executor_job(
+            json_events, executor=EXECUTOR_DATABASE)
 
 
 def humanify(hass, events):
@@ -589,12 +589,16 @@ class MQTT:
                  tls_version: Optional[int]) -> None:
         """Initialize Home Assistant MQTT client."""
         import paho.mqtt.client as mqtt
+        from paho.mqtt.matcher import MQTTMatcher
 
         self.hass = hass
         self.broker = broker
         self.port = port
         self.keepalive = keepalive
         self.subscriptions = []  # type: List[Subscription]
+        # Topic trie of the subscriptions, the value of each topic filter is
+        # a tuple of its subscriptions which is replaced on every change.
+        self._matching_subscriptions = MQTTMatcher()
         self.birth_message = birth_message
         self._mqttc = None  # type: mqtt.Client
         self._paho_lock = asyncio.Lock(loop=hass.loop)
@@ -684,6 +688,12 @@ class MQTT:
 
         subscription = Subscription(topic, msg_callback, qos, encoding)
         self.subscriptions.append(subscription)
+        try:
+            topic_subscriptions = self._matching_subscriptions[topic]
+        except KeyError:
+            topic_subscriptions = ()
+        self._matching_subscriptions[topic] = \
+            topic_subscriptions + (subscription,)
 
         await self._async_perform_subscription(topic, qos)
 
@@ -694,9 +704,14 @@ class MQTT:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
 
-            if any(other.topic == topic for other in self.subscriptions):
+            topic_subscriptions = list(self._matching_subscriptions[topic])
+            topic_subscriptions.remove(subscription)
+            if topic_subscriptions:
                 # Other subscriptions on topic remaining - don't unsubscribe.
+                self._matching_subscriptions[topic] = \
+                    tuple(topic_subscriptions)
                 return
+            del self._matching_subscriptions[topic]
             self.hass.async_create_task(self._async_unsubscribe(topic))
 
         return async_remove
@@ -757,10 +772,10 @@ class MQTT:
     def _mqtt_handle_message(self, msg) -> None:
         _LOGGER.debug("Received message on %s: %s", msg.topic, msg.payload)
 
-        for subscription in self.subscriptions:
-            if not _match_topic(subscription.topic, msg.topic):
-                continue
-
+        for subscription in [
+                subscription for topic_subscriptions
+                in self._matching_subscriptions.iter_match(msg.topic)
+                for subscription in topic_subscriptions]:
             payload = msg.payload  # type: SubscribePayloadType
             if subscription.encoding is not None:
                 try:
@@ -808,18 +823,6 @@ def _raise_on_error(result_code: int) -> None:
             'Error talking to MQTT: {}'.format(mqtt.error_string(result_code)))
 
 
-def _match_topic(subscription: str, topic: str) -> bool:
-    """Test if topic matches subscription."""
-    from paho.mqtt.matcher import MQTTMatcher
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-    try:
-        next(matcher.iter_match(topic))
-        return True
-    except StopIteration:
-        return False
-
-
 class MqttAvailability(Entity):
     """Mixin used for platforms that report availability."""
 
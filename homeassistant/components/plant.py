@@ -256,6 +256,7 @@ class Plant(Entity):
         This only needs to be done once during startup.
         """
         from homeassistant.components.recorder.models import States
+        from sqlalchemy.orm import joinedload
         start_date = datetime.now() - timedelta(days=self._conf_check_days)
         entity_id = self._readingmap.get(READING_BRIGHTNESS)
         if entity_id is None:
@@ -266,7 +267,9 @@ class Plant(Entity):
         _LOGGER.debug("initializing values for %s from the database",
                       self._name)
         with session_scope(hass=self.hass) as session:
-            query = session.query(States).filter(
+            query = session.query(States).options(
+                joinedload(States.state_attributes)
+            ).filter(
                 (States.entity_id == entity_id.lower()) and
                 (States.last_updated > start_date)
             ).order_by(States.last_updated.asc())
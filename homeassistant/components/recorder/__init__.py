@@ -8,14 +8,14 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/recorder/
 """
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
 from datetime import datetime, timedelta
 import logging
 import queue
 import threading
 import time
-from typing import Any, Dict, Optional  # noqa: F401
+from typing import Any, Dict, List, Optional  # noqa: F401
 
 import voluptuous as vol
 
@@ -57,9 +57,19 @@ CONF_DB_URL = 'db_url'
 CONF_PURGE_KEEP_DAYS = 'purge_keep_days'
 CONF_PURGE_INTERVAL = 'purge_interval'
 CONF_EVENT_TYPES = 'event_types'
+CONF_COMMIT_INTERVAL = 'commit_interval'
+CONF_MAX_BATCH_SIZE = 'max_batch_size'
+CONF_PURGE_BATCH_SIZE = 'purge_batch_size'
 
 CONNECT_RETRY_WAIT = 3
 
+DEFAULT_COMMIT_INTERVAL = 1
+DEFAULT_MAX_BATCH_SIZE = 1000
+DEFAULT_PURGE_BATCH_SIZE = 1000
+
+# Number of recently written attributes whose id is kept in memory
+STATE_ATTRIBUTES_CACHE_SIZE = 2048
+
 FILTER_SCHEMA = vol.Schema({
     vol.Optional(CONF_EXCLUDE, default={}): vol.Schema({
         vol.Optional(CONF_DOMAINS): vol.All(cv.ensure_list, [cv.string]),
@@ -79,6 +89,12 @@ CONFIG_SCHEMA = vol.Schema({
         vol.Optional(CONF_PURGE_INTERVAL, default=1):
             vol.All(vol.Coerce(int), vol.Range(min=0)),
         vol.Optional(CONF_DB_URL): cv.string,
+        vol.Optional(CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL):
+            vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_MAX_BATCH_SIZE, default=DEFAULT_MAX_BATCH_SIZE):
+            vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(CONF_PURGE_BATCH_SIZE, default=DEFAULT_PURGE_BATCH_SIZE):
+            vol.All(vol.Coerce(int), vol.Range(min=1)),
     })
 }, extra=vol.ALLOW_EXTRA)
 
@@ -115,6 +131,10 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     conf = config.get(DOMAIN, {})
     keep_days = conf.get(CONF_PURGE_KEEP_DAYS)
     purge_interval = conf.get(CONF_PURGE_INTERVAL)
+    commit_interval = conf.get(CONF_COMMIT_INTERVAL, DEFAULT_COMMIT_INTERVAL)
+    max_batch_size = conf.get(CONF_MAX_BATCH_SIZE, DEFAULT_MAX_BATCH_SIZE)
+    purge_batch_size = conf.get(
+        CONF_PURGE_BATCH_SIZE, DEFAULT_PURGE_BATCH_SIZE)
 
     db_url = conf.get(CONF_DB_URL, None)
     if not db_url:
@@ -125,7 +145,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     exclude = conf.get(CONF_EXCLUDE, {})
     instance = hass.data[DATA_INSTANCE] = Recorder(
         hass=hass, keep_days=keep_days, purge_interval=purge_interval,
-        uri=db_url, include=include, exclude=exclude)
+        uri=db_url, include=include, exclude=exclude,
+        commit_interval=commit_interval, max_batch_size=max_batch_size,
+        purge_batch_size=purge_batch_size)
     instance.async_initialize()
     instance.start()
 
@@ -140,7 +162,10 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     return await instance.async_db_ready
 
 
-PurgeTask = namedtuple('PurgeTask', ['keep_days', 'repack'])
+PurgeTask = namedtuple('PurgeTask', ['keep_days', 'repack', 'progress'])
+
+# Queued by block_till_done to force the pending batch to be committed.
+FLUSH_TASK = object()
 
 
 class Recorder(threading.Thread):
@@ -148,13 +173,19 @@ class Recorder(threading.Thread):
 
     def __init__(self, hass: HomeAssistant, keep_days: int,
                  purge_interval: int, uri: str,
-                 include: Dict, exclude: Dict) -> None:
+                 include: Dict, exclude: Dict,
+                 commit_interval: float = DEFAULT_COMMIT_INTERVAL,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 purge_batch_size: int = DEFAULT_PURGE_BATCH_SIZE) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name='Recorder')
 
         self.hass = hass
         self.keep_days = keep_days
         self.purge_interval = purge_interval
+        self.commit_interval = commit_interval
+        self.max_batch_size = max_batch_size
+        self.purge_batch_size = purge_batch_size
         self.queue = queue.Queue()  # type: Any
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
@@ -168,6 +199,8 @@ class Recorder(threading.Thread):
         self.exclude_t = exclude.get(CONF_EVENT_TYPES, [])
 
         self.get_session = None
+        # Shared attributes JSON to attributes_id, least recently used first
+        self._attributes_ids = OrderedDict()  # type: OrderedDict
 
     @callback
     def async_initialize(self):
@@ -179,13 +212,13 @@ class Recorder(threading.Thread):
         keep_days = kwargs.get(ATTR_KEEP_DAYS, self.keep_days)
         repack = kwargs.get(ATTR_REPACK)
 
-        self.queue.put(PurgeTask(keep_days, repack))
+        self.queue.put(
+            PurgeTask(keep_days, repack, purge.PurgeProgress()))
 
     def run(self):
         """Start processing events to save."""
-        from .models import States, Events
+        from .models import Events
         from homeassistant.components import persistent_notification
-        from sqlalchemy import exc
 
         tries = 1
         connected = False
@@ -257,8 +290,8 @@ class Recorder(threading.Thread):
             @callback
             def async_purge(now):
                 """Trigger the purge and schedule the next run."""
-                self.queue.put(
-                    PurgeTask(self.keep_days, repack=False))
+                self.queue.put(PurgeTask(
+                    self.keep_days, False, purge.PurgeProgress()))
                 self.hass.helpers.event.async_track_point_in_time(
                     async_purge, now + timedelta(days=self.purge_interval))
 
@@ -275,16 +308,39 @@ class Recorder(threading.Thread):
 
             self.hass.helpers.event.track_point_in_time(async_purge, run)
 
+        # Events waiting to be written in the next transaction
+        pending = []  # type: List[Any]
+        deadline = 0.0
+
         while True:
-            event = self.queue.get()
+            if pending:
+                try:
+                    event = self.queue.get(
+                        timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    self._commit_batch(pending)
+                    continue
+            else:
+                event = self.queue.get()
 
             if event is None:
+                self._commit_batch(pending)
                 self._close_run()
                 self._close_connection()
                 self.queue.task_done()
                 return
+            if event is FLUSH_TASK:
+                self._commit_batch(pending)
+                self.queue.task_done()
+                continue
             if isinstance(event, PurgeTask):
-                purge.purge_old_data(self, event.keep_days, event.repack)
+                self._commit_batch(pending)
+                if not purge.purge_old_data(
+                        self, event.keep_days, event.repack,
+                        progress=event.progress):
+                    # Queue the rest of the purge behind the events that
+                    # arrived in the meantime so recording keeps going.
+                    self.queue.put(event)
                 self.queue.task_done()
                 continue
             elif event.event_type == EVENT_TIME_CHANGED:
@@ -300,34 +356,108 @@ class Recorder(threading.Thread):
                     self.queue.task_done()
                     continue
 
-            tries = 1
-            updated = False
-            while not updated and tries <= 10:
-                if tries != 1:
-                    time.sleep(CONNECT_RETRY_WAIT)
-                try:
-                    with session_scope(session=self.get_session()) as session:
-                        dbevent = Events.from_event(event)
-                        session.add(dbevent)
-                        session.flush()
-
-                        if event.event_type == EVENT_STATE_CHANGED:
-                            dbstate = States.from_event(event)
-                            dbstate.event_id = dbevent.event_id
-                            session.add(dbstate)
-                    updated = True
-
-                except exc.OperationalError as err:
-                    _LOGGER.error("Error in database connectivity: %s. "
-                                  "(retrying in %s seconds)", err,
-                                  CONNECT_RETRY_WAIT)
-                    tries += 1
-
-            if not updated:
-                _LOGGER.error("Error in database update. Could not save "
-                              "after %d tries. Giving up", tries)
+            if not pending:
+                deadline = time.monotonic() + self.commit_interval
+            pending.append(event)
+
+            if len(pending) >= self.max_batch_size:
+                self._commit_batch(pending)
+
+    def _commit_batch(self, pending):
+        """Write all pending events in a single transaction.
+
+        The list is emptied and every event in it is marked as done in the
+        queue, whether or not it could be saved.
+        """
+        from .models import States, StateAttributes, Events
+        from sqlalchemy import exc
+
+        if not pending:
+            return
+
+        tries = 1
+        updated = False
+        while not updated and tries <= 10:
+            if tries != 1:
+                time.sleep(CONNECT_RETRY_WAIT)
+            try:
+                with session_scope(session=self.get_session()) as session:
+                    dbevents = [Events.from_event(event) for event in pending]
+                    session.add_all(dbevents)
+                    session.flush()
+
+                    dbstates = []
+                    new_attributes = {}  # type: Dict[str, Any]
+                    for event, dbevent in zip(pending, dbevents):
+                        if event.event_type != EVENT_STATE_CHANGED:
+                            continue
+                        dbstate = States.from_event(event)
+                        dbstate.event_id = dbevent.event_id
+                        dbattrs = StateAttributes.from_event(event)
+                        attributes_id = self._get_attributes_id(
+                            session, dbattrs)
+                        if attributes_id is None:
+                            dbstate.state_attributes = \
+                                new_attributes.setdefault(
+                                    dbattrs.shared_attrs, dbattrs)
+                        else:
+                            dbstate.attributes_id = attributes_id
+                        dbstates.append(dbstate)
+                    session.add_all(dbstates)
+                    session.flush()
+                    written = [(dbattrs.shared_attrs, dbattrs.attributes_id)
+                               for dbattrs in new_attributes.values()]
+                updated = True
+
+                for shared_attrs, attributes_id in written:
+                    self._cache_attributes_id(shared_attrs, attributes_id)
+
+            except exc.OperationalError as err:
+                _LOGGER.error("Error in database connectivity: %s. "
+                              "(retrying in %s seconds)", err,
+                              CONNECT_RETRY_WAIT)
+                tries += 1
+
+        if not updated:
+            _LOGGER.error("Error in database update. Could not save %d "
+                          "events after %d tries. Giving up",
+                          len(pending), tries)
 
+        for _ in pending:
             self.queue.task_done()
+        pending.clear()
+
+    def _get_attributes_id(self, session, dbattrs):
+        """Return the id of the stored copy of the attributes or None."""
+        from .models import StateAttributes
+
+        shared_attrs = dbattrs.shared_attrs
+        attributes_id = self._attributes_ids.get(shared_attrs)
+        if attributes_id is not None:
+            self._attributes_ids.move_to_end(shared_attrs)
+            return attributes_id
+
+        res = session.query(StateAttributes.attributes_id).filter(
+            (StateAttributes.hash == dbattrs.hash) &
+            (StateAttributes.shared_attrs == shared_attrs)).first()
+        if res is None:
+            return None
+
+        self._cache_attributes_id(shared_attrs, res[0])
+        return res[0]
+
+    def _cache_attributes_id(self, shared_attrs, attributes_id):
+        """Remember the id of stored attributes."""
+        self._attributes_ids[shared_attrs] = attributes_id
+        self._attributes_ids.move_to_end(shared_attrs)
+        if len(self._attributes_ids) > STATE_ATTRIBUTES_CACHE_SIZE:
+            self._attributes_ids.popitem(last=False)
+
+    def evict_attributes_ids(self, attributes_ids):
+        """Forget the ids of attributes that have been purged."""
+        for shared_attrs, attributes_id in list(self._attributes_ids.items()):
+            if attributes_id in attributes_ids:
+                del self._attributes_ids[shared_attrs]
 
     @callback
     def event_listener(self, event):
@@ -335,7 +465,8 @@ class Recorder(threading.Thread):
         self.queue.put(event)
 
     def block_till_done(self):
-        """Block till all events processed."""
+        """Block till all events processed and committed."""
+        self.queue.put(FLUSH_TASK)
         self.queue.join()
 
     def _setup_connection(self):
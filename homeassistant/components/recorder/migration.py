@@ -218,6 +218,13 @@ def _apply_update(engine, new_version, old_version):
         ])
         _create_index(engine, "states", "ix_states_context_id")
         _create_index(engine, "states", "ix_states_context_user_id")
+    elif new_version == 7:
+        # The state_attributes table is created by create_all, existing
+        # states keep their attributes column until they are purged.
+        _add_columns(engine, "states", [
+            'attributes_id INTEGER REFERENCES state_attributes(attributes_id)',
+        ])
+        _create_index(engine, "states", "ix_states_attributes_id")
     else:
         raise ValueError("No schema migration defined for version {}"
                          .format(new_version))
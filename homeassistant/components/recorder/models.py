@@ -2,11 +2,13 @@
 import json
 from datetime import datetime
 import logging
+import zlib
 
 from sqlalchemy import (
-    Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text,
-    distinct)
+    BigInteger, Boolean, Column, DateTime, ForeignKey, Index, Integer, String,
+    Text, distinct)
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 
 import homeassistant.util.dt as dt_util
 from homeassistant.core import (
@@ -17,7 +19,7 @@ from homeassistant.helpers.json import JSONEncoder
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 6
+SCHEMA_VERSION = 7
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -73,6 +75,8 @@ class States(Base):   # type: ignore
     domain = Column(String(64))
     entity_id = Column(String(255))
     state = Column(String(255))
+    # Only set on rows written before schema version 7, newer rows refer to
+    # their attributes through attributes_id
     attributes = Column(Text)
     event_id = Column(Integer, ForeignKey('events.event_id'), index=True)
     last_changed = Column(DateTime(timezone=True), default=datetime.utcnow)
@@ -81,6 +85,11 @@ class States(Base):   # type: ignore
     created = Column(DateTime(timezone=True), default=datetime.utcnow)
     context_id = Column(String(36), index=True)
     context_user_id = Column(String(36), index=True)
+    attributes_id = Column(
+        Integer, ForeignKey('state_attributes.attributes_id'), index=True)
+    # Queries converting states to native objects have to load it with
+    # joinedload, other queries don't need the join
+    state_attributes = relationship('StateAttributes', lazy='select')
 
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
@@ -90,7 +99,10 @@ class States(Base):   # type: ignore
 
     @staticmethod
     def from_event(event):
-        """Create object from a state_changed event."""
+        """Create object from a state_changed event.
+
+        The attributes are not included, see StateAttributes.from_event.
+        """
         entity_id = event.data['entity_id']
         state = event.data.get('new_state')
 
@@ -104,14 +116,11 @@ class States(Base):   # type: ignore
         if state is None:
             dbstate.state = ''
             dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = '{}'
             dbstate.last_changed = event.time_fired
             dbstate.last_updated = event.time_fired
         else:
             dbstate.domain = state.domain
             dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes),
-                                            cls=JSONEncoder)
             dbstate.last_changed = state.last_changed
             dbstate.last_updated = state.last_updated
 
@@ -123,10 +132,16 @@ class States(Base):   # type: ignore
             id=self.context_id,
             user_id=self.context_user_id
         )
+        attributes = self.attributes
+        if attributes is None:
+            if self.state_attributes is None:
+                attributes = '{}'
+            else:
+                attributes = self.state_attributes.shared_attrs
         try:
             return State(
                 self.entity_id, self.state,
-                json.loads(self.attributes),
+                json.loads(attributes),
                 _process_timestamp(self.last_changed),
                 _process_timestamp(self.last_updated),
                 context=context,
@@ -137,6 +152,36 @@ class States(Base):   # type: ignore
             return None
 
 
+class StateAttributes(Base):   # type: ignore
+    """State attributes, shared by all states with the same attributes."""
+
+    __tablename__ = 'state_attributes'
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def from_event(event):
+        """Create object from a state_changed event."""
+        state = event.data.get('new_state')
+
+        # State got deleted
+        if state is None:
+            shared_attrs = '{}'
+        else:
+            shared_attrs = json.dumps(dict(state.attributes),
+                                      cls=JSONEncoder)
+
+        return StateAttributes(
+            hash=StateAttributes.hash_shared_attrs(shared_attrs),
+            shared_attrs=shared_attrs)
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return the content hash used to look up shared attributes."""
+        return zlib.crc32(shared_attrs.encode('utf-8'))
+
+
 class RecorderRuns(Base):   # type: ignore
     """Representation of recorder run."""
 
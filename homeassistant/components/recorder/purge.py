@@ -1,6 +1,8 @@
 """Purge old data helper."""
+from bisect import bisect_left
 from datetime import timedelta
 import logging
+import time
 
 import homeassistant.util.dt as dt_util
 
@@ -8,63 +10,239 @@ from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Minimum number of seconds between progress reports of a purge
+PROGRESS_INTERVAL = 10
+
+# Maximum number of primary key ranges to purge per call
+RANGES_PER_CALL = 10
+
+PURGE_STATES = 'states'
+PURGE_EVENTS = 'events'
+PURGE_ATTRIBUTES = 'attributes'
+PURGE_STEPS = (PURGE_STATES, PURGE_EVENTS, PURGE_ATTRIBUTES)
+
+
+class PurgeProgress:
+    """Position of a purge that is done in batches.
+
+    Every table is purged in ranges of batch_size primary keys, from its
+    lowest key to the highest key that existed when its purge started.
+    """
+
+    def __init__(self):
+        """Initialize the progress."""
+        self.purge_before = None
+        self.step = 0
+        self.next_id = None
+        self.last_id = None
+        self.first_id = None
+        self.protected_state_ids = []
+        self.deleted = {step: 0 for step in PURGE_STEPS}
+        self.last_report = time.monotonic()
+
+    @property
+    def done(self):
+        """Return True if all tables have been purged."""
+        return self.step == len(PURGE_STEPS)
+
+    def report(self, force=False):
+        """Log the progress, at most once per PROGRESS_INTERVAL."""
+        now = time.monotonic()
+        if not force and now - self.last_report < PROGRESS_INTERVAL:
+            return
+        self.last_report = now
+
+        if self.done:
+            _LOGGER.info(
+                "Purged %s states, %s events and %s attributes",
+                self.deleted[PURGE_STATES], self.deleted[PURGE_EVENTS],
+                self.deleted[PURGE_ATTRIBUTES])
+            return
+
+        total = self.last_id - self.first_id + 1
+        _LOGGER.info(
+            "Purging %s: %d%% done, %s states, %s events and %s attributes "
+            "deleted so far", PURGE_STEPS[self.step],
+            100 * (self.next_id - self.first_id) // total,
+            self.deleted[PURGE_STATES], self.deleted[PURGE_EVENTS],
+            self.deleted[PURGE_ATTRIBUTES])
+
+
+def purge_old_data(instance, purge_days, repack, batch_size=None,
+                   progress=None):
+    """Purge events and states older than purge_days ago.
+
+    Shared attributes no longer used by any state are removed as well.
+    Tables are purged in ranges of batch_size primary keys, each range in
+    its own transaction. A call stops once it deleted batch_size rows or
+    purged RANGES_PER_CALL ranges. Returns True when everything has been
+    purged and False if there is more to purge, in which case the caller
+    should call again with the same progress after processing other work.
+    """
+    if batch_size is None:
+        batch_size = instance.purge_batch_size
+
+    if progress is None:
+        progress = PurgeProgress()
+
+    if progress.purge_before is None:
+        progress.purge_before = \
+            dt_util.utcnow() - timedelta(days=purge_days)
+        _LOGGER.debug("Purging events before %s", progress.purge_before)
+
+    ranges = 0
+    deleted_rows = 0
+
+    while not progress.done:
+        if ranges == RANGES_PER_CALL or deleted_rows >= batch_size:
+            progress.report()
+            return False
+
+        if progress.next_id is None:
+            _init_step(instance, progress)
+
+        if progress.next_id is None or progress.next_id > progress.last_id:
+            progress.step += 1
+            progress.next_id = None
+            continue
+
+        step = PURGE_STEPS[progress.step]
+        start_id = progress.next_id
+        end_id = min(start_id + batch_size - 1, progress.last_id)
+        deleted = _PURGE_RANGE[step](instance, progress, start_id, end_id)
+        progress.deleted[step] += deleted
+        progress.next_id = end_id + 1
+        deleted_rows += deleted
+        ranges += 1
+
+    progress.report(force=True)
 
-def purge_old_data(instance, purge_days, repack):
-    """Purge events and states older than purge_days ago."""
-    from .models import States, Events
+    # Execute sqlite vacuum command to free up space on disk
+    _LOGGER.debug("DB engine driver: %s", instance.engine.driver)
+    if repack and instance.engine.driver == 'pysqlite':
+        from sqlalchemy import exc
+
+        _LOGGER.debug("Vacuuming SQLite to free space")
+        try:
+            instance.engine.execute("VACUUM")
+        except exc.OperationalError as err:
+            _LOGGER.error("Error vacuuming SQLite: %s.", err)
+
+    return True
+
+
+def _init_step(instance, progress):
+    """Find the range of primary keys to purge in the current step."""
+    from .models import States, StateAttributes, Events
     from sqlalchemy import func
 
-    purge_before = dt_util.utcnow() - timedelta(days=purge_days)
-    _LOGGER.debug("Purging events before %s", purge_before)
+    step = PURGE_STEPS[progress.step]
 
     with session_scope(session=instance.get_session()) as session:
-        delete_states = session.query(States) \
-                            .filter((States.last_updated < purge_before))
+        if step == PURGE_STATES:
+            first_id, last_id = session.query(
+                func.min(States.state_id), func.max(States.state_id)) \
+                .filter(States.last_updated < progress.purge_before).one()
+
+            # For each entity, the most recent state is protected from
+            # deletion s.t. we can properly restore state even if the entity
+            # has not been updated in a long time
+            if first_id is not None:
+                progress.protected_state_ids = sorted(
+                    state_id for state_id, in session.query(
+                        func.max(States.state_id))
+                    .group_by(States.entity_id)
+                    if state_id <= last_id)
+
+        elif step == PURGE_EVENTS:
+            first_id, last_id = session.query(
+                func.min(Events.event_id), func.max(Events.event_id)) \
+                .filter(Events.time_fired < progress.purge_before).one()
+
+        else:
+            first_id, last_id = session.query(
+                func.min(StateAttributes.attributes_id),
+                func.max(StateAttributes.attributes_id)).one()
+
+    progress.first_id = progress.next_id = first_id
+    progress.last_id = last_id
+
+
+def _purge_states(instance, progress, start_id, end_id):
+    """Delete old states in a range of state ids."""
+    from .models import States
+
+    protected = progress.protected_state_ids
+    protected_ids = protected[bisect_left(protected, start_id):
+                              bisect_left(protected, end_id + 1)]
 
-        # For each entity, the most recent state is protected from deletion
-        # s.t. we can properly restore state even if the entity has not been
-        # updated in a long time
-        protected_states = session.query(func.max(States.state_id)) \
-            .group_by(States.entity_id).all()
-
-        protected_state_ids = tuple(state[0] for state in protected_states)
+    with session_scope(session=instance.get_session()) as session:
+        delete_states = session.query(States) \
+            .filter(States.state_id.between(start_id, end_id)) \
+            .filter(States.last_updated < progress.purge_before)
 
-        if protected_state_ids:
+        if protected_ids:
             delete_states = delete_states \
-                .filter(~States.state_id.in_(protected_state_ids))
+                .filter(~States.state_id.in_(protected_ids))
 
         deleted_rows = delete_states.delete(synchronize_session=False)
-        _LOGGER.debug("Deleted %s states", deleted_rows)
 
-        delete_events = session.query(Events) \
-            .filter((Events.time_fired < purge_before))
+    _LOGGER.debug("Deleted %s states", deleted_rows)
+    return deleted_rows
+
 
-        # We also need to protect the events belonging to the protected states.
-        # Otherwise, if the SQL server has "ON DELETE CASCADE" as default, it
-        # will delete the protected state when deleting its associated
-        # event. Also, we would be producing NULLed foreign keys otherwise.
-        if protected_state_ids:
-            protected_events = session.query(States.event_id) \
-                .filter(States.state_id.in_(protected_state_ids)) \
-                .filter(States.event_id.isnot(None)) \
-                .all()
+def _purge_events(instance, progress, start_id, end_id):
+    """Delete old events in a range of event ids."""
+    from .models import States, Events
 
-            protected_event_ids = tuple(state[0] for state in protected_events)
+    with session_scope(session=instance.get_session()) as session:
+        # We also need to protect the events belonging to the remaining
+        # states. Otherwise, if the SQL server has "ON DELETE CASCADE" as
+        # default, it will delete the protected state when deleting its
+        # associated event. Also, we would be producing NULLed foreign keys
+        # otherwise.
+        protected_event_ids = session.query(States.event_id) \
+            .filter(States.event_id.between(start_id, end_id))
 
-            if protected_event_ids:
-                delete_events = delete_events \
-                    .filter(~Events.event_id.in_(protected_event_ids))
+        deleted_rows = session.query(Events) \
+            .filter(Events.event_id.between(start_id, end_id)) \
+            .filter(Events.time_fired < progress.purge_before) \
+            .filter(~Events.event_id.in_(protected_event_ids.subquery())) \
+            .delete(synchronize_session=False)
 
-        deleted_rows = delete_events.delete(synchronize_session=False)
-        _LOGGER.debug("Deleted %s events", deleted_rows)
+    _LOGGER.debug("Deleted %s events", deleted_rows)
+    return deleted_rows
 
-    # Execute sqlite vacuum command to free up space on disk
-    _LOGGER.debug("DB engine driver: %s", instance.engine.driver)
-    if repack and instance.engine.driver == 'pysqlite':
-        from sqlalchemy import exc
 
-        _LOGGER.debug("Vacuuming SQLite to free space")
-        try:
-            instance.engine.execute("VACUUM")
-        except exc.OperationalError as err:
-            _LOGGER.error("Error vacuuming SQLite: %s.", err)
+def _purge_attributes(instance, progress, start_id, end_id):
+    """Delete shared attributes no state uses in a range of ids."""
+    from .models import States, StateAttributes
+
+    with session_scope(session=instance.get_session()) as session:
+        used_attributes_ids = session.query(States.attributes_id) \
+            .filter(States.attributes_id.between(start_id, end_id))
+
+        attributes_ids = [
+            attributes_id for attributes_id,
+            in session.query(StateAttributes.attributes_id)
+            .filter(StateAttributes.attributes_id.between(start_id, end_id))
+            .filter(~StateAttributes.attributes_id.in_(
+                used_attributes_ids.subquery()))]
+
+        if attributes_ids:
+            session.query(StateAttributes) \
+                .filter(StateAttributes.attributes_id.in_(attributes_ids)) \
+                .delete(synchronize_session=False)
+
+    if attributes_ids:
+        instance.evict_attributes_ids(set(attributes_ids))
+
+    _LOGGER.debug("Deleted %s attributes", len(attributes_ids))
+    return len(attributes_ids)
+
+
+_PURGE_RANGE = {
+    PURGE_STATES: _purge_states,
+    PURGE_EVENTS: _purge_events,
+    PURGE_ATTRIBUTES: _purge_attributes,
+}
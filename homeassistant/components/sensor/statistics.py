@@ -241,11 +241,13 @@ class StatisticsSensor(Entity):
         list so that we get it in the right order again.
         """
         from homeassistant.components.recorder.models import States
+        from sqlalchemy.orm import joinedload
         _LOGGER.debug("initializing values for %s from the database",
                       self.entity_id)
 
         with session_scope(hass=self._hass) as session:
             query = session.query(States)\
+                .options(joinedload(States.state_attributes))\
                 .filter(States.entity_id == self._entity_id.lower())\
                 .order_by(States.last_updated.desc())\
                 .limit(self._sampling_size)
@@ -16,11 +16,11 @@ from homeassistant.const import (
     ATTR_FRIENDLY_NAME, ATTR_UNIT_OF_MEASUREMENT, CONF_VALUE_TEMPLATE,
     CONF_ICON_TEMPLATE, CONF_ENTITY_PICTURE_TEMPLATE, ATTR_ENTITY_ID,
     CONF_SENSORS, EVENT_HOMEASSISTANT_START, CONF_FRIENDLY_NAME_TEMPLATE,
-    MATCH_ALL, CONF_DEVICE_CLASS)
-from homeassistant.exceptions import TemplateError
+    CONF_DEVICE_CLASS, MATCH_ALL)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import (
+    RenderInfoTracker, async_track_state_change)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -55,8 +55,7 @@ async def async_setup_platform(hass, config, async_add_entities,
         unit_of_measurement = device_config.get(ATTR_UNIT_OF_MEASUREMENT)
         device_class = device_config.get(CONF_DEVICE_CLASS)
 
-        entity_ids = set()
-        manual_entity_ids = device_config.get(ATTR_ENTITY_ID)
+        entity_ids = device_config.get(ATTR_ENTITY_ID)
         invalid_templates = []
 
         for tpl_name, template in (
@@ -69,28 +68,17 @@ async def async_setup_platform(hass, config, async_add_entities,
                 continue
             template.hass = hass
 
-            if manual_entity_ids is not None:
+            if entity_ids is not None:
                 continue
 
-            template_entity_ids = template.extract_entities()
-            if template_entity_ids == MATCH_ALL:
-                entity_ids = MATCH_ALL
+            if template.async_render_to_info().listeners(
+                    match_all=False) is None:
                 # Cut off _template from name
                 invalid_templates.append(tpl_name[:-9])
-            elif entity_ids != MATCH_ALL:
-                entity_ids |= set(template_entity_ids)
 
         if invalid_templates:
-            _LOGGER.warning(
-                'Template sensor %s has no entity ids configured to track nor'
-                ' were we able to extract the entities to track from the %s '
-                'template(s). This entity will only be able to be updated '
-                'manually.', device, ', '.join(invalid_templates))
-
-        if manual_entity_ids is not None:
-            entity_ids = manual_entity_ids
-        elif entity_ids != MATCH_ALL:
-            entity_ids = list(entity_ids)
+            _log_untracked(device, invalid_templates)
+            entity_ids = MATCH_ALL
 
         sensors.append(
             SensorTemplate(
@@ -113,6 +101,15 @@ async def async_setup_platform(hass, config, async_add_entities,
     return True
 
 
+def _log_untracked(device, invalid_templates):
+    """Warn that the sensor can not follow the states of its templates."""
+    _LOGGER.warning(
+        'Template sensor %s has no entity ids configured to track nor'
+        ' were we able to extract the entities to track from the %s '
+        'template(s). This entity will only be able to be updated '
+        'manually.', device, ', '.join(invalid_templates))
+
+
 class SensorTemplate(Entity):
     """Representation of a Template Sensor."""
 
@@ -134,18 +131,25 @@ class SensorTemplate(Entity):
         self._entity_picture = None
         self._entities = entity_ids
         self._device_class = device_class
+        self._device_id = device_id
+        self._tracker = None
 
     async def async_added_to_hass(self):
         """Register callbacks."""
         @callback
-        def template_sensor_state_listener(entity, old_state, new_state):
+        def template_sensor_state_listener(*args):
             """Handle device state changes."""
             self.async_schedule_update_ha_state(True)
 
         @callback
         def template_sensor_startup(event):
             """Update template on startup."""
-            if self._entities != MATCH_ALL:
+            if self._entities is None:
+                # Follow the states accessed by the last update
+                self._tracker = RenderInfoTracker(
+                    self.hass, template_sensor_state_listener,
+                    match_all=False)
+            elif self._entities != MATCH_ALL:
                 # Track state change only for valid templates
                 async_track_state_change(
                     self.hass, self._entities, template_sensor_state_listener)
@@ -155,6 +159,11 @@ class SensorTemplate(Entity):
         self.hass.bus.async_listen_once(
             EVENT_HOMEASSISTANT_START, template_sensor_startup)
 
+    async def async_will_remove_from_hass(self):
+        """Stop following the states accessed by the templates."""
+        if self._tracker is not None:
+            self._tracker.async_remove()
+
     @property
     def name(self):
         """Return the name of the sensor."""
@@ -192,40 +201,60 @@ class SensorTemplate(Entity):
 
     async def async_update(self):
         """Update the state from the template."""
-        try:
-            self._state = self._template.async_render()
-        except TemplateError as ex:
+        render_infos = []
+
+        render_info = self._template.async_render_to_info()
+        render_infos.append((CONF_VALUE_TEMPLATE, render_info))
+        ex = render_info.exception
+        if ex is None:
+            self._state = render_info.result
+        elif ex.args and ex.args[0].startswith(
+                "UndefinedError: 'None' has no attribute"):
+            # Common during HA startup - so just a warning
+            _LOGGER.warning('Could not render template %s,'
+                            ' the state is unknown.', self._name)
+        else:
+            self._state = None
+            _LOGGER.error('Could not render template %s: %s', self._name,
+                          ex)
+        for tpl_name, property_name, template in (
+                (CONF_ICON_TEMPLATE, '_icon', self._icon_template),
+                (CONF_ENTITY_PICTURE_TEMPLATE, '_entity_picture',
+                 self._entity_picture_template),
+                (CONF_FRIENDLY_NAME_TEMPLATE, '_name',
+                 self._friendly_name_template)):
+            if template is None:
+                continue
+
+            render_info = template.async_render_to_info()
+            render_infos.append((tpl_name, render_info))
+            ex = render_info.exception
+            if ex is None:
+                setattr(self, property_name, render_info.result)
+                continue
+
+            friendly_property_name = property_name[1:].replace('_', ' ')
             if ex.args and ex.args[0].startswith(
                     "UndefinedError: 'None' has no attribute"):
                 # Common during HA startup - so just a warning
-                _LOGGER.warning('Could not render template %s,'
-                                ' the state is unknown.', self._name)
-            else:
-                self._state = None
-                _LOGGER.error('Could not render template %s: %s', self._name,
-                              ex)
-        for property_name, template in (
-                ('_icon', self._icon_template),
-                ('_entity_picture', self._entity_picture_template),
-                ('_name', self._friendly_name_template)):
-            if template is None:
+                _LOGGER.warning('Could not render %s template %s,'
+                                ' the state is unknown.',
+                                friendly_property_name, self._name)
                 continue
 
             try:
-                setattr(self, property_name, template.async_render())
-            except TemplateError as ex:
-                friendly_property_name = property_name[1:].replace('_', ' ')
-                if ex.args and ex.args[0].startswith(
-                        "UndefinedError: 'None' has no attribute"):
-                    # Common during HA startup - so just a warning
-                    _LOGGER.warning('Could not render %s template %s,'
-                                    ' the state is unknown.',
-                                    friendly_property_name, self._name)
-                    continue
-
-                try:
-                    setattr(self, property_name,
-                            getattr(super(), property_name))
-                except AttributeError:
-                    _LOGGER.error('Could not render %s template %s: %s',
-                                  friendly_property_name, self._name, ex)
+                setattr(self, property_name,
+                        getattr(super(), property_name))
+            except AttributeError:
+                _LOGGER.error('Could not render %s template %s: %s',
+                              friendly_property_name, self._name, ex)
+
+        if self._tracker is None or self._tracker.async_update(
+                *(render_info for _, render_info in render_infos)):
+            return
+
+        # The templates stopped accessing specific states
+        self._tracker = None
+        _log_untracked(self._device_id, [
+            tpl_name[:-9] for tpl_name, render_info in render_infos
+            if render_info.listeners(match_all=False) is None])
@@ -5,6 +5,7 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/tts/
 """
 import asyncio
+from collections import OrderedDict
 import ctypes
 import functools as ft
 import hashlib
@@ -23,11 +24,12 @@ from homeassistant.components.media_player import (
     SERVICE_PLAY_MEDIA)
 from homeassistant.components.media_player import DOMAIN as DOMAIN_MP
 from homeassistant.const import ATTR_ENTITY_ID
-from homeassistant.core import callback
+from homeassistant.core import EXECUTOR_IO, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_per_platform
 import homeassistant.helpers.config_validation as cv
 from homeassistant.setup import async_prepare_setup_platform
+from homeassistant.util.json import load_json, save_json
 
 REQUIREMENTS = ['mutagen==1.41.1']
 
@@ -43,16 +45,22 @@ CONF_CACHE = 'cache'
 CONF_CACHE_DIR = 'cache_dir'
 CONF_LANG = 'language'
 CONF_TIME_MEMORY = 'time_memory'
+CONF_MEMORY_CACHE_SIZE = 'memory_cache_size'
 CONF_BASE_URL = 'base_url'
 
 DEFAULT_CACHE = True
 DEFAULT_CACHE_DIR = 'tts'
 DEFAULT_TIME_MEMORY = 300
+DEFAULT_MEMORY_CACHE_SIZE = 20 * 1024 * 1024  # bytes
 DEPENDENCIES = ['http']
 DOMAIN = 'tts'
 
 MEM_CACHE_FILENAME = 'filename'
 MEM_CACHE_VOICE = 'voice'
+MEM_CACHE_EXPIRE = 'expire'
+
+# Index of the file cache, kept in the cache dir
+INDEX_FILENAME = 'index.json'
 
 SERVICE_CLEAR_CACHE = 'clear_cache'
 SERVICE_SAY = 'say'
@@ -66,6 +74,8 @@ PLATFORM_SCHEMA = cv.PLATFORM_SCHEMA.extend({
     vol.Optional(CONF_CACHE_DIR, default=DEFAULT_CACHE_DIR): cv.string,
     vol.Optional(CONF_TIME_MEMORY, default=DEFAULT_TIME_MEMORY):
         vol.All(vol.Coerce(int), vol.Range(min=60, max=57600)),
+    vol.Optional(CONF_MEMORY_CACHE_SIZE, default=DEFAULT_MEMORY_CACHE_SIZE):
+        vol.All(vol.Coerce(int), vol.Range(min=0)),
     vol.Optional(CONF_BASE_URL): cv.string,
 })
 
@@ -89,9 +99,12 @@ async def async_setup(hass, config):
         use_cache = conf.get(CONF_CACHE, DEFAULT_CACHE)
         cache_dir = conf.get(CONF_CACHE_DIR, DEFAULT_CACHE_DIR)
         time_memory = conf.get(CONF_TIME_MEMORY, DEFAULT_TIME_MEMORY)
+        memory_size = conf.get(
+            CONF_MEMORY_CACHE_SIZE, DEFAULT_MEMORY_CACHE_SIZE)
         base_url = conf.get(CONF_BASE_URL) or hass.config.api.base_url
 
-        await tts.async_init_cache(use_cache, cache_dir, time_memory, base_url)
+        await tts.async_init_cache(
+            use_cache, cache_dir, time_memory, base_url, memory_size)
     except (HomeAssistantError, KeyError) as err:
         _LOGGER.error("Error on cache init %s", err)
         return False
@@ -172,8 +185,23 @@ async def async_setup(hass, config):
     return True
 
 
+def _voice_key(filename):
+    """Return the cache key of a voice file."""
+    record = _RE_VOICE_FILE.match(filename.lower())
+    if not record:
+        raise HomeAssistantError("Wrong tts file format!")
+
+    return KEY_PATTERN.format(
+        record.group(1), record.group(2), record.group(3), record.group(4))
+
+
 class SpeechManager:
-    """Representation of a speech store."""
+    """Representation of a speech store.
+
+    Voices are kept in memory for time_memory seconds, the least recently
+    used ones are dropped earlier when they take up more than memory_size
+    bytes. Cached voice files are listed in an index in the cache dir.
+    """
 
     def __init__(self, hass):
         """Initialize a speech store."""
@@ -183,15 +211,20 @@ class SpeechManager:
         self.use_cache = DEFAULT_CACHE
         self.cache_dir = DEFAULT_CACHE_DIR
         self.time_memory = DEFAULT_TIME_MEMORY
+        self.memory_size = DEFAULT_MEMORY_CACHE_SIZE
         self.base_url = None
         self.file_cache = {}
-        self.mem_cache = {}
+        self.mem_cache = OrderedDict()
+        self.mem_cache_bytes = 0
+        self._index_lock = asyncio.Lock(loop=hass.loop)
 
     async def async_init_cache(self, use_cache, cache_dir, time_memory,
-                               base_url):
+                               base_url,
+                               memory_size=DEFAULT_MEMORY_CACHE_SIZE):
         """Init config folder and load file cache."""
         self.use_cache = use_cache
         self.time_memory = time_memory
+        self.memory_size = memory_size
         self.base_url = base_url
 
         def init_tts_cache_dir(cache_dir):
@@ -210,7 +243,19 @@ class SpeechManager:
             raise HomeAssistantError("Can't init cache dir {}".format(err))
 
         def get_cache_files():
-            """Return a dict of given engine files."""
+            """Return a dict of given engine files and if it was indexed."""
+            index_file = os.path.join(self.cache_dir, INDEX_FILENAME)
+            if os.path.isfile(index_file):
+                try:
+                    index = load_json(index_file)
+                except HomeAssistantError:
+                    index = None
+                if isinstance(index, dict) and all(
+                        isinstance(filename, str)
+                        for filename in index.values()):
+                    return index, True
+                _LOGGER.warning("Rebuilding invalid cache index")
+
             cache = {}
 
             folder_data = os.listdir(self.cache_dir)
@@ -222,19 +267,37 @@ class SpeechManager:
                         record.group(4)
                     )
                     cache[key.lower()] = file_data.lower()
-            return cache
+            return cache, False
 
         try:
-            cache_files = await self.hass.async_add_job(get_cache_files)
+            cache_files, indexed = await self.hass.async_add_job(
+                get_cache_files)
         except OSError as err:
             raise HomeAssistantError("Can't read cache dir {}".format(err))
 
         if cache_files:
             self.file_cache.update(cache_files)
 
+        if not indexed:
+            await self._async_save_index()
+
+    async def _async_save_index(self):
+        """Write the index of the file cache.
+
+        This method is a coroutine.
+        """
+        async with self._index_lock:
+            try:
+                await self.hass.async_add_executor_job(
+                    save_json, os.path.join(self.cache_dir, INDEX_FILENAME),
+                    dict(self.file_cache), executor=EXECUTOR_IO)
+            except HomeAssistantError as err:
+                _LOGGER.error("Can't write cache index: %s", err)
+
     async def async_clear_cache(self):
         """Read file cache and delete files."""
-        self.mem_cache = {}
+        for key in list(self.mem_cache):
+            self._async_remove_from_memcache(key)
 
         def remove_files():
             """Remove files from filesystem."""
@@ -247,6 +310,7 @@ class SpeechManager:
 
         await self.hass.async_add_job(remove_files)
         self.file_cache = {}
+        await self._async_save_index()
 
     @callback
     def async_register_engine(self, engine, provider, config):
@@ -296,10 +360,10 @@ class SpeechManager:
         # Is speech already in memory
         if key in self.mem_cache:
             filename = self.mem_cache[key][MEM_CACHE_FILENAME]
-        # Is file store in file cache
+            self.mem_cache.move_to_end(key)
+        # Is file store in file cache, it is streamed from there
         elif use_cache and key in self.file_cache:
             filename = self.file_cache[key]
-            self.hass.async_create_task(self.async_file_to_mem(key))
         # Load speech from provider into memory
         else:
             filename = await self.async_get_tts_audio(
@@ -350,12 +414,15 @@ class SpeechManager:
 
         try:
             await self.hass.async_add_job(save_speech)
-            self.file_cache[key] = filename
         except OSError:
             _LOGGER.error("Can't write %s", filename)
+            return
+
+        self.file_cache[key] = filename
+        await self._async_save_index()
 
     async def async_file_to_mem(self, key):
-        """Load voice from file cache into memory.
+        """Load voice from file cache into memory and return it.
 
         This method is a coroutine.
         """
@@ -374,44 +441,84 @@ class SpeechManager:
             data = await self.hass.async_add_job(load_speech)
         except OSError:
             del self.file_cache[key]
+            self.hass.async_create_task(self._async_save_index())
             raise HomeAssistantError("Can't read {}".format(voice_file))
 
         self._async_store_to_memcache(key, filename, data)
+        return data
 
     @callback
     def _async_store_to_memcache(self, key, filename, data):
         """Store data to memcache and set timer to remove it."""
+        self._async_remove_from_memcache(key)
+
+        @callback
+        def async_remove_from_mem():
+            """Cleanup memcache."""
+            self._async_remove_from_memcache(key)
+
         self.mem_cache[key] = {
             MEM_CACHE_FILENAME: filename,
             MEM_CACHE_VOICE: data,
+            MEM_CACHE_EXPIRE: self.hass.loop.call_later(
+                self.time_memory, async_remove_from_mem),
         }
+        self.mem_cache_bytes += len(data)
 
-        @callback
-        def async_remove_from_mem():
-            """Cleanup memcache."""
-            self.mem_cache.pop(key)
+        # Drop the least recently used voices, but keep the new one
+        while self.mem_cache_bytes > self.memory_size and \
+                len(self.mem_cache) > 1:
+            self._async_remove_from_memcache(next(iter(self.mem_cache)))
+
+    @callback
+    def _async_remove_from_memcache(self, key):
+        """Remove a voice from memcache."""
+        voice = self.mem_cache.pop(key, None)
+        if voice is None:
+            return
+
+        voice[MEM_CACHE_EXPIRE].cancel()
+        self.mem_cache_bytes -= len(voice[MEM_CACHE_VOICE])
+
+    async def async_get_voice_file(self, filename):
+        """Return the path of a voice file to stream from the file cache.
+
+        Returns None if the voice is in memory or not in the file cache.
+        This method is a coroutine.
+        """
+        key = _voice_key(filename)
+
+        if key in self.mem_cache or key not in self.file_cache:
+            return None
+
+        voice_file = os.path.join(self.cache_dir, self.file_cache[key])
+
+        if not await self.hass.async_add_executor_job(
+                os.path.isfile, voice_file, executor=EXECUTOR_IO):
+            del self.file_cache[key]
+            self.hass.async_create_task(self._async_save_index())
+            return None
 
-        self.hass.loop.call_later(self.time_memory, async_remove_from_mem)
+        return voice_file
 
     async def async_read_tts(self, filename):
         """Read a voice file and return binary.
 
         This method is a coroutine.
         """
-        record = _RE_VOICE_FILE.match(filename.lower())
-        if not record:
-            raise HomeAssistantError("Wrong tts file format!")
+        key = _voice_key(filename)
 
-        key = KEY_PATTERN.format(
-            record.group(1), record.group(2), record.group(3), record.group(4))
-
-        if key not in self.mem_cache:
-            if key not in self.file_cache:
-                raise HomeAssistantError("{} not in cache!".format(key))
-            await self.async_file_to_mem(key)
+        if key in self.mem_cache:
+            self.mem_cache.move_to_end(key)
+            data = self.mem_cache[key][MEM_CACHE_VOICE]
+        elif key in self.file_cache:
+            # Other voices may evict this one while it is loaded
+            data = await self.async_file_to_mem(key)
+        else:
+            raise HomeAssistantError("{} not in cache!".format(key))
 
         content, _ = mimetypes.guess_type(filename)
-        return (content, self.mem_cache[key][MEM_CACHE_VOICE])
+        return (content, data)
 
     @staticmethod
     def write_tags(filename, data, provider, message, language, options):
@@ -539,6 +646,10 @@ class TextToSpeechView(HomeAssistantView):
     async def get(self, request, filename):
         """Start a get request."""
         try:
+            voice_file = await self.tts.async_get_voice_file(filename)
+            if voice_file is not None:
+                return web.FileResponse(voice_file)
+
             content, data = await self.tts.async_read_tts(filename)
         except HomeAssistantError as err:
             _LOGGER.error("Error on load tts: %s", err)
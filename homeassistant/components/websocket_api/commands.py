@@ -1,24 +1,36 @@
 """Commands part of Websocket API."""
+from collections import OrderedDict
+
 import voluptuous as vol
 
-from homeassistant.const import MATCH_ALL, EVENT_TIME_CHANGED
+from homeassistant.const import (
+    MATCH_ALL, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED)
 from homeassistant.core import callback, DOMAIN as HASS_DOMAIN
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.service import async_get_all_descriptions
 
 from . import const, decorators, messages
+from .const import JSON_DUMP
 
 
 TYPE_CALL_SERVICE = 'call_service'
 TYPE_EVENT = 'event'
 TYPE_GET_CONFIG = 'get_config'
+TYPE_GET_QUEUE_STATS = 'get_queue_stats'
 TYPE_GET_SERVICES = 'get_services'
 TYPE_GET_STATES = 'get_states'
 TYPE_PING = 'ping'
 TYPE_PONG = 'pong'
+TYPE_STATE_DIFF = 'state_diff'
 TYPE_SUBSCRIBE_EVENTS = 'subscribe_events'
+TYPE_SUBSCRIBE_STATES = 'subscribe_states'
+TYPE_SUPPORTED_FEATURES = 'supported_features'
 TYPE_UNSUBSCRIBE_EVENTS = 'unsubscribe_events'
 
+# Number of recently forwarded events to keep the JSON encoding of
+EVENT_JSON_CACHE_SIZE = 32
+
 
 @callback
 def async_register_commands(hass):
@@ -28,11 +40,17 @@ def async_register_commands(hass):
               SCHEMA_SUBSCRIBE_EVENTS)
     async_reg(TYPE_UNSUBSCRIBE_EVENTS, handle_unsubscribe_events,
               SCHEMA_UNSUBSCRIBE_EVENTS)
+    async_reg(TYPE_SUBSCRIBE_STATES, handle_subscribe_states,
+              SCHEMA_SUBSCRIBE_STATES)
     async_reg(TYPE_CALL_SERVICE, handle_call_service, SCHEMA_CALL_SERVICE)
     async_reg(TYPE_GET_STATES, handle_get_states, SCHEMA_GET_STATES)
     async_reg(TYPE_GET_SERVICES, handle_get_services, SCHEMA_GET_SERVICES)
     async_reg(TYPE_GET_CONFIG, handle_get_config, SCHEMA_GET_CONFIG)
+    async_reg(TYPE_GET_QUEUE_STATS, handle_get_queue_stats,
+              SCHEMA_GET_QUEUE_STATS)
     async_reg(TYPE_PING, handle_ping, SCHEMA_PING)
+    async_reg(TYPE_SUPPORTED_FEATURES, handle_supported_features,
+              SCHEMA_SUPPORTED_FEATURES)
 
 
 SCHEMA_SUBSCRIBE_EVENTS = messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
@@ -41,6 +59,17 @@ SCHEMA_SUBSCRIBE_EVENTS = messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
 })
 
 
+SCHEMA_SUBSCRIBE_STATES = vol.All(
+    cv.has_at_least_one_key('entity_ids', 'domains'),
+    messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
+        vol.Required('type'): TYPE_SUBSCRIBE_STATES,
+        vol.Optional('entity_ids', default=[]): cv.entity_ids,
+        vol.Optional('domains', default=[]):
+            vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional('state_only', default=False): cv.boolean,
+    }))
+
+
 SCHEMA_UNSUBSCRIBE_EVENTS = messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
     vol.Required('type'): TYPE_UNSUBSCRIBE_EVENTS,
     vol.Required('subscription'): cv.positive_int,
@@ -70,11 +99,22 @@ SCHEMA_GET_CONFIG = messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
 })
 
 
+SCHEMA_GET_QUEUE_STATS = messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
+    vol.Required('type'): TYPE_GET_QUEUE_STATS,
+})
+
+
 SCHEMA_PING = messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
     vol.Required('type'): TYPE_PING,
 })
 
 
+SCHEMA_SUPPORTED_FEATURES = messages.BASE_COMMAND_MESSAGE_SCHEMA.extend({
+    vol.Required('type'): TYPE_SUPPORTED_FEATURES,
+    vol.Required('features'): {str: int},
+})
+
+
 def event_message(iden, event):
     """Return an event message."""
     return {
@@ -84,6 +124,90 @@ def event_message(iden, event):
     }
 
 
+class _EventJSONCache:
+    """Cache the JSON encoding of recently forwarded events.
+
+    Events are not hashable, so they are keyed by id and the cached event
+    is kept alive to make sure the id is not reused while in the cache.
+    """
+
+    def __init__(self, size):
+        """Initialize the cache."""
+        self._size = size
+        self._cache = OrderedDict()  # type: OrderedDict
+
+    def encode(self, event):
+        """Return the event encoded as JSON."""
+        cached = self._cache.get(id(event))
+        if cached is not None and cached[0] is event:
+            return cached[1]
+
+        encoded = JSON_DUMP(event.as_dict())
+        self._cache[id(event)] = (event, encoded)
+        if len(self._cache) > self._size:
+            self._cache.popitem(last=False)
+        return encoded
+
+
+_EVENT_JSON_CACHE = _EventJSONCache(EVENT_JSON_CACHE_SIZE)
+
+
+def cached_event_message(iden, event):
+    """Return an event message, encoded as JSON.
+
+    The event is only encoded once for all subscriptions it is forwarded
+    to, the message id is spliced in.
+    """
+    return '{{"id": {}, "type": "{}", "event": {}}}'.format(
+        iden, TYPE_EVENT, _EVENT_JSON_CACHE.encode(event))
+
+
+def state_diff_message(iden, event):
+    """Return a message with the changes of a state_changed event.
+
+    New entities are sent in full, for existing entities only the state,
+    attributes and last_changed are included when they changed. A removed
+    entity is flagged with removed.
+    """
+    old_state = event.data.get('old_state')
+    new_state = event.data.get('new_state')
+    message = {
+        'id': iden,
+        'type': TYPE_STATE_DIFF,
+        'entity_id': event.data['entity_id'],
+    }
+
+    if new_state is None:
+        message['removed'] = True
+        return message
+
+    message['last_updated'] = new_state.last_updated
+    message['context_id'] = new_state.context.id
+
+    if old_state is None:
+        message['state'] = new_state.state
+        message['attributes'] = dict(new_state.attributes)
+        message['last_changed'] = new_state.last_changed
+        return message
+
+    if new_state.state != old_state.state:
+        message['state'] = new_state.state
+    if new_state.last_changed != old_state.last_changed:
+        message['last_changed'] = new_state.last_changed
+
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    changed = {key: value for key, value in new_attributes.items()
+               if key not in old_attributes or old_attributes[key] != value}
+    if changed:
+        message['attributes'] = changed
+    removed = [key for key in old_attributes if key not in new_attributes]
+    if removed:
+        message['removed_attributes'] = removed
+
+    return message
+
+
 def pong_message(iden):
     """Return a pong message."""
     return {
@@ -98,12 +222,25 @@ def handle_subscribe_events(hass, connection, msg):
 
     Async friendly.
     """
-    async def forward_events(event):
+    @callback
+    def forward_events(event):
         """Forward events to websocket."""
         if event.event_type == EVENT_TIME_CHANGED:
             return
 
-        connection.send_message(event_message(msg['id'], event))
+        try:
+            message = cached_event_message(msg['id'], event)
+        except TypeError as err:
+            connection.logger.error(
+                'Unable to serialize to JSON: %s\n%s', err, event)
+            return
+
+        if event.event_type == EVENT_STATE_CHANGED:
+            # A pending change of the same entity is superseded
+            connection.send_message(
+                message, (msg['id'], event.data.get('entity_id')))
+        else:
+            connection.send_message(message)
 
     connection.event_listeners[msg['id']] = hass.bus.async_listen(
         msg['event_type'], forward_events)
@@ -111,6 +248,35 @@ def handle_subscribe_events(hass, connection, msg):
     connection.send_message(messages.result_message(msg['id']))
 
 
+@callback
+def handle_subscribe_states(hass, connection, msg):
+    """Handle subscribe states command.
+
+    Only state changes of the requested entities and domains are sent, as
+    diffs. The subscription is removed with the unsubscribe_events command.
+
+    Async friendly.
+    """
+    state_only = msg['state_only']
+
+    @callback
+    def forward_state_changes(event):
+        """Forward state changes to websocket."""
+        if state_only:
+            old_state = event.data.get('old_state')
+            new_state = event.data.get('new_state')
+            if old_state is not None and new_state is not None and \
+                    old_state.state == new_state.state:
+                return
+
+        connection.send_message(state_diff_message(msg['id'], event))
+
+    connection.event_listeners[msg['id']] = async_track_state_change_event(
+        hass, msg['entity_ids'], forward_state_changes, msg['domains'])
+
+    connection.send_message(messages.result_message(msg['id']))
+
+
 @callback
 def handle_unsubscribe_events(hass, connection, msg):
     """Handle unsubscribe events command.
@@ -174,6 +340,20 @@ def handle_get_config(hass, connection, msg):
         msg['id'], hass.config.as_dict()))
 
 
+@callback
+@decorators.require_owner
+def handle_get_queue_stats(hass, connection, msg):
+    """Handle get queue stats command.
+
+    Returns the outbound queue metrics of every active connection.
+
+    Async friendly.
+    """
+    connection.send_message(messages.result_message(
+        msg['id'], [handler.queue_stats for handler
+                    in hass.data.get(const.DATA_CONNECTIONS, ())]))
+
+
 @callback
 def handle_ping(hass, connection, msg):
     """Handle ping command.
@@ -181,3 +361,13 @@ def handle_ping(hass, connection, msg):
     Async friendly.
     """
     connection.send_message(pong_message(msg['id']))
+
+
+@callback
+def handle_supported_features(hass, connection, msg):
+    """Handle supported features command.
+
+    Async friendly.
+    """
+    connection.supported_features = msg['features']
+    connection.send_message(messages.result_message(msg['id']))
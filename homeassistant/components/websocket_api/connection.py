@@ -21,6 +21,7 @@ class ActiveConnection:
             self.refresh_token_id = None
 
         self.event_listeners = {}
+        self.supported_features = {}
         self.last_id = 0
 
     def context(self, msg):
@@ -1,11 +1,18 @@
 """Websocket constants."""
 import asyncio
 from concurrent import futures
+from functools import partial
+import json
+
+from homeassistant.helpers.json import JSONEncoder
 
 DOMAIN = 'websocket_api'
 URL = '/api/websocket'
 MAX_PENDING_MSG = 512
 
+# Handlers of the active websocket connections
+DATA_CONNECTIONS = DOMAIN + '.connections'
+
 ERR_ID_REUSE = 1
 ERR_INVALID_FORMAT = 2
 ERR_NOT_FOUND = 3
@@ -14,7 +21,12 @@ ERR_UNKNOWN_ERROR = 5
 
 TYPE_RESULT = 'result'
 
+# Client supports receiving multiple messages as a JSON array in one frame
+FEATURE_BATCH_MESSAGES = 'batch_messages'
+
 # Define the possible errors that occur when connections are cancelled.
 # Originally, this was just asyncio.CancelledError, but issue #9546 showed
 # that futures.CancelledErrors can also occur in some situations.
 CANCELLATION_ERRORS = (asyncio.CancelledError, futures.CancelledError)
+
+JSON_DUMP = partial(json.dumps, cls=JSONEncoder)
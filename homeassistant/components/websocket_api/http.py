@@ -1,8 +1,6 @@
 """View to accept incoming websocket connection."""
 import asyncio
 from contextlib import suppress
-from functools import partial
-import json
 import logging
 
 from aiohttp import web, WSMsgType
@@ -11,14 +9,14 @@ import async_timeout
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import callback
 from homeassistant.components.http import HomeAssistantView
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.util.coalescing_queue import CoalescingQueue
 
-from .const import MAX_PENDING_MSG, CANCELLATION_ERRORS, URL
+from .const import (
+    MAX_PENDING_MSG, CANCELLATION_ERRORS, URL, JSON_DUMP,
+    FEATURE_BATCH_MESSAGES, DATA_CONNECTIONS)
 from .auth import AuthPhase, auth_required_message
 from .error import Disconnect
 
-JSON_DUMP = partial(json.dumps, cls=JSONEncoder)
-
 
 class WebsocketAPIView(HomeAssistantView):
     """View to serve a websockets endpoint."""
@@ -41,37 +39,73 @@ class WebSocketHandler:
         self.hass = hass
         self.request = request
         self.wsock = None
-        self._to_write = asyncio.Queue(maxsize=MAX_PENDING_MSG, loop=hass.loop)
+        self._to_write = CoalescingQueue(hass.loop, MAX_PENDING_MSG)
+        self._connection = None
         self._handle_task = None
         self._writer_task = None
         self._logger = logging.getLogger(
             "{}.connection.{}".format(__name__, id(self)))
 
+    @property
+    def queue_stats(self):
+        """Return the outbound queue metrics of this connection."""
+        return {
+            'pending': self._to_write.qsize(),
+            'max_pending': self._to_write.max_qsize,
+            'coalesced': self._to_write.coalesced,
+        }
+
     async def _writer(self):
-        """Write outgoing messages."""
+        """Write outgoing messages.
+
+        All queued messages are written at once. They are sent as a single
+        JSON array frame if the client supports batched messages.
+        """
         # Exceptions if Socket disconnected or cancelled by connection handler
         with suppress(RuntimeError, *CANCELLATION_ERRORS):
             while not self.wsock.closed:
-                message = await self._to_write.get()
-                if message is None:
+                messages = await self._to_write.get_batch()
+                stop = None in messages
+                if stop:
+                    messages = messages[:messages.index(None)]
+
+                encoded = []
+                for message in messages:
+                    self._logger.debug("Sending %s", message)
+                    # Pre-encoded messages are shared between connections
+                    if isinstance(message, str):
+                        encoded.append(message)
+                        continue
+                    try:
+                        encoded.append(JSON_DUMP(message))
+                    except TypeError as err:
+                        self._logger.error(
+                            'Unable to serialize to JSON: %s\n%s',
+                            err, message)
+
+                if len(encoded) > 1 and self._connection is not None and \
+                        self._connection.supported_features.get(
+                                FEATURE_BATCH_MESSAGES):
+                    encoded = ['[{}]'.format(','.join(encoded))]
+
+                for frame in encoded:
+                    await self.wsock.send_str(frame)
+
+                if stop:
                     break
-                self._logger.debug("Sending %s", message)
-                try:
-                    await self.wsock.send_json(message, dumps=JSON_DUMP)
-                except TypeError as err:
-                    self._logger.error('Unable to serialize to JSON: %s\n%s',
-                                       err, message)
 
     @callback
-    def _send_message(self, message):
+    def _send_message(self, message, key=None):
         """Send a message to the client.
 
-        Closes connection if the client is not reading the messages.
+        A queued message with the same key is replaced, so a client that
+        falls behind only receives the latest version. Closes connection if
+        the client is not reading the messages.
 
         Async friendly.
         """
         try:
-            self._to_write.put_nowait(message)
+            self._to_write.put_nowait(message, key)
         except asyncio.QueueFull:
             self._logger.error("Client exceeded max pending messages [2]: %s",
                                MAX_PENDING_MSG)
@@ -90,6 +124,11 @@ class WebSocketHandler:
         await wsock.prepare(request)
         self._logger.debug("Connected")
 
+        connections = self.hass.data.get(DATA_CONNECTIONS)
+        if connections is None:
+            connections = self.hass.data[DATA_CONNECTIONS] = set()
+        connections.add(self)
+
         # Py3.7+
         if hasattr(asyncio, 'current_task'):
             # pylint: disable=no-member
@@ -137,7 +176,7 @@ class WebSocketHandler:
                 raise Disconnect
 
             self._logger.debug("Received %s", msg)
-            connection = await auth.async_handle(msg)
+            connection = self._connection = await auth.async_handle(msg)
 
             # Command phase
             while not wsock.closed:
@@ -170,6 +209,7 @@ class WebSocketHandler:
 
         finally:
             unsub_stop()
+            connections.discard(self)
 
             if connection is not None:
                 connection.async_close()
@@ -183,6 +223,7 @@ class WebSocketHandler:
 
             await wsock.close()
 
+            self._logger.debug("Queue stats: %s", self.queue_stats)
             if disconnect_warn is None:
                 self._logger.debug("Disconnected")
             else:
@@ -22,8 +22,9 @@ from homeassistant.const import (
     CONF_UNIT_SYSTEM_IMPERIAL, CONF_TEMPERATURE_UNIT, TEMP_CELSIUS,
     __version__, CONF_CUSTOMIZE, CONF_CUSTOMIZE_DOMAIN, CONF_CUSTOMIZE_GLOB,
     CONF_WHITELIST_EXTERNAL_DIRS, CONF_AUTH_PROVIDERS, CONF_AUTH_MFA_MODULES,
-    CONF_TYPE, CONF_ID)
-from homeassistant.core import callback, DOMAIN as CONF_CORE, HomeAssistant
+    CONF_TYPE, CONF_ID, CONF_EXECUTOR_WORKERS)
+from homeassistant.core import (
+    callback, DOMAIN as CONF_CORE, EXECUTOR_IO, HomeAssistant)
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.loader import get_component, get_platform
 from homeassistant.util.yaml import load_yaml, SECRET_YAML
@@ -202,6 +203,8 @@ CORE_CONFIG_SCHEMA = CUSTOMIZE_CONFIG_SCHEMA.extend({
         # pylint: disable=no-value-for-parameter
         vol.All(cv.ensure_list, [vol.IsDir()]),
     vol.Optional(CONF_PACKAGES, default={}): PACKAGES_CONFIG_SCHEMA,
+    vol.Optional(CONF_EXECUTOR_WORKERS): {
+        cv.string: vol.All(vol.Coerce(int), vol.Range(min=1))},
     vol.Optional(CONF_AUTH_PROVIDERS):
         vol.All(cv.ensure_list,
                 [auth_providers.AUTH_PROVIDER_SCHEMA.extend({
@@ -343,7 +346,8 @@ async def async_hass_config_yaml(hass: HomeAssistant) -> Dict:
                 "Config file not found in: {}".format(hass.config.config_dir))
         return load_yaml_config_file(path)
 
-    return await hass.async_add_executor_job(_load_hass_yaml_config)
+    return await hass.async_add_executor_job(
+        _load_hass_yaml_config, executor=EXECUTOR_IO)
 
 
 def find_config_file(config_dir: Optional[str]) -> Optional[str]:
@@ -508,6 +512,9 @@ async def async_process_ha_core_config(
 
     set_time_zone(config.get(CONF_TIME_ZONE))
 
+    if CONF_EXECUTOR_WORKERS in config:
+        hass.async_set_executor_workers(config[CONF_EXECUTOR_WORKERS])
+
     # Init whitelist external dir
     hac.whitelist_external_dirs = {hass.config.path('www')}
     if CONF_WHITELIST_EXTERNAL_DIRS in config:
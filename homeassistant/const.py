@@ -73,6 +73,7 @@ CONF_ENTITY_NAMESPACE = 'entity_namespace'
 CONF_ENTITY_PICTURE_TEMPLATE = 'entity_picture_template'
 CONF_EVENT = 'event'
 CONF_EXCLUDE = 'exclude'
+CONF_EXECUTOR_WORKERS = 'executor_workers'
 CONF_FILE_PATH = 'file_path'
 CONF_FILENAME = 'filename'
 CONF_FOR = 'for'
@@ -5,14 +5,12 @@ Home Assistant is a Home Automation framework for observing the state
 of entities and react to changes.
 """
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 import datetime
 import enum
 import logging
 import os
 import pathlib
 import re
-import sys
 import threading
 from time import monotonic
 import uuid
@@ -43,6 +41,7 @@ from homeassistant.util.async_ import (
 from homeassistant import util
 import homeassistant.util.dt as dt_util
 from homeassistant.util import location
+from homeassistant.util.executor import InstrumentedThreadPoolExecutor
 from homeassistant.util.unit_system import UnitSystem, METRIC_SYSTEM  # NOQA
 
 # Typing imports that create a circular dependency
@@ -67,6 +66,20 @@ ENTITY_ID_PATTERN = re.compile(r"^(\w+)\.(\w+)$")
 # How long to wait till things that run on startup have to finish.
 TIMEOUT_EVENT_START = 15
 
+# Executor pools for jobs that should not wait behind each other
+EXECUTOR_DEFAULT = 'default'
+EXECUTOR_DATABASE = 'database'
+EXECUTOR_DEVICE_UPDATE = 'device_update'
+EXECUTOR_IMAGE_PROCESSING = 'image_processing'
+EXECUTOR_IO = 'io'
+
+# Pools without a size use the default size of ThreadPoolExecutor
+DEFAULT_EXECUTOR_WORKERS = {
+    EXECUTOR_DATABASE: 4,
+    EXECUTOR_IMAGE_PROCESSING: 2,
+    EXECUTOR_IO: 4,
+}
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -131,11 +144,11 @@ class HomeAssistant:
         """Initialize new Home Assistant object."""
         self.loop = loop or asyncio.get_event_loop()
 
-        executor_opts = {'max_workers': None}  # type: Dict[str, Any]
-        if sys.version_info[:2] >= (3, 6):
-            executor_opts['thread_name_prefix'] = 'SyncWorker'
-
-        self.executor = ThreadPoolExecutor(**executor_opts)
+        self.executor = InstrumentedThreadPoolExecutor(
+            thread_name_prefix='SyncWorker')
+        self.executors = {
+            EXECUTOR_DEFAULT: self.executor,
+        }  # type: Dict[str, InstrumentedThreadPoolExecutor]
         self.loop.set_default_executor(self.executor)
         self.loop.set_exception_handler(async_loop_exception_handler)
         self._pending_tasks = []  # type: list
@@ -293,10 +306,13 @@ class HomeAssistant:
     def async_add_executor_job(
             self,
             target: Callable[..., T],
-            *args: Any) -> Awaitable[T]:
-        """Add an executor job from within the event loop."""
+            *args: Any, executor: str = EXECUTOR_DEFAULT) -> Awaitable[T]:
+        """Add an executor job from within the event loop.
+
+        executor: name of the executor pool to run the job in.
+        """
         task = self.loop.run_in_executor(
-            None, target, *args)
+            self.async_get_executor(executor), target, *args)
 
         # If a task is scheduled
         if self._track_task:
@@ -304,6 +320,37 @@ class HomeAssistant:
 
         return task
 
+    @callback
+    def async_get_executor(
+            self, name: str) -> InstrumentedThreadPoolExecutor:
+        """Return an executor pool, creating it on first use.
+
+        The size of a pool is taken from the executor_workers configuration.
+        """
+        executor = self.executors.get(name)
+
+        if executor is None:
+            executor = self.executors[name] = InstrumentedThreadPoolExecutor(
+                self.config.executor_workers.get(
+                    name, DEFAULT_EXECUTOR_WORKERS.get(name)),
+                thread_name_prefix='SyncWorker_{}'.format(name))
+
+        return executor
+
+    @callback
+    def async_set_executor_workers(self, workers: Dict[str, int]) -> None:
+        """Set the maximum number of workers of executor pools."""
+        self.config.executor_workers.update(workers)
+
+        for name, max_workers in workers.items():
+            if name in self.executors:
+                self.executors[name].set_max_workers(max_workers)
+
+    def executor_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the metrics of the executor pools by name."""
+        return {name: executor.stats
+                for name, executor in self.executors.items()}
+
     @callback
     def async_track_tasks(self) -> None:
         """Track tasks so you can wait for all tasks to be done."""
@@ -385,7 +432,8 @@ class HomeAssistant:
         self.state = CoreState.not_running
         self.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
         await self.async_block_till_done()
-        self.executor.shutdown()
+        for executor in self.executors.values():
+            executor.shutdown()
 
         self.exit_code = exit_code
 
@@ -1058,9 +1106,8 @@ class ServiceRegistry:
         If blocking = True, will return boolean if service executed
         successfully within SERVICE_CALL_LIMIT.
 
-        This method will fire an event to call the service.
-        This event will be picked up by this ServiceRegistry and any
-        other ServiceRegistry that is listening on the EventBus.
+        The service is executed directly by this ServiceRegistry. An event
+        is still fired so other listeners on the EventBus see the call.
 
         Because the service is sent as an event you are not allowed to use
         the keys ATTR_DOMAIN and ATTR_SERVICE in your service_data.
@@ -1083,9 +1130,8 @@ class ServiceRegistry:
         If blocking = True, will return boolean if service executed
         successfully within SERVICE_CALL_LIMIT.
 
-        This method will fire an event to call the service.
-        This event will be picked up by this ServiceRegistry and any
-        other ServiceRegistry that is listening on the EventBus.
+        The service is executed directly by this ServiceRegistry. An event
+        is still fired so other listeners on the EventBus see the call.
 
         Because the service is sent as an event you are not allowed to use
         the keys ATTR_DOMAIN and ATTR_SERVICE in your service_data.
@@ -1093,69 +1139,67 @@ class ServiceRegistry:
         This method is a coroutine.
         """
         context = context or Context()
-        call_id = uuid.uuid4().hex
+        domain = domain.lower()
+        service = service.lower()
         event_data = {
-            ATTR_DOMAIN: domain.lower(),
-            ATTR_SERVICE: service.lower(),
+            ATTR_DOMAIN: domain,
+            ATTR_SERVICE: service,
             ATTR_SERVICE_DATA: service_data,
-            ATTR_SERVICE_CALL_ID: call_id,
+            ATTR_SERVICE_CALL_ID: uuid.uuid4().hex,
         }
 
-        if not blocking:
-            self._hass.bus.async_fire(
-                EVENT_CALL_SERVICE, event_data, EventOrigin.local, context)
-            return None
-
-        fut = asyncio.Future()  # type: asyncio.Future
+        self._hass.bus.async_fire(EVENT_CALL_SERVICE, event_data,
+                                  EventOrigin.local, context)
 
-        @callback
-        def service_executed(event: Event) -> None:
-            """Handle an executed service."""
-            if event.data[ATTR_SERVICE_CALL_ID] == call_id:
-                fut.set_result(True)
-                unsub()
+        if not self.has_service(domain, service):
+            _LOGGER.warning("Unable to find service %s/%s", domain, service)
+            return False if blocking else None
 
-        unsub = self._hass.bus.async_listen(
-            EVENT_SERVICE_EXECUTED, service_executed)
+        task = self._hass.async_create_task(self._async_execute_service(
+            domain, service, service_data, context))
 
-        self._hass.bus.async_fire(EVENT_CALL_SERVICE, event_data,
-                                  EventOrigin.local, context)
+        if not blocking:
+            return None
 
-        done, _ = await asyncio.wait([fut], timeout=SERVICE_CALL_LIMIT)
-        success = bool(done)
-        if not success:
-            unsub()
-        return success
+        done, _ = await asyncio.wait([task], timeout=SERVICE_CALL_LIMIT)
+        return bool(done) and task.result()
 
     async def _event_to_service_call(self, event: Event) -> None:
-        """Handle the SERVICE_CALLED events from the EventBus."""
-        service_data = event.data.get(ATTR_SERVICE_DATA) or {}
+        """Handle the SERVICE_CALLED events from remote instances.
+
+        Local service calls are executed directly by async_call.
+        """
+        if event.origin != EventOrigin.remote:
+            return
+
         domain = event.data.get(ATTR_DOMAIN).lower()  # type: ignore
         service = event.data.get(ATTR_SERVICE).lower()  # type: ignore
         call_id = event.data.get(ATTR_SERVICE_CALL_ID)
 
         if not self.has_service(domain, service):
-            if event.origin == EventOrigin.local:
-                _LOGGER.warning("Unable to find service %s/%s",
-                                domain, service)
             return
 
-        service_handler = self._services[domain][service]
+        await self._async_execute_service(
+            domain, service, event.data.get(ATTR_SERVICE_DATA), event.context)
 
-        def fire_service_executed() -> None:
-            """Fire service executed event."""
-            if not call_id:
-                return
+        if call_id:
+            self._hass.bus.async_fire(
+                EVENT_SERVICE_EXECUTED, {ATTR_SERVICE_CALL_ID: call_id},
+                EventOrigin.local, event.context)
 
-            data = {ATTR_SERVICE_CALL_ID: call_id}
+    async def _async_execute_service(self, domain: str, service: str,
+                                     service_data: Optional[Dict],
+                                     context: Context) -> bool:
+        """Validate the service data and execute the service handler.
 
-            if (service_handler.is_coroutinefunction or
-                    service_handler.is_callback):
-                self._hass.bus.async_fire(EVENT_SERVICE_EXECUTED, data,
-                                          EventOrigin.local, event.context)
-            else:
-                self._hass.bus.fire(EVENT_SERVICE_EXECUTED, data,
-                                    EventOrigin.local, event.context)
+        Returns False if the service handler raised an exception.
+        """
+        service_handler = self._services.get(domain, {}).get(service)
+
+        if service_handler is None:
+            return False
+
+        service_data = service_data or {}
 
         try:
             if service_handler.schema:
@@ -1163,28 +1207,23 @@ class ServiceRegistry:
         except vol.Invalid as ex:
             _LOGGER.error("Invalid service data for %s.%s: %s",
                           domain, service, humanize_error(service_data, ex))
-            fire_service_executed()
-            return
+            return True
 
-        service_call = ServiceCall(
-            domain, service, service_data, event.context)
+        service_call = ServiceCall(domain, service, service_data, context)
 
         try:
             if service_handler.is_callback:
                 service_handler.func(service_call)
-                fire_service_executed()
             elif service_handler.is_coroutinefunction:
                 await service_handler.func(service_call)
-                fire_service_executed()
             else:
-                def execute_service() -> None:
-                    """Execute a service and fires a SERVICE_EXECUTED event."""
-                    service_handler.func(service_call)
-                    fire_service_executed()
-
-                await self._hass.async_add_executor_job(execute_service)
+                await self._hass.async_add_executor_job(
+                    service_handler.func, service_call)
         except Exception:  # pylint: disable=broad-except
             _LOGGER.exception('Error executing service %s', service_call)
+            return False
+
+        return True
 
 
 class Config:
@@ -1202,6 +1241,9 @@ class Config:
         # If True, pip install is skipped for requirements on startup
         self.skip_pip = False  # type: bool
 
+        # Maximum number of workers by executor pool name
+        self.executor_workers = {}  # type: Dict[str, int]
+
         # List of loaded components
         self.components = set()  # type: set
 
@@ -44,15 +44,57 @@ class DeviceRegistry:
     def __init__(self, hass):
         """Initialize the device registry."""
         self.hass = hass
-        self.devices = None
+        self._devices = None
+        self._device_ids_by_identifier = {}
+        self._device_ids_by_connection = {}
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
 
+    @property
+    def devices(self):
+        """Return the registry entries by device id."""
+        return self._devices
+
+    @devices.setter
+    def devices(self, devices):
+        """Replace the registry entries and index them."""
+        self._devices = devices
+        self._device_ids_by_identifier = {}
+        self._device_ids_by_connection = {}
+
+        for device in (devices or {}).values():
+            self._async_index_device(device)
+
+    @callback
+    def _async_index_device(self, device):
+        """Index a device by its identifiers and connections.
+
+        An identifier or connection shared by devices keeps pointing at the
+        first registered device.
+        """
+        for iden in device.identifiers:
+            self._device_ids_by_identifier.setdefault(iden, device.id)
+        for conn in device.connections:
+            self._device_ids_by_connection.setdefault(conn, device.id)
+
     @callback
     def async_get_device(self, identifiers: set, connections: set):
         """Check if device is registered."""
+        device_ids = {
+            self._device_ids_by_identifier[iden] for iden in identifiers
+            if iden in self._device_ids_by_identifier}
+        device_ids.update(
+            self._device_ids_by_connection[conn] for conn in connections
+            if conn in self._device_ids_by_connection)
+
+        if not device_ids:
+            return None
+
+        if len(device_ids) == 1:
+            return self.devices[device_ids.pop()]
+
+        # Matches several devices, return the first registered one
         for device in self.devices.values():
-            if any(iden in device.identifiers for iden in identifiers) or \
-                    any(conn in device.connections for conn in connections):
+            if device.id in device_ids:
                 return device
         return None
 
@@ -146,6 +188,7 @@ class DeviceRegistry:
             return old
 
         new = self.devices[device_id] = attr.evolve(old, **changes)
+        self._async_index_device(new)
         self.async_schedule_save()
         return new
 
@@ -10,7 +10,8 @@ from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT, DEVICE_DEFAULT_NAME, STATE_OFF, STATE_ON,
     STATE_UNAVAILABLE, STATE_UNKNOWN, TEMP_CELSIUS, TEMP_FAHRENHEIT,
     ATTR_ENTITY_PICTURE, ATTR_SUPPORTED_FEATURES, ATTR_DEVICE_CLASS)
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import (
+    EXECUTOR_DEVICE_UPDATE, HomeAssistant, callback)
 from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.exceptions import NoEntitySpecifiedError
 from homeassistant.util import ensure_unique_string, slugify
@@ -346,7 +347,8 @@ class Entity:
             if hasattr(self, 'async_update'):
                 await self.async_update()
             elif hasattr(self, 'update'):
-                await self.hass.async_add_executor_job(self.update)
+                await self.hass.async_add_executor_job(
+                    self.update, executor=EXECUTOR_DEVICE_UPDATE)
         finally:
             self._update_staged = False
             if warning:
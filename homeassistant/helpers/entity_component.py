@@ -1,5 +1,6 @@
 """Helpers for components that manage entities."""
 import asyncio
+from bisect import insort
 from datetime import timedelta
 from itertools import chain
 import logging
@@ -7,8 +8,9 @@ import logging
 from homeassistant import config as conf_util
 from homeassistant.setup import async_prepare_setup_platform
 from homeassistant.const import (
-    ATTR_ENTITY_ID, CONF_SCAN_INTERVAL, CONF_ENTITY_NAMESPACE)
-from homeassistant.core import callback
+    ATTR_ENTITY_ID, CONF_SCAN_INTERVAL, CONF_ENTITY_NAMESPACE,
+    EVENT_HOMEASSISTANT_START)
+from homeassistant.core import CoreState, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_per_platform, discovery
 from homeassistant.helpers.service import extract_entity_ids
@@ -41,6 +43,18 @@ async def async_update_entity(hass, entity_id):
     await entity.async_update_ha_state(True)
 
 
+@callback
+@bind_hass
+def async_poll_stats(hass):
+    """Return the statistics of polled entity updates by entity_id."""
+    stats = {}
+    for entity_comp in hass.data.get(DATA_INSTANCES, {}).values():
+        # pylint: disable=protected-access
+        for platform in entity_comp._platforms.values():
+            stats.update(platform.poll_stats)
+    return stats
+
+
 class EntityComponent:
     """The EntityComponent manages platforms that manages entities.
 
@@ -63,6 +77,11 @@ class EntityComponent:
 
         self.config = None
 
+        # Group members as sorted (sort key, entity_id) and their sort keys
+        self._group_members = []
+        self._group_sort_keys = {}
+        self._group_update_pending = False
+
         self._platforms = {
             domain: self._async_init_entity_platform(domain, None)
         }
@@ -205,24 +224,63 @@ class EntityComponent:
 
     @callback
     def _async_update_group(self):
-        """Set up and/or update component group.
+        """Schedule an update of the component group.
+
+        Entities added in the same loop iteration result in a single group
+        update. While Home Assistant is not running yet, the group is only
+        updated once it starts.
 
         This method must be run in the event loop.
         """
-        if self.group_name is None:
+        if self.group_name is None or self._group_update_pending:
             return
 
-        ids = [entity.entity_id for entity in
-               sorted(self.entities,
-                      key=lambda entity: entity.name or entity.entity_id)]
+        self._group_update_pending = True
+
+        if self.hass.state == CoreState.not_running:
+            @callback
+            def async_update_group_at_start(event):
+                """Update the group now Home Assistant is starting."""
+                self.hass.async_create_task(self._async_set_group())
+
+            self.hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_START, async_update_group_at_start)
+        else:
+            self.hass.async_create_task(self._async_set_group())
+
+    async def _async_set_group(self):
+        """Set up and/or update component group.
+
+        Only entities added, removed or renamed since the last update change
+        the sorted member list.
+
+        This method is a coroutine.
+        """
+        self._group_update_pending = False
+
+        sort_keys = {entity.entity_id: entity.name or entity.entity_id
+                     for entity in self.entities}
+        changed = {entity_id for entity_id, sort_key
+                   in self._group_sort_keys.items()
+                   if sort_keys.get(entity_id) != sort_key}
 
-        self.hass.async_create_task(
-            self.hass.services.async_call(
-                'group', 'set', dict(
-                    object_id=slugify(self.group_name),
-                    name=self.group_name,
-                    visible=False,
-                    entities=ids)))
+        if changed:
+            self._group_members = [
+                member for member in self._group_members
+                if member[1] not in changed]
+
+        for entity_id, sort_key in sort_keys.items():
+            if self._group_sort_keys.get(entity_id) != sort_key:
+                insort(self._group_members, (sort_key, entity_id))
+
+        self._group_sort_keys = sort_keys
+
+        await self.hass.services.async_call(
+            'group', 'set', dict(
+                object_id=slugify(self.group_name),
+                name=self.group_name,
+                visible=False,
+                entities=[member[1] for member in self._group_members]))
 
     async def _async_reset(self):
         """Remove entities and reset the entity component to initial values.
@@ -239,6 +297,9 @@ class EntityComponent:
             self.domain: self._platforms[self.domain]
         }
         self.config = None
+        self._group_members = []
+        self._group_sort_keys = {}
+        self._group_update_pending = False
 
         if self.group_name is not None:
             await self.hass.services.async_call(
@@ -251,9 +312,12 @@ class EntityComponent:
             if entity_id in platform.entities:
                 await platform.async_remove_entity(entity_id)
 
-    async def async_prepare_reload(self):
+    async def async_prepare_reload(self, *, skip_reset=False):
         """Prepare reloading this entity component.
 
+        Returns the new config of the component. Unless skip_reset is set,
+        all entities are removed first.
+
         This method must be run in the event loop.
         """
         try:
@@ -269,7 +333,8 @@ class EntityComponent:
         if conf is None:
             return None
 
-        await self._async_reset()
+        if not skip_reset:
+            await self._async_reset()
         return conf
 
     def _async_init_entity_platform(self, platform_type, platform,
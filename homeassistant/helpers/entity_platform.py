@@ -1,19 +1,49 @@
 """Class to manage the entities for a single platform."""
 import asyncio
+import zlib
+
+import attr
 
 from homeassistant.const import DEVICE_DEFAULT_NAME
 from homeassistant.core import callback, valid_entity_id, split_entity_id
 from homeassistant.exceptions import HomeAssistantError, PlatformNotReady
+from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import (
     run_callback_threadsafe, run_coroutine_threadsafe)
 
-from .event import async_track_time_interval, async_call_later
+from .event import async_track_point_in_utc_time, async_call_later
 
 SLOW_SETUP_WARNING = 10
 SLOW_SETUP_MAX_WAIT = 60
 PLATFORM_NOT_READY_RETRIES = 10
 
 
+@attr.s(slots=True)
+class PollStats:
+    """Statistics of the polled updates of an entity.
+
+    Durations are in seconds, from the moment the poll is due until the new
+    state is written, so they include waiting for PARALLEL_UPDATES. Overruns
+    count the polls skipped because the previous update was still running.
+    """
+
+    updates = attr.ib(type=int, default=0)
+    overruns = attr.ib(type=int, default=0)
+    last_duration = attr.ib(type=float, default=None)
+    max_duration = attr.ib(type=float, default=0.0)
+    total_duration = attr.ib(type=float, default=0.0)
+
+
+def poll_offset(entity_id, scan_interval):
+    """Return the phase in seconds at which an entity is polled.
+
+    The phase is derived from the entity_id so the polls of entities with the
+    same scan interval are spread evenly over it, and stay put on restart.
+    """
+    return (scan_interval.total_seconds() *
+            zlib.crc32(entity_id.encode('utf-8')) / 2**32)
+
+
 class EntityPlatform:
     """Manage the entities for a single platform."""
 
@@ -41,12 +71,14 @@ class EntityPlatform:
         self.async_entities_added_callback = async_entities_added_callback
         self.config_entry = None
         self.entities = {}
+        self.poll_stats = {}
         self._tasks = []
-        # Method to cancel the state change listener
-        self._async_unsub_polling = None
+        # Methods to cancel the next poll of entities
+        self._async_unsub_polls = {}
+        # Polled updates that are running
+        self._poll_tasks = {}
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup = None
-        self._process_updates = asyncio.Lock(loop=hass.loop)
 
         # Platform is None for the EntityComponent "catch-all" EntityPlatform
         # which powers entity_component.add_entities
@@ -225,15 +257,6 @@ class EntityPlatform:
         await asyncio.wait(tasks, loop=self.hass.loop)
         self.async_entities_added_callback()
 
-        if self._async_unsub_polling is not None or \
-           not any(entity.should_poll for entity
-                   in self.entities.values()):
-            return
-
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass, self._update_entity_states, self.scan_interval
-        )
-
     async def _async_add_entity(self, entity, update_before_add,
                                 component_entities, entity_registry,
                                 device_registry):
@@ -355,6 +378,17 @@ class EntityPlatform:
 
         await entity.async_update_ha_state()
 
+        if entity_id not in self.entities:
+            return
+
+        # Once an entity of the platform polls, all its entities get a poll
+        # phase and should_poll is checked again on every poll.
+        if self._async_unsub_polls:
+            self._async_start_polling(entity)
+        elif entity.should_poll:
+            for platform_entity in list(self.entities.values()):
+                self._async_start_polling(platform_entity)
+
     async def async_reset(self):
         """Remove all entities and reset data.
 
@@ -372,42 +406,102 @@ class EntityPlatform:
 
         await asyncio.wait(tasks, loop=self.hass.loop)
 
-        if self._async_unsub_polling is not None:
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
-
     async def async_remove_entity(self, entity_id):
         """Remove entity id from platform."""
         await self.entities[entity_id].async_remove()
 
-        # Clean up polling job if no longer needed
-        if (self._async_unsub_polling is not None and
-                not any(entity.should_poll for entity
-                        in self.entities.values())):
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
+    @callback
+    def _async_start_polling(self, entity):
+        """Schedule the polls of an entity.
+
+        This method must be run in the event loop.
+        """
+        entity_id = entity.entity_id
+        if entity_id in self._async_unsub_polls:
+            return
 
-    async def _update_entity_states(self, now):
-        """Update the states of all the polling entities.
+        if entity.should_poll:
+            self.poll_stats[entity_id] = PollStats()
+        entity.async_on_remove(lambda: self._async_stop_polling(entity_id))
+        self._async_schedule_poll(entity_id, dt_util.utcnow())
 
-        To protect from flooding the executor, we will update async entities
-        in parallel and other entities sequential.
+    @callback
+    def _async_schedule_poll(self, entity_id, now):
+        """Schedule the first poll of an entity after now at its phase.
 
         This method must be run in the event loop.
         """
-        if self._process_updates.locked():
+        interval = self.scan_interval.total_seconds()
+        timestamp = now.timestamp()
+        next_poll = (timestamp + interval -
+                     (timestamp - poll_offset(entity_id,
+                                              self.scan_interval)) % interval)
+
+        @callback
+        def async_poll(now):
+            """Poll the entity."""
+            self._async_poll_entity(entity_id, now)
+
+        self._async_unsub_polls[entity_id] = async_track_point_in_utc_time(
+            self.hass, async_poll, dt_util.utc_from_timestamp(next_poll))
+
+    @callback
+    def _async_stop_polling(self, entity_id):
+        """Stop polling a removed entity.
+
+        This method must be run in the event loop.
+        """
+        unsub = self._async_unsub_polls.pop(entity_id, None)
+        if unsub is not None:
+            unsub()
+        self.poll_stats.pop(entity_id, None)
+
+    @callback
+    def _async_poll_entity(self, entity_id, now):
+        """Start the polled update of an entity and schedule the next one.
+
+        Polls are skipped while the previous update is still running.
+
+        This method must be run in the event loop.
+        """
+        entity = self.entities.get(entity_id)
+        if entity is None:
+            return
+
+        self._async_schedule_poll(entity_id, now)
+
+        if not entity.should_poll:
+            return
+
+        stats = self.poll_stats.get(entity_id)
+        if stats is None:
+            stats = self.poll_stats[entity_id] = PollStats()
+
+        if entity_id in self._poll_tasks:
+            stats.overruns += 1
             self.logger.warning(
-                "Updating %s %s took longer than the scheduled update "
-                "interval %s", self.platform_name, self.domain,
-                self.scan_interval)
+                "Updating %s took longer than the scheduled update "
+                "interval %s", entity_id, self.scan_interval)
             return
 
-        async with self._process_updates:
-            tasks = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))
+        self._poll_tasks[entity_id] = self.hass.async_create_task(
+            self._async_update_polled_entity(entity_id, entity))
+
+    async def _async_update_polled_entity(self, entity_id, entity):
+        """Update a polled entity and record the duration."""
+        start = self.hass.loop.time()
+
+        try:
+            await entity.async_update_ha_state(True)
+        finally:
+            del self._poll_tasks[entity_id]
+
+        stats = self.poll_stats.get(entity_id)
+        if stats is None:
+            return
 
-            if tasks:
-                await asyncio.wait(tasks, loop=self.hass.loop)
+        duration = self.hass.loop.time() - start
+        stats.updates += 1
+        stats.last_duration = duration
+        stats.total_duration += duration
+        stats.max_duration = max(stats.max_duration, duration)
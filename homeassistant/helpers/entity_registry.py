@@ -77,9 +77,33 @@ class EntityRegistry:
     def __init__(self, hass):
         """Initialize the registry."""
         self.hass = hass
-        self.entities = None
+        self._entities = None
+        self._entity_ids = {}
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
 
+    @property
+    def entities(self):
+        """Return the registry entries by entity_id."""
+        return self._entities
+
+    @entities.setter
+    def entities(self, entities):
+        """Replace the registry entries and index them."""
+        self._entities = entities
+        self._entity_ids = {}
+
+        for entry in (entities or {}).values():
+            self._async_index_entry(entry)
+
+    @callback
+    def _async_index_entry(self, entry):
+        """Index an entry by domain, platform and unique id.
+
+        The first registered entry wins if the key is not unique.
+        """
+        self._entity_ids.setdefault(
+            (entry.domain, entry.platform, entry.unique_id), entry.entity_id)
+
     @callback
     def async_is_registered(self, entity_id):
         """Check if an entity_id is currently registered."""
@@ -88,11 +112,7 @@ class EntityRegistry:
     @callback
     def async_get_entity_id(self, domain: str, platform: str, unique_id: str):
         """Check if an entity_id is currently registered."""
-        for entity in self.entities.values():
-            if entity.domain == domain and entity.platform == platform and \
-               entity.unique_id == unique_id:
-                return entity.entity_id
-        return None
+        return self._entity_ids.get((domain, platform, unique_id))
 
     @callback
     def async_generate_entity_id(self, domain, suggested_object_id):
@@ -128,6 +148,7 @@ class EntityRegistry:
             platform=platform,
         )
         self.entities[entity_id] = entity
+        self._async_index_entry(entity)
         _LOGGER.info('Registered new %s.%s entity: %s',
                      domain, platform, entity_id)
         self.async_schedule_save()
@@ -174,6 +195,9 @@ class EntityRegistry:
                 raise ValueError('New entity ID should be same domain')
 
             self.entities.pop(entity_id)
+            key = (old.domain, old.platform, old.unique_id)
+            if self._entity_ids.get(key) == entity_id:
+                self._entity_ids[key] = new_entity_id
             entity_id = changes['entity_id'] = new_entity_id
 
         if not changes:
@@ -1,16 +1,26 @@
 """Helpers for listening to events."""
 from datetime import timedelta
 import functools as ft
+import heapq
+import logging
 
 from homeassistant.loader import bind_hass
 from homeassistant.helpers.sun import get_astral_event_next
-from ..core import HomeAssistant, callback
+from ..core import HomeAssistant, callback, split_entity_id
 from ..const import (
     ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL,
     SUN_EVENT_SUNRISE, SUN_EVENT_SUNSET)
 from ..util import dt as dt_util
 from ..util.async_ import run_callback_threadsafe
 
+_LOGGER = logging.getLogger(__name__)
+
+TRACK_STATE_CHANGE_CALLBACKS = 'track_state_change_callbacks'
+TRACK_STATE_CHANGE_DOMAIN_CALLBACKS = 'track_state_change_domain_callbacks'
+TRACK_STATE_CHANGE_LISTENER = 'track_state_change_listener'
+TRACK_POINT_IN_TIME_SCHEDULER = 'track_point_in_time_scheduler'
+TRACK_SAME_STATE_TRACKER = 'track_same_state_tracker'
+
 # PyLint does not like the use of threaded_listener_factory
 # pylint: disable=invalid-name
 
@@ -55,19 +65,15 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
 
     # Ensure it is a lowercase list with entity ids we want to match on
     if entity_ids == MATCH_ALL:
-        pass
+        entity_ids = (MATCH_ALL,)
     elif isinstance(entity_ids, str):
         entity_ids = (entity_ids.lower(),)
     else:
-        entity_ids = tuple(entity_id.lower() for entity_id in entity_ids)
+        entity_ids = tuple({entity_id.lower() for entity_id in entity_ids})
 
     @callback
     def state_change_listener(event):
         """Handle specific state changes."""
-        if entity_ids != MATCH_ALL and \
-           event.data.get('entity_id') not in entity_ids:
-            return
-
         old_state = event.data.get('old_state')
         if old_state is not None:
             old_state = old_state.state
@@ -81,37 +87,236 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
                                event.data.get('old_state'),
                                event.data.get('new_state'))
 
-    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+    return _async_add_state_change_listener(
+        hass, entity_ids, state_change_listener)
 
 
 track_state_change = threaded_listener_factory(async_track_state_change)
 
 
+@callback
+@bind_hass
+def async_track_state_change_event(hass, entity_ids, action, domains=()):
+    """Track state_changed events of entities and domains.
+
+    The action is called with the state_changed event of the given entity
+    ids and of all entities in the given domains; other state changes do
+    not reach it.
+
+    Returns a function that can be called to remove the listener.
+
+    Must be run within the event loop.
+    """
+    entity_ids = tuple({entity_id.lower() for entity_id in entity_ids})
+    domains = tuple({domain.lower() for domain in domains})
+
+    @callback
+    def state_change_listener(event):
+        """Forward the state change."""
+        hass.async_run_job(action, event)
+
+    return _async_add_state_change_listener(
+        hass, entity_ids, state_change_listener, domains)
+
+
+track_state_change_event = threaded_listener_factory(
+    async_track_state_change_event)
+
+
+@callback
+def _async_add_state_change_listener(hass, entity_ids, listener, domains=()):
+    """Add a state_changed listener for entity_ids to the dispatch index.
+
+    All state change helpers share a single bus listener which only calls
+    the listeners registered for the entity that changed or its domain,
+    plus the listeners registered for MATCH_ALL.
+
+    Returns a function that can be called to remove the listener.
+    """
+    callbacks = hass.data.get(TRACK_STATE_CHANGE_CALLBACKS)
+
+    if callbacks is None:
+        callbacks = hass.data[TRACK_STATE_CHANGE_CALLBACKS] = {}
+        domain_callbacks = hass.data[TRACK_STATE_CHANGE_DOMAIN_CALLBACKS] = {}
+
+        @callback
+        def state_change_dispatcher(event):
+            """Dispatch state changes to the listeners of the entity."""
+            entity_id = event.data.get('entity_id')
+            targets = callbacks.get(entity_id, ()) + \
+                callbacks.get(MATCH_ALL, ())
+            if domain_callbacks:
+                targets += domain_callbacks.get(
+                    split_entity_id(entity_id)[0], ())
+
+            for target in targets:
+                try:
+                    target(event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error while processing state changed "
+                                      "for %s", entity_id)
+
+        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, state_change_dispatcher)
+    else:
+        domain_callbacks = hass.data[TRACK_STATE_CHANGE_DOMAIN_CALLBACKS]
+
+    # The listener tuples are replaced instead of mutated so a dispatch in
+    # progress is not affected by listeners removing themselves.
+    for index, keys in ((callbacks, entity_ids), (domain_callbacks, domains)):
+        for key in keys:
+            index[key] = index.get(key, ()) + (listener,)
+
+    @callback
+    def remove_listener():
+        """Remove the listener from the dispatch index."""
+        for index, keys in ((callbacks, entity_ids),
+                            (domain_callbacks, domains)):
+            for key in keys:
+                targets = index.get(key, ())
+                if listener not in targets:
+                    continue
+                targets = tuple(target for target in targets
+                                if target is not listener)
+                if targets:
+                    index[key] = targets
+                else:
+                    del index[key]
+
+        if not callbacks and not domain_callbacks and \
+                hass.data.get(TRACK_STATE_CHANGE_CALLBACKS) is callbacks:
+            hass.data.pop(TRACK_STATE_CHANGE_CALLBACKS)
+            hass.data.pop(TRACK_STATE_CHANGE_DOMAIN_CALLBACKS)
+            hass.data.pop(TRACK_STATE_CHANGE_LISTENER)()
+
+    return remove_listener
+
+
+class RenderInfoTracker:
+    """Follow the states accessed by the last renders of templates.
+
+    Every call to async_update replaces the subscription with the entities
+    and domains accessed by the given renders, so the listener only
+    receives the state_changed events that can change their results.
+
+    A failed render adds the states it accessed to the current subscription
+    instead of replacing it. Without match_all, renders that did not access
+    specific states are not followed through MATCH_ALL.
+    """
+
+    def __init__(self, hass, listener, match_all=True):
+        """Initialize the tracker."""
+        self._hass = hass
+        self._listener = listener
+        self._match_all = match_all
+        self._tracked = None
+        self._async_remove = None
+
+    @property
+    def entity_ids(self):
+        """Return the tracked entity ids, or MATCH_ALL.
+
+        MATCH_ALL is returned as well if whole domains are tracked.
+        """
+        if self._tracked is None:
+            return MATCH_ALL
+
+        entity_ids, domains = self._tracked
+        if domains or MATCH_ALL in entity_ids:
+            return MATCH_ALL
+        return list(entity_ids)
+
+    @callback
+    def async_update(self, *render_infos):
+        """Subscribe to the states accessed by the given renders.
+
+        Returns False and removes the subscription if one of the renders
+        can only be followed through MATCH_ALL and match_all is not set.
+        """
+        entity_ids = set()
+        domains = set()
+        for render_info in render_infos:
+            if render_info.exception is not None and \
+                    self._tracked is not None:
+                # Keep following what the previous renders accessed
+                entity_ids.update(self._tracked[0])
+                domains.update(self._tracked[1])
+                listeners = render_info.listeners(match_all=False)
+            else:
+                listeners = render_info.listeners(self._match_all)
+
+            if listeners is None:
+                self.async_remove()
+                return False
+
+            entity_ids.update(listeners[0])
+            domains.update(listeners[1])
+
+        if MATCH_ALL in entity_ids:
+            tracked = frozenset((MATCH_ALL,)), frozenset()
+        else:
+            tracked = frozenset(
+                entity_id for entity_id in entity_ids
+                if split_entity_id(entity_id)[0] not in domains), \
+                frozenset(domains)
+
+        if tracked == self._tracked:
+            return True
+
+        self.async_remove()
+        self._tracked = tracked
+        if tracked[0] or tracked[1]:
+            self._async_remove = _async_add_state_change_listener(
+                self._hass, tracked[0], self._listener, tracked[1])
+        return True
+
+    @callback
+    def async_remove(self):
+        """Remove the subscription."""
+        if self._async_remove is not None:
+            self._async_remove()
+            self._async_remove = None
+        self._tracked = None
+
+
 @callback
 @bind_hass
 def async_track_template(hass, template, action, variables=None):
-    """Add a listener that track state changes with template condition."""
-    from . import condition
+    """Add a listener that track state changes with template condition.
 
+    Only the entities and domains the template accessed during its last
+    render are tracked, so it is re-rendered when one of them changes.
+    """
     # Local variable to keep track of if the action has already been triggered
     already_triggered = False
 
     @callback
-    def template_condition_listener(entity_id, from_s, to_s):
+    def template_condition_listener(event):
         """Check if condition is correct and run action."""
         nonlocal already_triggered
-        template_result = condition.async_template(hass, template, variables)
+        render_info = template.async_render_to_info(variables)
+        tracker.async_update(render_info)
+
+        if render_info.exception is not None:
+            _LOGGER.error("Error during template condition: %s",
+                          render_info.exception)
+            template_result = False
+        else:
+            template_result = render_info.result.lower() == 'true'
 
         # Check to see if template returns true
         if template_result and not already_triggered:
             already_triggered = True
-            hass.async_run_job(action, entity_id, from_s, to_s)
+            hass.async_run_job(action, event.data.get('entity_id'),
+                               event.data.get('old_state'),
+                               event.data.get('new_state'))
         elif not template_result:
             already_triggered = False
 
-    return async_track_state_change(
-        hass, template.extract_entities(variables),
-        template_condition_listener)
+    tracker = RenderInfoTracker(hass, template_condition_listener)
+    tracker.async_update(template.async_render_to_info(variables))
+
+    return tracker.async_remove
 
 
 track_template = threaded_listener_factory(async_track_template)
@@ -126,42 +331,13 @@ def async_track_same_state(hass, period, action, async_check_same_func,
     If async_check_func is None it use the state of orig_value.
     Without entity_ids we track all state changes.
     """
-    async_remove_state_for_cancel = None
-    async_remove_state_for_listener = None
+    tracker = hass.data.get(TRACK_SAME_STATE_TRACKER)
+    if tracker is None:
+        tracker = hass.data[TRACK_SAME_STATE_TRACKER] = \
+            _SameStateTracker(hass)
 
-    @callback
-    def clear_listener():
-        """Clear all unsub listener."""
-        nonlocal async_remove_state_for_cancel, async_remove_state_for_listener
-
-        if async_remove_state_for_listener is not None:
-            async_remove_state_for_listener()
-            async_remove_state_for_listener = None
-        if async_remove_state_for_cancel is not None:
-            async_remove_state_for_cancel()
-            async_remove_state_for_cancel = None
-
-    @callback
-    def state_for_listener(now):
-        """Fire on state changes after a delay and calls action."""
-        nonlocal async_remove_state_for_listener
-        async_remove_state_for_listener = None
-        clear_listener()
-        hass.async_run_job(action)
-
-    @callback
-    def state_for_cancel_listener(entity, from_state, to_state):
-        """Fire on changes and cancel for listener if changed."""
-        if not async_check_same_func(entity, from_state, to_state):
-            clear_listener()
-
-    async_remove_state_for_listener = async_track_point_in_utc_time(
-        hass, state_for_listener, dt_util.utcnow() + period)
-
-    async_remove_state_for_cancel = async_track_state_change(
-        hass, entity_ids, state_for_cancel_listener)
-
-    return clear_listener
+    return tracker.async_track(period, action, async_check_same_func,
+                               entity_ids)
 
 
 track_same_state = threaded_listener_factory(async_track_same_state)
@@ -192,28 +368,12 @@ def async_track_point_in_utc_time(hass, action, point_in_time):
     # Ensure point_in_time is UTC
     point_in_time = dt_util.as_utc(point_in_time)
 
-    @callback
-    def point_in_time_listener(event):
-        """Listen for matching time_changed events."""
-        now = event.data[ATTR_NOW]
-
-        if now < point_in_time or hasattr(point_in_time_listener, 'run'):
-            return
-
-        # Set variable so that we will never run twice.
-        # Because the event bus might have to wait till a thread comes
-        # available to execute this listener it might occur that the
-        # listener gets lined up twice to be executed. This will make
-        # sure the second time it does nothing.
-        point_in_time_listener.run = True
-        async_unsub()
-
-        hass.async_run_job(action, now)
-
-    async_unsub = hass.bus.async_listen(EVENT_TIME_CHANGED,
-                                        point_in_time_listener)
+    scheduler = hass.data.get(TRACK_POINT_IN_TIME_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[TRACK_POINT_IN_TIME_SCHEDULER] = \
+            _PointInTimeScheduler(hass)
 
-    return async_unsub
+    return scheduler.async_schedule(point_in_time, action)
 
 
 track_point_in_utc_time = threaded_listener_factory(
@@ -394,6 +554,246 @@ def async_track_time_change(hass, action, hour=None, minute=None, second=None):
 track_time_change = threaded_listener_factory(async_track_time_change)
 
 
+class _PointInTimeScheduler:
+    """Run actions at points in UTC time from a single timer heap.
+
+    The earliest pending action is armed with loop.call_at, so pending
+    actions do not cost anything while waiting. A single time changed
+    listener checks the head of the heap as well, so actions keep firing
+    when the clock jumps or when time changed events are fired by hand.
+    """
+
+    def __init__(self, hass):
+        """Initialize the scheduler."""
+        self.hass = hass
+        # Entries are [timestamp, sequence, action], action None = cancelled
+        self._heap = []
+        self._cancelled = 0
+        self._sequence = 0
+        self._timer = None
+        self._timer_timestamp = None
+        self._unsub_time_changed = None
+
+    @callback
+    def async_schedule(self, point_in_time, action):
+        """Schedule action to run once at point_in_time.
+
+        Returns a function that can be called to cancel the action.
+        """
+        self._sequence += 1
+        entry = [point_in_time.timestamp(), self._sequence, action]
+        heapq.heappush(self._heap, entry)
+
+        if self._unsub_time_changed is None:
+            self._unsub_time_changed = self.hass.bus.async_listen(
+                EVENT_TIME_CHANGED, self._async_time_changed)
+
+        if self._heap[0] is entry:
+            self._async_arm_timer()
+
+        @callback
+        def cancel():
+            """Cancel the scheduled action."""
+            if entry[2] is None:
+                return
+
+            # Cancelled entries are skipped when they reach the head of the
+            # heap, the heap is only rebuilt once most entries are cancelled.
+            entry[2] = None
+            if entry[1] is None:
+                return
+            self._cancelled += 1
+
+            if self._cancelled > len(self._heap) // 2:
+                self._heap = [item for item in self._heap
+                              if item[2] is not None]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+            self._async_arm_timer()
+
+        return cancel
+
+    @callback
+    def _async_time_changed(self, event):
+        """Run the actions that are due at the time of the event."""
+        self._async_run_due(event.data[ATTR_NOW])
+
+    @callback
+    def _async_timer_fired(self):
+        """Run the actions that are due now."""
+        self._timer = None
+        self._timer_timestamp = None
+        self._async_run_due(dt_util.utcnow())
+
+    @callback
+    def _async_run_due(self, now):
+        """Run all actions scheduled at or before now."""
+        timestamp = now.timestamp()
+        due = []
+
+        # Collect first so actions scheduled by these actions wait for the
+        # next run, like listeners added while an event is handled.
+        while self._heap and self._heap[0][0] <= timestamp:
+            entry = heapq.heappop(self._heap)
+
+            if entry[2] is None:
+                self._cancelled -= 1
+                continue
+
+            # Mark the entry as no longer in the heap
+            entry[1] = None
+            due.append(entry)
+
+        for entry in due:
+            action = entry[2]
+
+            # Cancelled by one of the actions that ran before
+            if action is None:
+                continue
+
+            entry[2] = None
+            try:
+                self.hass.async_run_job(action, now)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running point in time action %s",
+                                  action)
+
+        self._async_arm_timer()
+
+    @callback
+    def _async_arm_timer(self):
+        """Arm the loop timer for the earliest pending action."""
+        heap = self._heap
+
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+            self._cancelled -= 1
+
+        if not heap:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = self._timer_timestamp = None
+            if self._unsub_time_changed is not None:
+                self._unsub_time_changed()
+                self._unsub_time_changed = None
+            return
+
+        timestamp = heap[0][0]
+
+        if self._timer is not None:
+            if self._timer_timestamp == timestamp:
+                return
+            self._timer.cancel()
+            self._timer = self._timer_timestamp = None
+
+        delay = timestamp - dt_util.utcnow().timestamp()
+
+        # Actions that are already due run on the next time changed event
+        if delay <= 0:
+            return
+
+        self._timer_timestamp = timestamp
+        self._timer = self.hass.loop.call_at(
+            self.hass.loop.time() + delay, self._async_timer_fired)
+
+
+class _SameStateTracker:
+    """Track the pending periods of async_track_same_state.
+
+    The periods are indexed by the entities they watch and share a single
+    state change listener, which is only held while periods are pending.
+    Their deadlines are kept in the point in time scheduler. Starting and
+    cancelling a period doesn't add or remove any bus or state listeners.
+    """
+
+    def __init__(self, hass):
+        """Initialize the tracker."""
+        self.hass = hass
+        # Entity id or MATCH_ALL -> {clear function: check function}
+        self._periods = {}
+        self._unsub_state = None
+
+    @callback
+    def async_track(self, period, action, async_check_same_func,
+                    entity_ids):
+        """Run action after period unless a state change fails the check.
+
+        Returns a function that can be called to cancel the period.
+        """
+        if entity_ids == MATCH_ALL:
+            entity_ids = (MATCH_ALL,)
+        elif isinstance(entity_ids, str):
+            entity_ids = (entity_ids.lower(),)
+        else:
+            entity_ids = tuple({entity_id.lower()
+                                for entity_id in entity_ids})
+
+        async_remove_timer = None
+
+        @callback
+        def clear_listener():
+            """Cancel the period."""
+            nonlocal async_remove_timer
+
+            if async_remove_timer is None:
+                return
+
+            async_remove_timer()
+            async_remove_timer = None
+
+            for entity_id in entity_ids:
+                periods = self._periods[entity_id]
+                del periods[clear_listener]
+                if not periods:
+                    del self._periods[entity_id]
+
+            if not self._periods:
+                self._unsub_state()
+                self._unsub_state = None
+
+        @callback
+        def state_for_listener(now):
+            """Run the action once the period has passed."""
+            clear_listener()
+            self.hass.async_run_job(action)
+
+        for entity_id in entity_ids:
+            self._periods.setdefault(entity_id, {})[clear_listener] = \
+                async_check_same_func
+
+        if self._unsub_state is None:
+            self._unsub_state = _async_add_state_change_listener(
+                self.hass, (MATCH_ALL,), self._async_state_changed)
+
+        async_remove_timer = async_track_point_in_utc_time(
+            self.hass, state_for_listener, dt_util.utcnow() + period)
+
+        return clear_listener
+
+    @callback
+    def _async_state_changed(self, event):
+        """Cancel the periods of the entity whose check fails."""
+        entity_id = event.data.get('entity_id')
+        periods = list(self._periods.get(entity_id, {}).items()) + \
+            list(self._periods.get(MATCH_ALL, {}).items())
+
+        if not periods:
+            return
+
+        old_state = event.data.get('old_state')
+        new_state = event.data.get('new_state')
+
+        for clear_listener, async_check_same_func in periods:
+            try:
+                if not async_check_same_func(
+                        entity_id, old_state, new_state):
+                    clear_listener()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error while checking state of %s",
+                                  entity_id)
+
+
 def _process_state_match(parameter):
     """Convert parameter to function that matches input against parameter."""
     if parameter is None or parameter == MATCH_ALL:
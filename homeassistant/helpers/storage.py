@@ -5,7 +5,7 @@ import os
 from typing import Dict, Optional, Callable, Any
 
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import callback
+from homeassistant.core import EXECUTOR_IO, callback
 from homeassistant.loader import bind_hass
 from homeassistant.util import json
 from homeassistant.helpers.event import async_call_later
@@ -88,7 +88,7 @@ class Store:
                 data['data'] = data.pop('data_func')()
         else:
             data = await self.hass.async_add_executor_job(
-                json.load_json, self.path)
+                json.load_json, self.path, executor=EXECUTOR_IO)
 
             if data == {}:
                 return None
@@ -177,7 +177,7 @@ class Store:
         async with self._write_lock:
             try:
                 await self.hass.async_add_executor_job(
-                    self._write_data, self.path, data)
+                    self._write_data, self.path, data, executor=EXECUTOR_IO)
             except (json.SerializationError, json.WriteError) as err:
                 _LOGGER.error('Error writing config for %s: %s', self.key, err)
 
@@ -1,10 +1,13 @@
 """Template helper methods for rendering strings with Home Assistant data."""
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 import json
 import logging
 import math
 import random
 import re
+from typing import Any, Dict, Optional
 
 import jinja2
 from jinja2 import contextfilter
@@ -14,9 +17,10 @@ from jinja2.utils import Namespace
 from homeassistant.const import (
     ATTR_LATITUDE, ATTR_LONGITUDE, ATTR_UNIT_OF_MEASUREMENT, MATCH_ALL,
     STATE_UNKNOWN)
-from homeassistant.core import State, valid_entity_id
+from homeassistant.core import State, split_entity_id, valid_entity_id
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers import location as loc_helper
+from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.loader import bind_hass
 from homeassistant.util import convert
 from homeassistant.util import dt as dt_util
@@ -27,6 +31,12 @@ _LOGGER = logging.getLogger(__name__)
 _SENTINEL = object()
 DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+_RENDER_INFO = 'template.render_info'
+DATA_TEMPLATE_CACHE = 'template.cache'
+
+# Number of distinct template sources kept compiled
+TEMPLATE_CACHE_SIZE = 2048
+
 _RE_NONE_ENTITIES = re.compile(r"distance\(|closest\(", re.I | re.M)
 _RE_GET_ENTITIES = re.compile(
     r"(?:(?:states\.|(?:is_state|is_state_attr|state_attr|states)"
@@ -87,6 +97,140 @@ def extract_entities(template, variables=None):
     return MATCH_ALL
 
 
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile(source):
+    """Compile a template source to code, shared by identical templates."""
+    return ENV.compile(source)
+
+
+class _BoundTemplateCache:
+    """Bounded LRU of compiled templates bound to a hass instance."""
+
+    def __init__(self, hass):
+        """Initialize the cache."""
+        template_methods = TemplateMethods(hass)
+        self.global_vars = ENV.make_globals({
+            'closest': template_methods.closest,
+            'distance': template_methods.distance,
+            'is_state': template_methods.is_state,
+            'is_state_attr': template_methods.is_state_attr,
+            'state_attr': template_methods.state_attr,
+            'states': AllStates(hass),
+        })
+        self.templates = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, source, compiled_code):
+        """Return the jinja template for source, binding it if needed."""
+        compiled = self.templates.get(source)
+
+        if compiled is not None:
+            self.hits += 1
+            self.templates.move_to_end(source)
+            return compiled
+
+        self.misses += 1
+        compiled = self.templates[source] = jinja2.Template.from_code(
+            ENV, compiled_code, self.global_vars, None)
+
+        if len(self.templates) > TEMPLATE_CACHE_SIZE:
+            self.templates.popitem(last=False)
+
+        return compiled
+
+
+def cache_info(hass: Optional[HomeAssistantType] = None) \
+        -> Dict[str, Dict[str, Any]]:
+    """Return hit and miss counters of the template caches."""
+    compile_info = _compile.cache_info()
+    info = {
+        'compile': {
+            'hits': compile_info.hits,
+            'misses': compile_info.misses,
+            'size': compile_info.currsize,
+            'max_size': compile_info.maxsize,
+        }
+    }
+
+    bound_cache = None if hass is None else hass.data.get(DATA_TEMPLATE_CACHE)
+    if bound_cache is not None:
+        info['bind'] = {
+            'hits': bound_cache.hits,
+            'misses': bound_cache.misses,
+            'size': len(bound_cache.templates),
+            'max_size': TEMPLATE_CACHE_SIZE,
+        }
+
+    return info
+
+
+def _collect_entity(hass, entity_id):
+    """Record that the template being rendered accessed an entity."""
+    render_info = hass.data.get(_RENDER_INFO)
+    if render_info is not None and isinstance(entity_id, str):
+        render_info.entities.add(entity_id.lower())
+
+
+def _collect_domain(hass, domain):
+    """Record that the template being rendered accessed a domain."""
+    render_info = hass.data.get(_RENDER_INFO)
+    if render_info is not None:
+        render_info.domains.add(domain.lower())
+
+
+def _collect_all_states(hass):
+    """Record that the template being rendered accessed all states."""
+    render_info = hass.data.get(_RENDER_INFO)
+    if render_info is not None:
+        render_info.all_states = True
+
+
+class RenderInfo:
+    """Holds information about a template render."""
+
+    def __init__(self, template):
+        """Initialise."""
+        self.template = template
+        self.result = None
+        self.exception = None
+        self.entities = set()
+        self.domains = set()
+        self.all_states = False
+
+    def __repr__(self):
+        """Representation of RenderInfo."""
+        return ("<RenderInfo {} all_states={} domains={} entities={}>"
+                .format(self.template, self.all_states, self.domains,
+                        self.entities))
+
+    def listeners(self, match_all=True):
+        """Return the entity ids and domains to track for a re-render.
+
+        Templates without Jinja syntax never need a re-render. Falls back
+        to tracking all entities if the template accessed all states, failed
+        to render or did not access any state at all. Without match_all,
+        None is returned instead if the template rendered without accessing
+        specific states, and the states accessed before a failure are
+        returned if the render failed.
+        """
+        if _RE_JINJA_DELIMITERS.search(self.template.template) is None:
+            return frozenset(), frozenset()
+
+        untrackable = self.all_states or not (self.entities or self.domains)
+
+        if match_all and (untrackable or self.exception is not None):
+            return frozenset((MATCH_ALL,)), frozenset()
+
+        if untrackable and self.exception is None:
+            return None
+
+        entity_ids = frozenset(
+            entity_id for entity_id in self.entities
+            if split_entity_id(entity_id)[0] not in self.domains)
+        return entity_ids, frozenset(self.domains)
+
+
 class Template:
     """Class to hold a template and manage caching and rendering."""
 
@@ -106,7 +250,7 @@ class Template:
             return
 
         try:
-            self._compiled_code = ENV.compile(self.template)
+            self._compiled_code = _compile(self.template)
         except jinja2.exceptions.TemplateSyntaxError as err:
             raise TemplateError(err)
 
@@ -138,6 +282,28 @@ class Template:
         except jinja2.TemplateError as err:
             raise TemplateError(err)
 
+    def async_render_to_info(self, variables=None, **kwargs):
+        """Render the template and collect the states it accessed.
+
+        This method must be run in the event loop.
+        """
+        render_info = RenderInfo(self)
+
+        if self.hass is None:
+            render_info.exception = TemplateError(
+                'hass variable not set on template')
+            return render_info
+
+        self.hass.data[_RENDER_INFO] = render_info
+        try:
+            render_info.result = self.async_render(variables, **kwargs)
+        except TemplateError as ex:
+            render_info.exception = ex
+        finally:
+            del self.hass.data[_RENDER_INFO]
+
+        return render_info
+
     def render_with_possible_json_value(self, value, error_value=_SENTINEL):
         """Render template with value exposed.
 
@@ -179,19 +345,12 @@ class Template:
 
         assert self.hass is not None, 'hass variable not set on template'
 
-        template_methods = TemplateMethods(self.hass)
-
-        global_vars = ENV.make_globals({
-            'closest': template_methods.closest,
-            'distance': template_methods.distance,
-            'is_state': self.hass.states.is_state,
-            'is_state_attr': template_methods.is_state_attr,
-            'state_attr': template_methods.state_attr,
-            'states': AllStates(self.hass),
-        })
+        bound_cache = self.hass.data.get(DATA_TEMPLATE_CACHE)
+        if bound_cache is None:
+            bound_cache = self.hass.data[DATA_TEMPLATE_CACHE] = \
+                _BoundTemplateCache(self.hass)
 
-        self._compiled = jinja2.Template.from_code(
-            ENV, self._compiled_code, global_vars, None)
+        self._compiled = bound_cache.get(self.template, self._compiled_code)
 
         return self._compiled
 
@@ -215,6 +374,7 @@ class AllStates:
 
     def __iter__(self):
         """Return all states."""
+        _collect_all_states(self._hass)
         return iter(
             _wrap_state(state) for state in
             sorted(self._hass.states.async_all(),
@@ -222,10 +382,12 @@ class AllStates:
 
     def __len__(self):
         """Return number of states."""
+        _collect_all_states(self._hass)
         return len(self._hass.states.async_entity_ids())
 
     def __call__(self, entity_id):
         """Return the states."""
+        _collect_entity(self._hass, entity_id)
         state = self._hass.states.get(entity_id)
         return STATE_UNKNOWN if state is None else state.state
 
@@ -240,11 +402,13 @@ class DomainStates:
 
     def __getattr__(self, name):
         """Return the states."""
-        return _wrap_state(
-            self._hass.states.get('{}.{}'.format(self._domain, name)))
+        entity_id = '{}.{}'.format(self._domain, name)
+        _collect_entity(self._hass, entity_id)
+        return _wrap_state(self._hass.states.get(entity_id))
 
     def __iter__(self):
         """Return the iteration over all the states."""
+        _collect_domain(self._hass, self._domain)
         return iter(sorted(
             (_wrap_state(state) for state in self._hass.states.async_all()
              if state.domain == self._domain),
@@ -252,6 +416,7 @@ class DomainStates:
 
     def __len__(self):
         """Return number of states."""
+        _collect_domain(self._hass, self._domain)
         return len(self._hass.states.async_entity_ids(self._domain))
 
 
@@ -355,7 +520,8 @@ class TemplateMethods:
 
             group = self._hass.components.group
 
-            states = [self._hass.states.get(entity_id) for entity_id
+            _collect_entity(self._hass, gr_entity_id)
+            states = [self._get_state(entity_id) for entity_id
                       in group.expand_entity_ids([gr_entity_id])]
 
         return _wrap_state(loc_helper.closest(latitude, longitude, states))
@@ -415,6 +581,11 @@ class TemplateMethods:
         return self._hass.config.units.length(
             loc_util.distance(*locations[0] + locations[1]), 'm')
 
+    def is_state(self, entity_id, state):
+        """Test if a state is a specific value."""
+        state_obj = self._get_state(entity_id)
+        return state_obj is not None and state_obj.state == state
+
     def is_state_attr(self, entity_id, name, value):
         """Test if a state is a specific attribute."""
         state_attr = self.state_attr(entity_id, name)
@@ -422,7 +593,7 @@ class TemplateMethods:
 
     def state_attr(self, entity_id, name):
         """Get a specific attribute from a state."""
-        state_obj = self._hass.states.get(entity_id)
+        state_obj = self._get_state(entity_id)
         if state_obj is not None:
             return state_obj.attributes.get(name)
         return None
@@ -432,9 +603,14 @@ class TemplateMethods:
         if isinstance(entity_id_or_state, State):
             return entity_id_or_state
         if isinstance(entity_id_or_state, str):
-            return self._hass.states.get(entity_id_or_state)
+            return self._get_state(entity_id_or_state)
         return None
 
+    def _get_state(self, entity_id):
+        """Return the state of entity_id and record the access."""
+        _collect_entity(self._hass, entity_id)
+        return self._hass.states.get(entity_id)
+
 
 def forgiving_round(value, precision=0):
     """Round accepted strings."""
@@ -1,6 +1,7 @@
 """Module to handle installing requirements."""
 import asyncio
 from functools import partial
+import itertools
 import logging
 import os
 import sys
@@ -10,7 +11,7 @@ from urllib.parse import urlparse
 import pkg_resources
 
 import homeassistant.util.package as pkg_util
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
 DATA_PIP_LOCK = 'pip_lock'
 DATA_PKG_CACHE = 'pkg_cache'
@@ -24,13 +25,8 @@ async def async_process_requirements(hass: HomeAssistant, name: str,
 
     This method is a coroutine.
     """
-    pip_lock = hass.data.get(DATA_PIP_LOCK)
-    if pip_lock is None:
-        pip_lock = hass.data[DATA_PIP_LOCK] = asyncio.Lock(loop=hass.loop)
-
-    pkg_cache = hass.data.get(DATA_PKG_CACHE)
-    if pkg_cache is None:
-        pkg_cache = hass.data[DATA_PKG_CACHE] = PackageLoadable(hass)
+    pip_lock = _async_get_pip_lock(hass)
+    pkg_cache = _async_get_pkg_cache(hass)
 
     pip_install = partial(pkg_util.install_package,
                           **pip_kwargs(hass.config.config_dir))
@@ -50,6 +46,62 @@ async def async_process_requirements(hass: HomeAssistant, name: str,
     return True
 
 
+async def async_process_requirements_batch(
+        hass: HomeAssistant, requirements: Dict[str, List[str]]) -> bool:
+    """Install the requirements of many components in one pip run.
+
+    Requirements maps a component or platform name to its requirements.
+    Requirements that are already met are skipped. If the batch can't be
+    installed, the requirements are installed one by one when each
+    component is set up.
+
+    This method is a coroutine.
+    """
+    pip_lock = _async_get_pip_lock(hass)
+    pkg_cache = _async_get_pkg_cache(hass)
+
+    async with pip_lock:
+        missing = []  # type: List[str]
+        for req in sorted(set(itertools.chain(*requirements.values()))):
+            if not await pkg_cache.loadable(req):
+                missing.append(req)
+
+        if not missing:
+            return True
+
+        ret = await hass.async_add_executor_job(partial(
+            pkg_util.install_packages, missing,
+            **pip_kwargs(hass.config.config_dir)))
+
+        if not ret:
+            _LOGGER.warning("Could not install requirements in one batch, "
+                            "installing them one by one")
+            return False
+
+        # The cache doesn't know about the packages that were just installed
+        pkg_cache.dist_cache.clear()
+
+    return True
+
+
+@callback
+def _async_get_pip_lock(hass: HomeAssistant) -> asyncio.Lock:
+    """Return the lock that serializes pip runs."""
+    pip_lock = hass.data.get(DATA_PIP_LOCK)
+    if pip_lock is None:
+        pip_lock = hass.data[DATA_PIP_LOCK] = asyncio.Lock(loop=hass.loop)
+    return pip_lock
+
+
+@callback
+def _async_get_pkg_cache(hass: HomeAssistant) -> 'PackageLoadable':
+    """Return the cache of installed packages."""
+    pkg_cache = hass.data.get(DATA_PKG_CACHE)
+    if pkg_cache is None:
+        pkg_cache = hass.data[DATA_PKG_CACHE] = PackageLoadable(hass)
+    return pkg_cache
+
+
 def pip_kwargs(config_dir: Optional[str]) -> Dict[str, Any]:
     """Return keyword arguments for PIP install."""
     kwargs = {
@@ -2,13 +2,15 @@
 import argparse
 import asyncio
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
+from tempfile import TemporaryDirectory
 from timeit import default_timer as timer
 
 from homeassistant import core
 from homeassistant.const import (
-    ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED)
+    ATTR_NOW, EVENT_HOMEASSISTANT_START, EVENT_STATE_CHANGED,
+    EVENT_TIME_CHANGED, MATCH_ALL)
 from homeassistant.util import dt as dt_util
 
 BENCHMARKS = {}
@@ -107,6 +109,43 @@ async def async_million_time_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def async_time_changed_1000_pending_timers(hass):
+    """Run 100k time changed events with 1,000 pending timers."""
+    count = 0
+    event = asyncio.Event(loop=hass.loop)
+    now = dt_util.utcnow()
+
+    @core.callback
+    def action(_):
+        """Handle timer."""
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 10**5:
+            event.set()
+
+    for _ in range(1000):
+        hass.helpers.event.async_call_later(3600, action)
+
+    hass.bus.async_listen(EVENT_TIME_CHANGED, listener)
+
+    for idx in range(10**5):
+        hass.bus.async_fire(EVENT_TIME_CHANGED, {
+            ATTR_NOW: now + timedelta(milliseconds=idx)
+        })
+
+    start = timer()
+
+    await event.wait()
+
+    return timer() - start
+
+
 @benchmark
 async def async_million_state_changed_helper(hass):
     """Run a million events through state changed helper."""
@@ -141,6 +180,225 @@ async def async_million_state_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def async_million_state_changed_5000_tracked(hass):
+    """Run a million state changes spread over 5,000 tracked entities."""
+    count = 0
+    entity_count = 5000
+    event = asyncio.Event(loop=hass.loop)
+
+    @core.callback
+    def listener(*args):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 10**6:
+            event.set()
+
+    event_data = []
+    for idx in range(entity_count):
+        entity_id = 'sensor.benchmark_{}'.format(idx)
+        hass.helpers.event.async_track_state_change(entity_id, listener)
+        event_data.append({
+            'entity_id': entity_id,
+            'old_state': core.State(entity_id, 'off'),
+            'new_state': core.State(entity_id, 'on'),
+        })
+
+    for idx in range(10**6):
+        hass.bus.async_fire(EVENT_STATE_CHANGED,
+                            event_data[idx % entity_count])
+
+    start = timer()
+
+    await event.wait()
+
+    return timer() - start
+
+
+@benchmark
+async def async_100k_blocking_service_calls(hass):
+    """Run 100k blocking light.turn_on service calls."""
+    count = 0
+
+    @core.callback
+    def handle_turn_on(call):
+        """Handle service call."""
+        nonlocal count
+        count += 1
+
+    # Listeners on all events, like the recorder and websocket subscribers
+    for _ in range(3):
+        hass.bus.async_listen(MATCH_ALL, core.callback(lambda event: None))
+
+    hass.services.async_register('light', 'turn_on', handle_turn_on)
+    service_data = {'entity_id': 'light.kitchen'}
+
+    start = timer()
+
+    for _ in range(10**5):
+        await hass.services.async_call(
+            'light', 'turn_on', service_data, blocking=True)
+
+    assert count == 10**5
+
+    return timer() - start
+
+
+@benchmark
+async def async_million_mqtt_messages_1500_subscriptions(hass):
+    """Route a million MQTT messages with 1,500 subscriptions."""
+    from homeassistant.components import mqtt
+
+    count = 0
+    device_count = 1500
+
+    @core.callback
+    def message_received(topic, payload, qos):
+        """Handle message."""
+        nonlocal count
+        count += 1
+
+    async def skip_subscription(topic, qos):
+        """Do not talk to a broker."""
+
+    client = mqtt.MQTT(hass, 'localhost', 1883, None, 60, None, None, None,
+                       None, None, None, mqtt.PROTOCOL_311, None, None, None)
+    # pylint: disable=protected-access
+    client._async_perform_subscription = skip_subscription
+
+    await client.async_subscribe(
+        'homeassistant/#', message_received, 0, 'utf-8')
+    await client.async_subscribe('tele/+/LWT', message_received, 0, 'utf-8')
+    messages = []
+    for idx in range(device_count):
+        topic = 'zigbee2mqtt/device_{}'.format(idx)
+        await client.async_subscribe(topic, message_received, 0, 'utf-8')
+        messages.append(mqtt.Message(topic, b'{"state": "ON"}'))
+
+    start = timer()
+
+    for idx in range(10**6):
+        client._mqtt_handle_message(messages[idx % device_count])
+
+    assert count == 10**6
+
+    return timer() - start
+
+
+@benchmark
+async def async_add_800_entities_in_100_batches(hass):
+    """Add 800 entities with a component group in 100 batches at startup."""
+    from homeassistant.helpers.entity import Entity
+    from homeassistant.helpers.entity_component import EntityComponent
+    from homeassistant.setup import async_setup_component
+
+    entity_count = 800
+    batch_count = 100
+    group_updated = asyncio.Event(loop=hass.loop)
+
+    class BenchmarkEntity(Entity):
+        """Entity that does not poll."""
+
+        def __init__(self, idx):
+            """Initialize the entity."""
+            self._name = 'Sensor {}'.format(idx)
+
+        @property
+        def name(self):
+            """Return the name of the entity."""
+            return self._name
+
+        @property
+        def should_poll(self):
+            """Do not poll."""
+            return False
+
+    @core.callback
+    def group_changed(event):
+        """Wait for the group to contain all entities."""
+        new_state = event.data['new_state']
+        if event.data['entity_id'] == 'group.all_sensors' and \
+           len(new_state.attributes['entity_id']) == entity_count:
+            group_updated.set()
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        await async_setup_component(hass, 'group', {'group': {}})
+        hass.bus.async_listen(EVENT_STATE_CHANGED, group_changed)
+        component = EntityComponent(
+            logging.getLogger(__name__), 'sensor', hass,
+            group_name='all sensors')
+        batches = [
+            [BenchmarkEntity(idx) for idx
+             in range(batch, entity_count, batch_count)]
+            for batch in range(batch_count)]
+
+        start = timer()
+
+        # Platforms add their entities one after the other while starting
+        for batch in batches:
+            await component.async_add_entities(batch)
+
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+        await group_updated.wait()
+
+        return timer() - start
+
+
+@benchmark
+async def async_load_10k_entity_registry(hass):
+    """Load a registry of 10k entities and look up each of them."""
+    from homeassistant.helpers import device_registry, entity_registry
+    from homeassistant.helpers.storage import Store
+
+    entity_count = 10**4
+    # Like a platform that exposes four entities per device
+    device_count = entity_count // 4
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        await Store(hass, device_registry.STORAGE_VERSION,
+                    device_registry.STORAGE_KEY).async_save({'devices': [{
+                        'config_entries': ['benchmark'],
+                        'connections': [['mac', str(idx)]],
+                        'identifiers': [['benchmark', str(idx)]],
+                        'manufacturer': None,
+                        'model': None,
+                        'name': None,
+                        'sw_version': None,
+                        'id': 'device_{}'.format(idx),
+                    } for idx in range(device_count)]})
+        await Store(hass, entity_registry.STORAGE_VERSION,
+                    entity_registry.STORAGE_KEY).async_save({'entities': [{
+                        'entity_id': 'sensor.benchmark_{}'.format(idx),
+                        'config_entry_id': 'benchmark',
+                        'device_id': 'device_{}'.format(idx // 4),
+                        'unique_id': str(idx),
+                        'platform': 'benchmark',
+                    } for idx in range(entity_count)]})
+
+        start = timer()
+
+        device_reg = await device_registry.async_get_registry(hass)
+        entity_reg = await entity_registry.async_get_registry(hass)
+
+        # The lookups EntityPlatform does for each entity it adds
+        for idx in range(entity_count):
+            device = device_reg.async_get_or_create(
+                config_entry_id='benchmark',
+                identifiers={('benchmark', str(idx // 4))})
+            entity_reg.async_get_or_create(
+                'sensor', 'benchmark', str(idx), config_entry_id='benchmark',
+                device_id=device.id)
+
+        assert len(device_reg.devices) == device_count
+        assert len(entity_reg.entities) == entity_count
+
+        return timer() - start
+
+
 @benchmark
 @asyncio.coroutine
 def logbook_filtering_state(hass):
@@ -0,0 +1,73 @@
+"""Queue for outbound messages that drops superseded messages."""
+import asyncio
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional  # noqa: F401
+
+
+class CoalescingQueue:
+    """Bounded FIFO queue that keeps only the latest message per key.
+
+    A message put with the key of a message that is still queued replaces
+    that message, keeping its place in the queue, so a slow reader only
+    receives the latest version. Messages without a key are always queued.
+
+    The queue is meant for a single reader. It keeps track of the highest
+    number of queued messages and the number of replaced messages.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop,
+                 maxsize: int = 0) -> None:
+        """Initialize the queue."""
+        self._loop = loop
+        self._maxsize = maxsize
+        self._messages = OrderedDict()  # type: OrderedDict
+        self._getter = None  # type: Optional[asyncio.Future]
+        self.max_qsize = 0
+        self.coalesced = 0
+
+    def qsize(self) -> int:
+        """Return the number of queued messages."""
+        return len(self._messages)
+
+    def put_nowait(self, message: Any, key: Optional[Hashable] = None) -> None:
+        """Queue a message, replacing a queued message with the same key.
+
+        Raises asyncio.QueueFull if the queue holds maxsize messages and the
+        message does not replace one.
+        """
+        if key is not None and key in self._messages:
+            self._messages[key] = message
+            self.coalesced += 1
+            return
+
+        if self._maxsize and len(self._messages) >= self._maxsize:
+            raise asyncio.QueueFull
+
+        if key is None:
+            key = object()
+        self._messages[key] = message
+        self.max_qsize = max(self.max_qsize, len(self._messages))
+
+        if self._getter is not None and not self._getter.done():
+            self._getter.set_result(None)
+
+    async def get(self) -> Any:
+        """Remove and return the oldest message, waiting for one."""
+        await self._wait()
+        return self._messages.popitem(last=False)[1]
+
+    async def get_batch(self) -> List[Any]:
+        """Remove and return all queued messages, waiting for one."""
+        await self._wait()
+        messages = list(self._messages.values())
+        self._messages.clear()
+        return messages
+
+    async def _wait(self) -> None:
+        """Wait until a message is queued."""
+        while not self._messages:
+            self._getter = self._loop.create_future()
+            try:
+                await self._getter
+            finally:
+                self._getter = None
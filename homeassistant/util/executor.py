@@ -0,0 +1,83 @@
+"""Thread pool executor that keeps track of its load."""
+from concurrent.futures import Future, ThreadPoolExecutor
+import queue  # noqa: F401 pylint: disable=unused-import
+import sys
+import threading
+from time import monotonic
+from typing import Any, Callable, Dict, Optional  # noqa: F401
+
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """Thread pool executor with metrics.
+
+    Keeps track of the number of jobs that wait for a worker, the number of
+    workers running a job and how long jobs waited for a worker.
+    """
+
+    _work_queue = None  # type: queue.Queue
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 thread_name_prefix: str = '') -> None:
+        """Initialize the executor."""
+        if sys.version_info[:2] >= (3, 6):
+            super().__init__(max_workers, thread_name_prefix)
+        else:
+            super().__init__(max_workers)
+        self._stats_lock = threading.Lock()
+        self._active = 0
+        self._started = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    def set_max_workers(self, max_workers: int) -> None:
+        """Change the maximum number of workers.
+
+        Workers that are already running are not stopped when shrinking.
+        """
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+        self._max_workers = max_workers
+
+    # pylint: disable=arguments-differ,invalid-name
+    def submit(self, fn: Callable[..., Any], *args: Any,
+               **kwargs: Any) -> Future:
+        """Submit a job, recording when it is picked up by a worker."""
+        return super().submit(self._run, monotonic(), fn, args, kwargs)
+
+    def _run(self, submitted: float, fn: Callable[..., Any],
+             args: Any, kwargs: Any) -> Any:
+        """Run a job in a worker."""
+        wait_time = monotonic() - submitted
+
+        with self._stats_lock:
+            self._active += 1
+            self._started += 1
+            self._wait_time_total += wait_time
+            self._wait_time_max = max(self._wait_time_max, wait_time)
+
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._stats_lock:
+                self._active -= 1
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return the metrics of the executor.
+
+        queued: jobs waiting for a worker
+        active: workers running a job
+        max_workers: maximum number of workers
+        started: jobs picked up by a worker
+        wait_time_avg/wait_time_max: seconds jobs waited for a worker
+        """
+        with self._stats_lock:
+            return {
+                'queued': self._work_queue.qsize(),
+                'active': self._active,
+                'max_workers': self._max_workers,
+                'started': self._started,
+                'wait_time_avg': (self._wait_time_total / self._started
+                                  if self._started else 0.0),
+                'wait_time_max': self._wait_time_max,
+            }
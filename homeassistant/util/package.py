@@ -4,7 +4,7 @@ import logging
 import os
 from subprocess import PIPE, Popen
 import sys
-from typing import Optional
+from typing import List, Optional
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,10 +23,23 @@ def install_package(package: str, upgrade: bool = True,
 
     Return boolean if install successful.
     """
+    return install_packages([package], upgrade, target, constraints)
+
+
+def install_packages(packages: List[str], upgrade: bool = True,
+                     target: Optional[str] = None,
+                     constraints: Optional[str] = None) -> bool:
+    """Install packages on PyPi in a single pip run.
+
+    Pip resolves all packages together, so the run fails as a whole if one
+    of them can't be installed. Return boolean if install successful.
+    """
     # Not using 'import pip; pip.main([])' because it breaks the logger
-    _LOGGER.info('Attempting install of %s', package)
+    package_list = ', '.join(packages)
+    _LOGGER.info('Attempting install of %s', package_list)
     env = os.environ.copy()
-    args = [sys.executable, '-m', 'pip', 'install', '--quiet', package]
+    args = [sys.executable, '-m', 'pip', 'install', '--quiet']
+    args += packages
     if upgrade:
         args.append('--upgrade')
     if constraints is not None:
@@ -44,7 +57,7 @@ def install_package(package: str, upgrade: bool = True,
     _, stderr = process.communicate()
     if process.returncode != 0:
         _LOGGER.error("Unable to install package %s: %s",
-                      package, stderr.decode('utf-8').lstrip().strip())
+                      package_list, stderr.decode('utf-8').lstrip().strip())
         return False
 
     return True
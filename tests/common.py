@@ -132,11 +132,11 @@ def async_test_home_assistant(loop):
             return mock_coro(target(*args))
         return orig_async_add_job(target, *args)
 
-    def async_add_executor_job(target, *args):
+    def async_add_executor_job(target, *args, **kwargs):
         """Add executor job."""
         if isinstance(target, Mock):
             return mock_coro(target(*args))
-        return orig_async_add_executor_job(target, *args)
+        return orig_async_add_executor_job(target, *args, **kwargs)
 
     def async_create_task(coroutine):
         """Create task."""
@@ -464,9 +464,11 @@ class MockPlatform:
     # pylint: disable=invalid-name
     def __init__(self, setup_platform=None, dependencies=None,
                  platform_schema=None, async_setup_platform=None,
-                 async_setup_entry=None, scan_interval=None):
+                 async_setup_entry=None, scan_interval=None,
+                 requirements=None):
         """Initialize the platform."""
         self.DEPENDENCIES = dependencies or []
+        self.REQUIREMENTS = requirements or []
 
         if platform_schema is not None:
             self.PLATFORM_SCHEMA = platform_schema
@@ -467,6 +467,108 @@ async def test_reload_config_service(hass, calls):
     assert calls[1].data.get('event') == 'test_event2'
 
 
+async def test_reload_keeps_unchanged_automations(hass, calls):
+    """Test reload only replaces the automations that changed."""
+    hello = {
+        'alias': 'hello',
+        'trigger': {
+            'platform': 'event',
+            'event_type': 'test_event',
+        },
+        'action': [
+            {'service': 'test.automation'},
+            {'delay': {'minutes': '10'}},
+            {
+                'service': 'test.automation',
+                'data_template': {
+                    'event': '{{ trigger.event.event_type }}'
+                }
+            },
+        ]
+    }
+    bye = {
+        'alias': 'bye',
+        'trigger': {
+            'platform': 'event',
+            'event_type': 'test_event2',
+        },
+        'action': {'service': 'test.automation'},
+    }
+    assert await async_setup_component(hass, automation.DOMAIN, {
+        automation.DOMAIN: [hello, bye]
+    })
+    component = hass.data['entity_components'][automation.DOMAIN]
+    hello_entity = component.get_entity('automation.hello')
+    bye_entity = component.get_entity('automation.bye')
+
+    hass.bus.async_fire('test_event')
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    new_bye = dict(bye, trigger={
+        'platform': 'event',
+        'event_type': 'test_event3',
+    })
+    with patch('homeassistant.config.load_yaml_config_file', autospec=True,
+               return_value={automation.DOMAIN: [hello, new_bye]}):
+        with patch('homeassistant.config.find_config_file',
+                   return_value=''):
+            await common.async_reload(hass)
+            await hass.async_block_till_done()
+
+    assert component.get_entity('automation.hello') is hello_entity
+    assert component.get_entity('automation.bye') is not bye_entity
+    listeners = hass.bus.async_listeners()
+    assert listeners.get('test_event') == 1
+    assert listeners.get('test_event2') is None
+    assert listeners.get('test_event3') == 1
+
+    # The delay of the unchanged automation is still running
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=10))
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+    assert calls[1].data.get('event') == 'test_event'
+
+    hass.bus.async_fire('test_event3')
+    await hass.async_block_till_done()
+    assert len(calls) == 3
+
+
+async def test_reload_replaces_unserializable_automations(hass, calls):
+    """Test reload replaces automations whose config can't be hashed."""
+    config = {
+        'alias': 'hello',
+        'trigger': {
+            'platform': 'event',
+            'event_type': 'test_event',
+        },
+        'action': {
+            'service': 'test.automation',
+            'data': {1: 'one', 'two': 2},
+        },
+    }
+    assert await async_setup_component(hass, automation.DOMAIN, {
+        automation.DOMAIN: config
+    })
+    component = hass.data['entity_components'][automation.DOMAIN]
+    hello_entity = component.get_entity('automation.hello')
+
+    with patch('homeassistant.config.load_yaml_config_file', autospec=True,
+               return_value={automation.DOMAIN: config}):
+        with patch('homeassistant.config.find_config_file',
+                   return_value=''):
+            await common.async_reload(hass)
+            await hass.async_block_till_done()
+
+    assert component.get_entity('automation.hello') is not hello_entity
+    assert hass.bus.async_listeners().get('test_event') == 1
+
+    hass.bus.async_fire('test_event')
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+    assert calls[0].data == {1: 'one', 'two': 2}
+
+
 async def test_reload_config_when_invalid_config(hass, calls):
     """Test the reload config service handling invalid config."""
     with assert_setup_component(1, automation.DOMAIN):
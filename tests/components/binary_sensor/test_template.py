@@ -161,7 +161,8 @@ class TestBinarySensorTemplate(unittest.TestCase):
         assert state.attributes['entity_picture'] == '/local/sensor.png'
 
     @mock.patch('homeassistant.components.binary_sensor.template.'
-                'BinarySensorTemplate._async_render')
+                'BinarySensorTemplate._async_render', autospec=True,
+                side_effect=template.BinarySensorTemplate._async_render)
     def test_match_all(self, _async_render):
         """Test MATCH_ALL in template."""
         with assert_setup_component(1):
@@ -3,9 +3,18 @@ import asyncio
 
 from unittest import mock
 
+import pytest
+
 from homeassistant.setup import async_setup_component
 
 
+@pytest.fixture(autouse=True)
+def disable_frame_cache():
+    """Fetch a new image from the camera for every request."""
+    with mock.patch('homeassistant.components.camera.FRAME_CACHE_TTL', 0):
+        yield
+
+
 @asyncio.coroutine
 def test_fetching_url(aioclient_mock, hass, aiohttp_client):
     """Test that it fetches the given url."""
@@ -1,6 +1,7 @@
 """The tests for the camera component."""
 import asyncio
 import base64
+import gc
 from unittest.mock import patch, mock_open
 
 import pytest
@@ -156,3 +157,78 @@ async def test_webocket_camera_thumbnail(hass, hass_ws_client, mock_camera):
     assert msg['result']['content_type'] == 'image/jpeg'
     assert msg['result']['content'] == \
         base64.b64encode(b'Test').decode('utf-8')
+
+
+async def test_frame_broker_shares_images(hass, mock_camera):
+    """Test concurrent and recent requests share one camera image."""
+    broker = hass.data[camera.DOMAIN].get_entity(
+        'camera.demo_camera').frame_broker
+    fetched = asyncio.Event(loop=hass.loop)
+    images = iter([b'first', b'second'])
+
+    async def camera_image():
+        await fetched.wait()
+        return next(images)
+
+    with patch('homeassistant.components.camera.demo.DemoCamera.'
+               'async_camera_image', side_effect=camera_image):
+        tasks = [hass.async_create_task(camera.async_get_image(
+            hass, 'camera.demo_camera')) for _ in range(3)]
+        await asyncio.sleep(0, loop=hass.loop)
+        fetched.set()
+
+        for task in tasks:
+            assert (await task).content == b'first'
+        assert await broker.async_get_image() == b'first'
+
+        with patch('homeassistant.components.camera.FRAME_CACHE_TTL', 0):
+            assert await broker.async_get_image() == b'second'
+
+    assert broker.fetches == 2
+    assert broker.serves == 5
+
+
+async def test_frame_broker_fetch_not_cancelled(hass, mock_camera):
+    """Test a request that times out doesn't cancel the shared fetch."""
+    broker = hass.data[camera.DOMAIN].get_entity(
+        'camera.demo_camera').frame_broker
+    fetched = asyncio.Event(loop=hass.loop)
+
+    async def camera_image():
+        await fetched.wait()
+        return b'image'
+
+    with patch('homeassistant.components.camera.demo.DemoCamera.'
+               'async_camera_image', side_effect=camera_image):
+        with pytest.raises(HomeAssistantError):
+            await camera.async_get_image(hass, 'camera.demo_camera',
+                                         timeout=0)
+
+        task = hass.async_create_task(broker.async_get_image())
+        await asyncio.sleep(0, loop=hass.loop)
+        fetched.set()
+        assert await task == b'image'
+
+    assert broker.fetches == 1
+
+
+async def test_frame_broker_fetch_error_retrieved(hass, mock_camera, caplog):
+    """Test the error of a fetch nobody waits for anymore is retrieved."""
+    fetched = asyncio.Event(loop=hass.loop)
+
+    async def camera_image():
+        await fetched.wait()
+        raise ValueError('camera offline')
+
+    with patch('homeassistant.components.camera.demo.DemoCamera.'
+               'async_camera_image', side_effect=camera_image):
+        with pytest.raises(HomeAssistantError):
+            await camera.async_get_image(hass, 'camera.demo_camera',
+                                         timeout=0)
+
+        fetched.set()
+        await hass.async_block_till_done()
+        await asyncio.sleep(0, loop=hass.loop)
+
+    gc.collect()
+    assert 'never retrieved' not in caplog.text
@@ -10,6 +10,7 @@ from homeassistant.const import (
     STATE_ON, STATE_OFF, STATE_HOME, STATE_UNKNOWN, ATTR_ICON, ATTR_HIDDEN,
     ATTR_ASSUMED_STATE, STATE_NOT_HOME, ATTR_FRIENDLY_NAME)
 import homeassistant.components.group as group
+from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
 
 from tests.common import get_test_home_assistant, assert_setup_component
 from tests.components.group import common
@@ -323,6 +324,90 @@ class TestComponentsGroup(unittest.TestCase):
             sorted(group.expand_entity_ids(self.hass,
                                            ['group.group_of_groups']))
 
+    def test_expand_entity_ids_mutually_nested_groups(self):
+        """Test expanding groups that contain each other."""
+        self.hass.states.set('group.first', STATE_ON, {
+            'entity_id': ['light.Bowl', 'group.second']})
+        self.hass.states.set('group.second', STATE_ON, {
+            'entity_id': ['group.first', 'light.Ceiling']})
+
+        assert ['light.bowl', 'light.ceiling'] == \
+            group.expand_entity_ids(self.hass, ['group.first'])
+
+    def test_expand_entity_ids_cache_follows_nested_group(self):
+        """Test the cached expansion follows changes of a nested group."""
+        self.hass.states.set('group.inner', STATE_ON, {
+            'entity_id': ['light.bowl']})
+        self.hass.states.set('group.outer', STATE_ON, {
+            'entity_id': ['group.inner', 'light.ceiling']})
+
+        assert ['light.bowl', 'light.ceiling'] == \
+            group.expand_entity_ids(self.hass, ['group.outer'])
+
+        # Unrelated state changes keep the members
+        self.hass.states.set('group.inner', STATE_OFF, {
+            'entity_id': ['light.bowl']})
+        assert ['light.bowl', 'light.ceiling'] == \
+            group.expand_entity_ids(self.hass, ['group.outer'])
+
+        self.hass.states.set('group.inner', STATE_ON, {
+            'entity_id': ['light.bowl', 'light.kitchen']})
+        assert ['light.bowl', 'light.kitchen', 'light.ceiling'] == \
+            group.expand_entity_ids(self.hass, ['group.outer'])
+
+        self.hass.states.remove('group.inner')
+        assert ['light.ceiling'] == \
+            group.expand_entity_ids(self.hass, ['group.outer'])
+
+    def test_allgroup_tracks_counts_incrementally(self):
+        """Test member changes update the group without reading all states."""
+        for entity_id in ('light.one', 'light.two', 'light.three'):
+            self.hass.states.set(entity_id, STATE_ON)
+        test_group = group.Group.create_group(
+            self.hass, 'init_group', ['light.one', 'light.two', 'light.three'],
+            mode=True)
+        assert STATE_ON == \
+            self.hass.states.get(test_group.entity_id).state
+
+        with patch.object(group.Group, '_async_count_members') as mock_count:
+            self.hass.states.set('light.two', STATE_OFF)
+            self.hass.block_till_done()
+            assert STATE_OFF == \
+                self.hass.states.get(test_group.entity_id).state
+
+            self.hass.states.set('light.three', STATE_OFF,
+                                 {ATTR_ASSUMED_STATE: True})
+            self.hass.states.set('light.two', STATE_ON)
+            self.hass.block_till_done()
+            assert STATE_OFF == \
+                self.hass.states.get(test_group.entity_id).state
+
+            self.hass.states.set('light.three', STATE_ON)
+            self.hass.block_till_done()
+            assert STATE_ON == \
+                self.hass.states.get(test_group.entity_id).state
+
+        assert not mock_count.mock_calls
+        assert test_group._on_count == 3
+        assert test_group._assumed_count == 0
+
+    def test_anygroup_stays_on_while_a_member_is_on(self):
+        """Test an any group only turns off with the last member."""
+        self.hass.states.set('light.one', STATE_ON)
+        self.hass.states.set('light.two', STATE_ON)
+        test_group = group.Group.create_group(
+            self.hass, 'init_group', ['light.one', 'light.two'])
+
+        self.hass.states.set('light.one', STATE_OFF)
+        self.hass.block_till_done()
+        assert STATE_ON == \
+            self.hass.states.get(test_group.entity_id).state
+
+        self.hass.states.remove('light.two')
+        self.hass.block_till_done()
+        assert STATE_OFF == \
+            self.hass.states.get(test_group.entity_id).state
+
     def test_set_assumed_state_based_on_tracked(self):
         """Test assumed state."""
         self.hass.states.set('light.Bowl', STATE_ON)
@@ -382,7 +467,8 @@ class TestComponentsGroup(unittest.TestCase):
         assert sorted(self.hass.states.entity_ids()) == \
             ['group.all_tests', 'group.empty_group', 'group.second_group',
              'group.test_group']
-        assert self.hass.bus.listeners['state_changed'] == 3
+        assert self.hass.bus.listeners['state_changed'] == 1
+        assert _state_change_listener_count(self.hass) == 3
 
         with patch('homeassistant.config.load_yaml_config_file', return_value={
             'group': {
@@ -398,7 +484,8 @@ class TestComponentsGroup(unittest.TestCase):
 
         assert sorted(self.hass.states.entity_ids()) == \
             ['group.all_tests', 'group.hello']
-        assert self.hass.bus.listeners['state_changed'] == 2
+        assert self.hass.bus.listeners['state_changed'] == 1
+        assert _state_change_listener_count(self.hass) == 2
 
     def test_changing_group_visibility(self):
         """Test that a group can be hidden and shown."""
@@ -509,3 +596,30 @@ def test_service_group_set_group_remove_group(hass):
 
     group_state = hass.states.get('group.user_test_group')
     assert group_state is None
+
+
+async def test_set_group_updates_expanded_members(hass):
+    """Test the set service refreshes cached nested group members."""
+    assert await async_setup_component(hass, 'group', {
+        'group': {
+            'inner': ['light.bowl'],
+            'outer': ['group.inner', 'light.ceiling'],
+        }
+    })
+
+    assert group.expand_entity_ids(hass, ['group.outer']) == \
+        ['light.bowl', 'light.ceiling']
+
+    common.async_set_group(hass, 'inner', add=['light.kitchen'])
+    await hass.async_block_till_done()
+
+    # Members added by the service are in arbitrary order
+    assert sorted(group.expand_entity_ids(hass, ['group.outer'])) == \
+        ['light.bowl', 'light.ceiling', 'light.kitchen']
+
+
+def _state_change_listener_count(hass):
+    """Return the number of state change listeners in the dispatch index."""
+    callbacks = hass.data.get(TRACK_STATE_CHANGE_CALLBACKS, {})
+    return len({listener for listeners in callbacks.values()
+                for listener in listeners})
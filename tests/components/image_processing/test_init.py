@@ -1,15 +1,20 @@
 """The tests for the image_processing component."""
+import asyncio
 from unittest.mock import patch, PropertyMock
 
 from homeassistant.core import callback
 from homeassistant.const import ATTR_ENTITY_PICTURE
-from homeassistant.setup import setup_component
+from homeassistant.setup import setup_component, async_setup_component
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.components.http as http
 import homeassistant.components.image_processing as ip
 
+from homeassistant.components.camera import Image
+import homeassistant.util.dt as dt_util
+
 from tests.common import (
-    get_test_home_assistant, get_test_instance_port, assert_setup_component)
+    get_test_home_assistant, get_test_instance_port, assert_setup_component,
+    async_fire_time_changed, mock_coro)
 from tests.components.image_processing import common
 
 
@@ -297,3 +302,129 @@ class TestImageProcessingFace:
         assert event_data[0]['gender'] == 'male'
         assert event_data[0]['entity_id'] == \
             'image_processing.demo_face'
+
+
+async def test_pipeline_fetches_image_once(hass):
+    """Test entities processing the same camera share its image."""
+    assert await async_setup_component(hass, ip.DOMAIN, {
+        ip.DOMAIN: {'platform': 'demo'},
+        'camera': {'platform': 'demo'},
+    })
+    await hass.async_block_till_done()
+
+    feed = hass.data[ip.DATA_PIPELINE].feeds[
+        ('camera.demo_camera', ip.SCAN_INTERVAL)]
+    assert len(feed.entities) == 2
+
+    with patch('homeassistant.components.camera.async_get_image',
+               side_effect=lambda *args, **kwargs: mock_coro(
+                   Image('image/jpeg', b'image'))) as mock_image, \
+            patch('homeassistant.components.image_processing.demo.'
+                  'DemoImageProcessingAlpr.process_image') as mock_alpr, \
+            patch('homeassistant.components.image_processing.demo.'
+                  'DemoImageProcessingFace.process_image') as mock_face:
+        async_fire_time_changed(hass, dt_util.utcnow() + ip.SCAN_INTERVAL)
+        await hass.async_block_till_done()
+
+    assert len(mock_image.mock_calls) == 1
+    assert mock_alpr.call_args[0] == (b'image',)
+    assert mock_face.call_args[0] == (b'image',)
+    assert feed.frames == 1
+
+
+async def test_pipeline_skips_image_when_busy(hass):
+    """Test an entity that is still processing skips the next image."""
+    assert await async_setup_component(hass, ip.DOMAIN, {
+        ip.DOMAIN: {'platform': 'demo'},
+        'camera': {'platform': 'demo'},
+    })
+    await hass.async_block_till_done()
+
+    feed = hass.data[ip.DATA_PIPELINE].feeds[
+        ('camera.demo_camera', ip.SCAN_INTERVAL)]
+    processed = asyncio.Event(loop=hass.loop)
+    face_images = []
+
+    async def process_face(image):
+        face_images.append(image)
+        await processed.wait()
+
+    now = dt_util.utcnow()
+
+    async def fire_tick(tick):
+        """Fire a tick without waiting for the blocked processing."""
+        async_fire_time_changed(hass, now + tick * ip.SCAN_INTERVAL)
+        for _ in range(10):
+            await asyncio.sleep(0, loop=hass.loop)
+
+    with patch('homeassistant.components.camera.async_get_image',
+               side_effect=lambda *args, **kwargs: mock_coro(
+                   Image('image/jpeg', b'image'))), \
+            patch('homeassistant.components.image_processing.demo.'
+                  'DemoImageProcessingAlpr.async_process_image',
+                  side_effect=lambda image: mock_coro()) as mock_alpr, \
+            patch('homeassistant.components.image_processing.demo.'
+                  'DemoImageProcessingFace.async_process_image',
+                  side_effect=process_face):
+        await fire_tick(1)
+        await fire_tick(2)
+
+        assert len(face_images) == 1
+        assert len(mock_alpr.mock_calls) == 2
+        assert feed.frames == 2
+        assert feed.skipped == 1
+
+        processed.set()
+        await hass.async_block_till_done()
+        await fire_tick(3)
+
+    assert len(face_images) == 2
+    assert feed.skipped == 1
+
+
+async def test_pipeline_fetch_error_clears_busy(hass):
+    """Test entities are not left busy when fetching the image fails."""
+    assert await async_setup_component(hass, ip.DOMAIN, {
+        ip.DOMAIN: {'platform': 'demo'},
+        'camera': {'platform': 'demo'},
+    })
+    await hass.async_block_till_done()
+
+    feed = hass.data[ip.DATA_PIPELINE].feeds[
+        ('camera.demo_camera', ip.SCAN_INTERVAL)]
+    now = dt_util.utcnow()
+
+    with patch('homeassistant.components.camera.async_get_image',
+               side_effect=[ValueError, mock_coro(
+                   Image('image/jpeg', b'image'))]), \
+            patch('homeassistant.components.image_processing.demo.'
+                  'DemoImageProcessingAlpr.process_image') as mock_alpr, \
+            patch('homeassistant.components.image_processing.demo.'
+                  'DemoImageProcessingFace.process_image') as mock_face:
+        async_fire_time_changed(hass, now + ip.SCAN_INTERVAL)
+        await hass.async_block_till_done()
+        assert mock_alpr.call_count == 0
+
+        async_fire_time_changed(hass, now + 2 * ip.SCAN_INTERVAL)
+        await hass.async_block_till_done()
+
+    assert mock_alpr.call_args[0] == (b'image',)
+    assert mock_face.call_args[0] == (b'image',)
+    assert feed.frames == 1
+    assert feed.skipped == 0
+
+
+async def test_pipeline_removes_entity(hass):
+    """Test the camera feed stops when its entities are removed."""
+    assert await async_setup_component(hass, ip.DOMAIN, {
+        ip.DOMAIN: {'platform': 'demo'},
+        'camera': {'platform': 'demo'},
+    })
+    await hass.async_block_till_done()
+
+    pipeline = hass.data[ip.DATA_PIPELINE]
+    component = hass.data['entity_components'][ip.DOMAIN]
+    for entity in list(component.entities):
+        await entity.async_remove()
+
+    assert pipeline.feeds == {}
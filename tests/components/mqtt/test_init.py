@@ -312,6 +312,27 @@ class TestMQTTCallbacks(unittest.TestCase):
         self.hass.block_till_done()
         assert 1 == len(self.calls)
 
+    def test_subscribe_topic_overlapping_filters(self):
+        """Test every matching filter is routed to once."""
+        unsub_exact = mqtt.subscribe(
+            self.hass, 'test-topic/bier/on', self.record_calls)
+        mqtt.subscribe(self.hass, 'test-topic/+/on', self.record_calls)
+        mqtt.subscribe(self.hass, 'test-topic/#', self.record_calls)
+
+        fire_mqtt_message(self.hass, 'test-topic/bier/on', 'test-payload')
+
+        self.hass.block_till_done()
+        assert 3 == len(self.calls)
+
+        unsub_exact()
+        fire_mqtt_message(self.hass, 'test-topic/bier/on', 'test-payload')
+
+        self.hass.block_till_done()
+        assert 5 == len(self.calls)
+        with pytest.raises(KeyError):
+            self.hass.data['mqtt']._matching_subscriptions[
+                'test-topic/bier/on']
+
     def test_subscribe_topic_not_match(self):
         """Test if subscribed topic is not a match."""
         mqtt.subscribe(self.hass, 'test-topic', self.record_calls)
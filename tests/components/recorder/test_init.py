@@ -10,7 +10,8 @@ from homeassistant.const import MATCH_ALL
 from homeassistant.components.recorder import Recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.components.recorder.models import States, Events
+from homeassistant.components.recorder.models import (
+    States, StateAttributes, Events)
 
 from tests.common import get_test_home_assistant, init_recorder_component
 
@@ -202,3 +203,65 @@ def test_recorder_setup_failure():
         rec.join()
 
     hass.stop()
+
+
+def test_saving_batch_single_commit(hass_recorder):
+    """Test events are written together once the batch is flushed."""
+    hass = hass_recorder({'commit_interval': 30})
+    entity_ids = ['test.batch_{}'.format(idx) for idx in range(5)]
+
+    states = _add_entities(hass, entity_ids)
+
+    assert len(states) == 5
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States))
+        event_ids = {event.event_id for event in session.query(Events)}
+        assert all(state.event_id in event_ids for state in db_states)
+
+
+def test_saving_batch_max_size(hass_recorder):
+    """Test a full batch is committed without waiting for the interval."""
+    hass = hass_recorder({'commit_interval': 30, 'max_batch_size': 2})
+    instance = hass.data[DATA_INSTANCE]
+    commit_batch = instance._commit_batch
+    batch_sizes = []
+
+    def mock_commit_batch(pending):
+        """Record the size of each committed batch."""
+        if pending:
+            batch_sizes.append(len(pending))
+        commit_batch(pending)
+
+    with patch.object(instance, '_commit_batch', mock_commit_batch):
+        states = _add_entities(hass, ['test.one', 'test.two', 'test.three'])
+
+    assert len(states) == 3
+    assert batch_sizes[0] == 2
+
+
+def test_saving_state_shared_attributes(hass_recorder):
+    """Test identical attributes are stored once."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    attributes = {'unit_of_measurement': 'W', 'friendly_name': 'Power'}
+
+    for value in range(3):
+        hass.states.set('sensor.power', value, attributes)
+        hass.block_till_done()
+        instance.block_till_done()
+
+    # Evicted attributes are looked up in the database
+    instance._attributes_ids.clear()
+    hass.states.set('sensor.power', 3, attributes)
+    hass.states.set('sensor.other', 3, {'friendly_name': 'Other'})
+    hass.block_till_done()
+    instance.block_till_done()
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+        db_states = list(session.query(States).filter(
+            States.entity_id == 'sensor.power'))
+        assert len(db_states) == 4
+        assert len({state.attributes_id for state in db_states}) == 1
+        assert all(state.to_native().attributes == attributes
+                   for state in db_states)
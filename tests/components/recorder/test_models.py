@@ -3,13 +3,13 @@ import unittest
 from datetime import datetime
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm import joinedload, scoped_session, sessionmaker
 
 import homeassistant.core as ha
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.util import dt
 from homeassistant.components.recorder.models import (
-    Base, Events, States, RecorderRuns)
+    Base, Events, States, StateAttributes, RecorderRuns)
 
 ENGINE = None
 SESSION = None
@@ -55,13 +55,22 @@ class TestStates(unittest.TestCase):
 
     def test_from_event(self):
         """Test converting event to db state."""
-        state = ha.State('sensor.temperature', '18')
+        state = ha.State('sensor.temperature', '18', {'unit': 'C'})
         event = ha.Event(EVENT_STATE_CHANGED, {
             'entity_id': 'sensor.temperature',
             'old_state': None,
             'new_state': state,
         }, context=state.context)
-        assert state == States.from_event(event).to_native()
+        db_state = States.from_event(event)
+        db_state.state_attributes = StateAttributes.from_event(event)
+        assert state == db_state.to_native()
+
+    def test_to_native_legacy_attributes(self):
+        """Test converting a row that stores its own attributes."""
+        db_state = States(
+            entity_id='sensor.temperature', state='18',
+            attributes='{"unit": "C"}')
+        assert db_state.to_native().attributes == {'unit': 'C'}
 
     def test_from_event_to_delete_state(self):
         """Test converting deleting state event to db state."""
@@ -78,6 +87,14 @@ class TestStates(unittest.TestCase):
         assert db_state.last_changed == event.time_fired
         assert db_state.last_updated == event.time_fired
 
+    def test_attributes_only_joined_on_request(self):
+        """Test the shared attributes are only joined when requested."""
+        session = SESSION()
+        query = session.query(States)
+        assert 'state_attributes' not in str(query)
+        assert 'state_attributes' in str(
+            query.options(joinedload(States.state_attributes)))
+
 
 class TestRecorderRuns(unittest.TestCase):
     """Test recorder run model."""
@@ -6,8 +6,10 @@ from unittest.mock import patch
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.purge import purge_old_data
-from homeassistant.components.recorder.models import States, Events
+from homeassistant.components.recorder.purge import (
+    PurgeProgress, purge_old_data)
+from homeassistant.components.recorder.models import (
+    States, StateAttributes, Events)
 from homeassistant.components.recorder.util import session_scope
 from tests.common import get_test_home_assistant, init_recorder_component
 
@@ -147,6 +149,74 @@ class TestRecorderPurge(unittest.TestCase):
             # no state to protect, now we should only have 2 events left
             assert events.count() == 2
 
+    def test_purge_unused_attributes(self):
+        """Test deleting attributes no state refers to."""
+        self._add_test_states()
+        instance = self.hass.data[DATA_INSTANCE]
+
+        with session_scope(hass=self.hass) as session:
+            used = StateAttributes(hash=1, shared_attrs='{"used": true}')
+            session.add_all([
+                used, StateAttributes(hash=2, shared_attrs='{}')])
+            session.flush()
+            session.query(States).filter(
+                States.state == 'dontpurgeme').update(
+                    {'attributes_id': used.attributes_id},
+                    synchronize_session=False)
+            used_id = used.attributes_id
+
+        instance._cache_attributes_id('{}', used_id + 1)
+        purge_old_data(instance, 4, repack=False)
+
+        with session_scope(hass=self.hass) as session:
+            assert [dbattrs.attributes_id for dbattrs
+                    in session.query(StateAttributes)] == [used_id]
+        assert '{}' not in instance._attributes_ids
+
+    def test_purge_in_batches(self):
+        """Test purging ranges of primary keys until everything is purged."""
+        self._add_test_events()
+        self._add_test_states()
+        instance = self.hass.data[DATA_INSTANCE]
+
+        progress = PurgeProgress()
+        calls = 1
+        with self.assertLogs('homeassistant.components.recorder.purge',
+                             'INFO') as logs:
+            while not purge_old_data(instance, 4, repack=False,
+                                     batch_size=2, progress=progress):
+                calls += 1
+
+        assert logs.output[-1].endswith(
+            'Purged 4 states, 4 events and 0 attributes')
+
+        # Every call stops after deleting two rows
+        assert calls == 5
+        assert progress.deleted == {
+            'states': 4, 'events': 4, 'attributes': 0}
+
+        with session_scope(hass=self.hass) as session:
+            assert session.query(States).count() == 3
+            assert session.query(Events).filter(
+                Events.event_type.like("EVENT_TEST%")).count() == 3
+
+    def test_purge_service_in_batches(self):
+        """Test the purge service keeps purging in batches."""
+        self._add_test_events()
+        self._add_test_states()
+        instance = self.hass.data[DATA_INSTANCE]
+        instance.purge_batch_size = 1
+
+        self.hass.services.call('recorder', 'purge',
+                                service_data={'keep_days': 4})
+        self.hass.block_till_done()
+        instance.block_till_done()
+
+        with session_scope(hass=self.hass) as session:
+            assert session.query(States).count() == 3
+            assert session.query(Events).filter(
+                Events.event_type.like("EVENT_TEST%")).count() == 3
+
     def test_purge_method(self):
         """Test purge method."""
         service_data = {'keep_days': 4}
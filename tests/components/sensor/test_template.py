@@ -1,8 +1,11 @@
 """The test for the Template sensor platform."""
+from unittest.mock import patch
+
 from homeassistant.const import EVENT_HOMEASSISTANT_START
 from homeassistant.setup import setup_component, async_setup_component
 
-from tests.common import get_test_home_assistant, assert_setup_component
+from tests.common import (
+    get_test_home_assistant, assert_setup_component, mock_coro)
 
 
 class TestTemplateSensor:
@@ -393,3 +396,75 @@ async def test_no_template_match_all(hass, caplog):
     assert hass.states.get('sensor.invalid_icon').state == 'hello'
     assert hass.states.get('sensor.invalid_entity_picture').state == 'hello'
     assert hass.states.get('sensor.invalid_friendly_name').state == 'hello'
+
+
+async def test_track_accessed_states(hass):
+    """Test a sensor is only updated by the states its template accessed."""
+    hass.states.async_set('light.kitchen', 'on')
+
+    await async_setup_component(hass, 'sensor', {
+        'sensor': {
+            'platform': 'template',
+            'sensors': {
+                'lights': {
+                    'value_template': '{{ states.light | count }}',
+                },
+            }
+        }
+    })
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+    assert hass.states.get('sensor.lights').state == '1'
+
+    with patch('homeassistant.components.sensor.template.'
+               'SensorTemplate.async_update',
+               side_effect=lambda: mock_coro()) as mock_update:
+        hass.states.async_set('switch.kitchen', 'on')
+        await hass.async_block_till_done()
+        assert len(mock_update.mock_calls) == 0
+
+        hass.states.async_set('light.kitchen', 'off')
+        await hass.async_block_till_done()
+        assert len(mock_update.mock_calls) == 1
+
+    hass.states.async_set('light.hall', 'on')
+    await hass.async_block_till_done()
+    assert hass.states.get('sensor.lights').state == '2'
+
+
+async def test_render_error_keeps_tracked_states(hass):
+    """Test a failed render keeps following the previously accessed states."""
+    hass.states.async_set('input_boolean.fail', 'off')
+    hass.states.async_set('sensor.test_sensor', 'startup')
+
+    await async_setup_component(hass, 'sensor', {
+        'sensor': {
+            'platform': 'template',
+            'sensors': {
+                'failing': {
+                    'value_template':
+                        "{% if is_state('input_boolean.fail', 'on') %}"
+                        "{{ undefined_value.fail() }}{% else %}"
+                        "{{ states('sensor.test_sensor') }}{% endif %}",
+                },
+            }
+        }
+    })
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+    assert hass.states.get('sensor.failing').state == 'startup'
+
+    hass.states.async_set('input_boolean.fail', 'on')
+    await hass.async_block_till_done()
+    assert hass.states.get('sensor.failing').state == 'unknown'
+
+    with patch('homeassistant.components.sensor.template.'
+               'SensorTemplate.async_update',
+               side_effect=lambda: mock_coro()) as mock_update:
+        hass.states.async_set('switch.kitchen', 'on')
+        await hass.async_block_till_done()
+        assert len(mock_update.mock_calls) == 0
+
+        hass.states.async_set('sensor.test_sensor', 'hello')
+        await hass.async_block_till_done()
+        assert len(mock_update.mock_calls) == 1
@@ -379,6 +379,23 @@ def test_stream_with_restricted(hass, mock_api_client):
     assert data['event_type'] == 'test_event3'
 
 
+async def test_stream_coalesces_state_changes(hass, mock_api_client):
+    """Test pending state changes of an entity are replaced."""
+    resp = await mock_api_client.get(const.URL_API_STREAM)
+    assert resp.status == 200
+
+    for value in ('1', '2', '3'):
+        hass.states.async_set('sensor.power', value)
+    hass.bus.async_fire('test_event')
+
+    data = await _stream_next_event(resp.content)
+    assert data['event_type'] == 'state_changed'
+    assert data['data']['new_state']['state'] == '3'
+
+    data = await _stream_next_event(resp.content)
+    assert data['event_type'] == 'test_event'
+
+
 @asyncio.coroutine
 def _stream_next_event(stream):
     """Read the stream for next event while ignoring ping."""
@@ -428,6 +428,58 @@ class TestComponentHistory(unittest.TestCase):
                     history.CONF_ENTITIES: ['media_player.test']}}})
         self.check_significant_states(zero, four, states, config)
 
+    def test_get_numeric_states(self):
+        """Test numeric states are returned as compact arrays."""
+        self.init_recorder()
+        sensor = 'sensor.power'
+        zero = dt_util.utcnow()
+
+        for idx, value in enumerate(['10', '12.5', 'unknown', '14', '15']):
+            with patch('homeassistant.components.recorder.dt_util.utcnow',
+                       return_value=zero + timedelta(seconds=idx + 1)):
+                self.hass.states.set(sensor, value)
+                self.hass.states.set('sensor.text', 'on' if idx % 2 else 'off')
+                self.wait_recording_done()
+
+        hist = history.get_numeric_states(
+            self.hass, zero, zero + timedelta(seconds=10),
+            include_start_time_state=False)
+
+        assert list(hist) == [sensor]
+        assert hist[sensor]['values'] == [10, 12.5, 14, 15]
+        assert hist[sensor]['timestamps'] == [
+            (zero + timedelta(seconds=idx)).timestamp()
+            for idx in (1, 2, 4, 5)]
+
+        hist = history.get_numeric_states(
+            self.hass, zero, zero + timedelta(seconds=10), [sensor],
+            include_start_time_state=False, resolution=10**9)
+
+        assert hist[sensor]['values'] == [15]
+
+        for aggregation, expected in (('min', 10), ('max', 15),
+                                      ('mean', 12.875)):
+            hist = history.get_numeric_states(
+                self.hass, zero, zero + timedelta(seconds=10), [sensor],
+                include_start_time_state=False, resolution=10**9,
+                aggregation=aggregation)
+
+            assert hist[sensor]['values'] == [expected]
+
+        hist = history.get_numeric_states(
+            self.hass, zero, zero + timedelta(seconds=10), [sensor],
+            include_start_time_state=False, resolution=4,
+            aggregation='lttb')
+
+        assert hist[sensor]['values'] == [10, 12.5, 15]
+
+        hist = history.get_numeric_states(
+            self.hass, zero, zero + timedelta(seconds=10), [sensor],
+            include_start_time_state=False, resolution=10,
+            aggregation='lttb')
+
+        assert hist[sensor]['values'] == [10, 15]
+
     def check_significant_states(self, zero, four, states, config):
         """Check if significant states are retrieved."""
         filters = history.Filters()
@@ -525,3 +577,83 @@ async def test_fetch_period_api(hass, aiohttp_client):
     response = await client.get(
         '/api/history/period/{}'.format(dt_util.utcnow().isoformat()))
     assert response.status == 200
+
+
+async def test_fetch_period_api_numeric(hass, aiohttp_client):
+    """Test the fetch period view returns numeric states as arrays."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, 'history', {})
+    await hass.components.recorder.wait_connection_ready()
+    start = dt_util.utcnow() - timedelta(minutes=1)
+
+    for value in ('10', 'unknown', '20'):
+        hass.states.async_set('sensor.power', value)
+        hass.states.async_set('sensor.text', 'on')
+        await hass.async_block_till_done()
+        await hass.async_add_job(
+            hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await aiohttp_client(hass.http.app)
+    response = await client.get(
+        '/api/history/period/{}?numeric'.format(start.isoformat()))
+    assert response.status == 200
+    result = await response.json()
+    assert [series['entity_id'] for series in result] == ['sensor.power']
+    assert result[0]['values'] == [10, 20]
+    assert len(result[0]['timestamps']) == 2
+
+    for aggregation, expected in (('min', 10), ('max', 20), ('mean', 15),
+                                  ('last', 20)):
+        response = await client.get(
+            '/api/history/period/{}'.format(start.isoformat()), params={
+                'numeric': '', 'filter_entity_id': 'sensor.power',
+                'resolution': 10**9, 'aggregation': aggregation})
+        assert response.status == 200
+        result = await response.json()
+        assert result[0]['values'] == [expected]
+
+    response = await client.get(
+        '/api/history/period/{}'.format(start.isoformat()), params={
+            'numeric': '', 'filter_entity_id': 'sensor.power',
+            'resolution': 10**9, 'aggregation': 'lttb'})
+    assert response.status == 200
+    result = await response.json()
+    assert result[0]['values'] == [10, 20]
+
+
+async def test_fetch_period_api_numeric_invalid(hass, aiohttp_client):
+    """Test the fetch period view rejects invalid numeric parameters."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, 'history', {})
+    await hass.components.recorder.wait_connection_ready()
+    client = await aiohttp_client(hass.http.app)
+
+    for params, message in (
+            ({'resolution': 'hour'}, 'Invalid resolution'),
+            ({'resolution': '0'}, 'Invalid resolution'),
+            ({'resolution': '-60'}, 'Invalid resolution'),
+            ({'aggregation': 'median'}, 'Invalid aggregation')):
+        response = await client.get(
+            '/api/history/period/{}'.format(dt_util.utcnow().isoformat()),
+            params=dict(params, numeric=''))
+        assert response.status == 400
+        assert (await response.json())['message'] == message
+
+
+def test_lttb_keeps_extremes():
+    """Test decimation keeps the end points and the peaks."""
+    timestamps = list(range(100))
+    values = [0] * 100
+    values[30] = 50
+    values[70] = -50
+
+    sampled_timestamps, sampled_values = history._lttb(
+        timestamps, values, 10)
+
+    assert len(sampled_values) == 10
+    assert sampled_timestamps[0] == 0
+    assert sampled_timestamps[-1] == 99
+    assert 50 in sampled_values
+    assert -50 in sampled_values
+    assert history._lttb(timestamps, values, 200) == (timestamps, values)
+    assert history._lttb(timestamps, values, 1) == ([0, 99], [0, 0])
@@ -40,6 +40,26 @@ class TestGraph(unittest.TestCase):
             'refresh': 0
         }
 
+    def test_setup_component_aggregation(self):
+        """Test setup component with server-side aggregation."""
+        self.init_recorder()
+        config = {
+            'history': {
+            },
+            'history_graph': {
+                'name_1': {
+                    'entities': 'test.test',
+                    'resolution': 300,
+                    'aggregation': 'max',
+                }
+            }
+        }
+
+        assert setup_component(self.hass, 'history_graph', config)
+        attributes = self.hass.states.get('history_graph.name_1').attributes
+        assert attributes['resolution'] == 300
+        assert attributes['aggregation'] == 'max'
+
     def init_recorder(self):
         """Initialize the recorder."""
         init_recorder_component(self.hass)
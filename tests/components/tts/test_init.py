@@ -15,6 +15,8 @@ from homeassistant.components.media_player import (
     SERVICE_PLAY_MEDIA, MEDIA_TYPE_MUSIC, ATTR_MEDIA_CONTENT_ID,
     ATTR_MEDIA_CONTENT_TYPE, DOMAIN as DOMAIN_MP)
 from homeassistant.setup import setup_component
+from homeassistant.util.async_ import run_coroutine_threadsafe
+from homeassistant.util.json import load_json
 
 from tests.common import (
     get_test_home_assistant, get_test_instance_port, assert_setup_component,
@@ -349,6 +351,60 @@ class TestTTS:
             self.default_tts_cache,
             "265944c108cbb00b2a621be5930513e03a0bb2cd_en_-_demo.mp3"))
 
+    def test_setup_component_load_cache_from_index(self):
+        """Set up the demo platform and load the file cache from index."""
+        mock_service(self.hass, DOMAIN_MP, SERVICE_PLAY_MEDIA)
+
+        config = {
+            tts.DOMAIN: {
+                'platform': 'demo',
+            }
+        }
+
+        with assert_setup_component(1, tts.DOMAIN):
+            setup_component(self.hass, tts.DOMAIN, config)
+
+        self.hass.services.call(tts.DOMAIN, 'demo_say', {
+            tts.ATTR_MESSAGE: "I person is on front of your door.",
+        })
+        self.hass.block_till_done()
+
+        index = load_json(
+            os.path.join(self.default_tts_cache, tts.INDEX_FILENAME))
+        assert index == {
+            "265944c108cbb00b2a621be5930513e03a0bb2cd_en_-_demo":
+            "265944c108cbb00b2a621be5930513e03a0bb2cd_en_-_demo.mp3",
+        }
+
+        manager = tts.SpeechManager(self.hass)
+        with patch('os.listdir') as mock_listdir:
+            run_coroutine_threadsafe(manager.async_init_cache(
+                True, self.default_tts_cache, 300, None), self.hass.loop
+            ).result()
+
+        assert not mock_listdir.called
+        assert manager.file_cache == index
+
+    def test_setup_component_rebuild_invalid_index(self):
+        """Set up the file cache from the folder if the index is invalid."""
+        os.mkdir(self.default_tts_cache)
+        filename = "265944c108cbb00b2a621be5930513e03a0bb2cd_en_-_demo.mp3"
+        with open(os.path.join(self.default_tts_cache, filename), 'wb'):
+            pass
+        with open(os.path.join(self.default_tts_cache,
+                               tts.INDEX_FILENAME), 'w') as index_file:
+            json.dump(['not', 'an', 'index'], index_file)
+
+        manager = tts.SpeechManager(self.hass)
+        run_coroutine_threadsafe(manager.async_init_cache(
+            True, self.default_tts_cache, 300, None), self.hass.loop
+        ).result()
+
+        assert manager.file_cache == {filename[:-4]: filename}
+        assert load_json(os.path.join(
+            self.default_tts_cache, tts.INDEX_FILENAME)) == \
+            manager.file_cache
+
     def test_setup_component_and_test_service_with_receive_voice(self):
         """Set up the demo platform and call service and receive voice."""
         calls = mock_service(self.hass, DOMAIN_MP, SERVICE_PLAY_MEDIA)
@@ -626,3 +682,47 @@ class TestTTS:
 
         req = requests.post(url, data=data)
         assert req.status_code == 400
+
+
+async def test_memory_cache_size(hass):
+    """Test the least recently used voices are dropped from memory."""
+    manager = tts.SpeechManager(hass)
+    manager.memory_size = 10
+
+    manager._async_store_to_memcache('a', 'a.mp3', b'1234')
+    manager._async_store_to_memcache('b', 'b.mp3', b'1234')
+    manager.mem_cache.move_to_end('a')
+    manager._async_store_to_memcache('c', 'c.mp3', b'1234')
+
+    assert list(manager.mem_cache) == ['a', 'c']
+    assert manager.mem_cache_bytes == 8
+
+    # A voice larger than the cache only replaces the other voices
+    manager._async_store_to_memcache('d', 'd.mp3', b'1' * 20)
+
+    assert list(manager.mem_cache) == ['d']
+    assert manager.mem_cache_bytes == 20
+
+
+async def test_read_voice_evicted_while_loading(hass, tmpdir):
+    """Test a voice is returned if it is evicted while it is loaded."""
+    filename = "265944c108cbb00b2a621be5930513e03a0bb2cd_en_-_demo.mp3"
+    tmpdir.join(filename).write_binary(b'voice')
+
+    manager = tts.SpeechManager(hass)
+    manager.cache_dir = str(tmpdir)
+    manager.memory_size = 5
+    manager.file_cache[filename[:-4]] = filename
+    store = manager._async_store_to_memcache
+
+    def store_and_evict(key, filename, data):
+        """Store the voice, then let another voice evict it."""
+        store(key, filename, data)
+        store('other', 'other.mp3', b'other')
+
+    with patch.object(manager, '_async_store_to_memcache',
+                      side_effect=store_and_evict):
+        assert await manager.async_read_tts(filename) == \
+            ('audio/mpeg', b'voice')
+
+    assert list(manager.mem_cache) == ['other']
@@ -11,7 +11,7 @@ from homeassistant.components.websocket_api.auth import (
 from homeassistant.components.websocket_api import const, commands
 from homeassistant.setup import async_setup_component
 
-from tests.common import async_mock_service
+from tests.common import MockUser, CLIENT_ID, async_mock_service
 
 from . import API_PASSWORD
 
@@ -97,6 +97,152 @@ async def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+async def test_subscribe_events_encoded_once(hass, websocket_client):
+    """Test an event is encoded once for all subscriptions."""
+    for iden in (5, 6):
+        await websocket_client.send_json({
+            'id': iden,
+            'type': commands.TYPE_SUBSCRIBE_EVENTS,
+            'event_type': 'test_event'
+        })
+
+        msg = await websocket_client.receive_json()
+        assert msg['success']
+
+    with patch('homeassistant.components.websocket_api.commands.JSON_DUMP',
+               side_effect=const.JSON_DUMP) as mock_dump:
+        hass.bus.async_fire('test_event', {'hello': 'world'})
+
+        with timeout(3, loop=hass.loop):
+            msgs = [await websocket_client.receive_json() for _ in range(2)]
+
+    assert mock_dump.call_count == 1
+
+    assert sorted(msg['id'] for msg in msgs) == [5, 6]
+    for msg in msgs:
+        assert msg['type'] == commands.TYPE_EVENT
+        assert msg['event']['event_type'] == 'test_event'
+        assert msg['event']['data'] == {'hello': 'world'}
+
+
+async def test_subscribe_events_batched(hass, websocket_client):
+    """Test pending state changes are coalesced and sent in one frame."""
+    await websocket_client.send_json({
+        'id': 5,
+        'type': commands.TYPE_SUPPORTED_FEATURES,
+        'features': {const.FEATURE_BATCH_MESSAGES: 1},
+    })
+
+    msg = await websocket_client.receive_json()
+    assert msg['success']
+
+    await websocket_client.send_json({
+        'id': 6,
+        'type': commands.TYPE_SUBSCRIBE_EVENTS,
+        'event_type': 'state_changed',
+    })
+
+    msg = await websocket_client.receive_json()
+    assert msg['success']
+
+    for value in ('1', '2', '3'):
+        hass.states.async_set('sensor.power', value)
+    hass.states.async_set('sensor.energy', '10')
+
+    with timeout(3, loop=hass.loop):
+        msgs = await websocket_client.receive_json()
+
+    assert [msg['event']['data']['new_state']['state'] for msg in msgs] == \
+        ['3', '10']
+
+
+async def test_subscribe_states(hass, websocket_client):
+    """Test subscribe states command sends diffs of matching entities."""
+    hass.states.async_set('light.kitchen', 'off', {'brightness': 0})
+
+    await websocket_client.send_json({
+        'id': 5,
+        'type': commands.TYPE_SUBSCRIBE_STATES,
+        'entity_ids': ['light.kitchen'],
+        'domains': ['sensor'],
+    })
+
+    msg = await websocket_client.receive_json()
+    assert msg['id'] == 5
+    assert msg['success']
+
+    hass.states.async_set('light.hallway', 'on')
+    hass.states.async_set('light.kitchen', 'off', {'friendly_name': 'K'})
+    hass.states.async_set('sensor.temperature', '20', {'unit': 'C'})
+    hass.states.async_remove('light.kitchen')
+
+    with timeout(3, loop=hass.loop):
+        msg = await websocket_client.receive_json()
+        assert msg['id'] == 5
+        assert msg['type'] == commands.TYPE_STATE_DIFF
+        assert msg['entity_id'] == 'light.kitchen'
+        assert 'state' not in msg
+        assert 'last_changed' not in msg
+        assert msg['attributes'] == {'friendly_name': 'K'}
+        assert msg['removed_attributes'] == ['brightness']
+
+        msg = await websocket_client.receive_json()
+        assert msg['entity_id'] == 'sensor.temperature'
+        assert msg['state'] == '20'
+        assert msg['attributes'] == {'unit': 'C'}
+        assert 'last_changed' in msg
+
+        msg = await websocket_client.receive_json()
+        assert msg['entity_id'] == 'light.kitchen'
+        assert msg['removed']
+
+    await websocket_client.send_json({
+        'id': 6,
+        'type': commands.TYPE_UNSUBSCRIBE_EVENTS,
+        'subscription': 5
+    })
+
+    msg = await websocket_client.receive_json()
+    assert msg['id'] == 6
+    assert msg['success']
+
+
+async def test_subscribe_states_state_only(hass, websocket_client):
+    """Test subscribe states command skips attribute changes."""
+    hass.states.async_set('sensor.temperature', '20')
+
+    await websocket_client.send_json({
+        'id': 5,
+        'type': commands.TYPE_SUBSCRIBE_STATES,
+        'domains': 'sensor',
+        'state_only': True,
+    })
+
+    msg = await websocket_client.receive_json()
+    assert msg['success']
+
+    hass.states.async_set('sensor.temperature', '20', {'unit': 'C'})
+    hass.states.async_set('sensor.temperature', '21', {'unit': 'C'})
+
+    with timeout(3, loop=hass.loop):
+        msg = await websocket_client.receive_json()
+
+    assert msg['state'] == '21'
+    assert 'attributes' not in msg
+
+
+async def test_subscribe_states_requires_filter(hass, websocket_client):
+    """Test subscribe states command needs entities or domains."""
+    await websocket_client.send_json({
+        'id': 5,
+        'type': commands.TYPE_SUBSCRIBE_STATES,
+    })
+
+    msg = await websocket_client.receive_json()
+    assert msg['id'] == 5
+    assert not msg['success']
+
+
 async def test_get_states(hass, websocket_client):
     """Test get_states command."""
     hass.states.async_set('greeting.hello', 'world')
@@ -261,3 +407,43 @@ async def test_call_service_context_no_user(hass, aiohttp_client):
         assert call.service == 'test_service'
         assert call.data == {'hello': 'world'}
         assert call.context.user_id is None
+
+
+async def test_get_queue_stats(hass, hass_ws_client):
+    """Test get queue stats command reports every active connection."""
+    owner = MockUser(is_owner=True).add_to_hass(hass)
+    refresh_token = await hass.auth.async_create_refresh_token(
+        owner, CLIENT_ID)
+    websocket_client = await hass_ws_client(
+        hass, hass.auth.async_create_access_token(refresh_token))
+
+    await websocket_client.send_json({
+        'id': 5,
+        'type': commands.TYPE_GET_QUEUE_STATS,
+    })
+
+    msg = await websocket_client.receive_json()
+    assert msg['id'] == 5
+    assert msg['type'] == const.TYPE_RESULT
+    assert msg['success']
+    assert msg['result'] == [
+        {'pending': 0, 'max_pending': 1, 'coalesced': 0}]
+
+    await websocket_client.close()
+    await hass.async_block_till_done()
+    assert not hass.data[const.DATA_CONNECTIONS]
+
+
+async def test_get_queue_stats_requires_owner(
+        hass, hass_ws_client, hass_access_token):
+    """Test get queue stats command requires an owner."""
+    client = await hass_ws_client(hass, hass_access_token)
+
+    await client.send_json({
+        'id': 5,
+        'type': commands.TYPE_GET_QUEUE_STATS,
+    })
+
+    msg = await client.receive_json()
+    assert not msg['success']
+    assert msg['error']['code'] == 'unauthorized'
@@ -259,3 +259,31 @@ async def test_no_unnecessary_changes(registry):
 
     assert entry.id == entry2.id
     assert len(mock_save.mock_calls) == 0
+
+
+async def test_get_device_by_identifier_and_connection(registry):
+    """Test looking up devices by their identifiers and connections."""
+    first = registry.async_get_or_create(
+        config_entry_id='1234',
+        identifiers={('bridgeid', '0123')})
+    second = registry.async_get_or_create(
+        config_entry_id='1234',
+        connections={('ethernet', '12:34:56:78:90:AB:CD:EF')})
+
+    assert registry.async_get_device({('bridgeid', '0123')}, set()) is first
+    assert registry.async_get_device(
+        set(), {('ethernet', '12:34:56:78:90:AB:CD:EF')}) is second
+    assert registry.async_get_device({('bridgeid', '4567')}, set()) is None
+
+    # Matching several devices returns the first registered one
+    assert registry.async_get_device(
+        {('bridgeid', '0123')},
+        {('ethernet', '12:34:56:78:90:AB:CD:EF')}) is first
+
+    # Merged identifiers are indexed
+    updated = registry.async_get_or_create(
+        config_entry_id='1234',
+        connections={('ethernet', '12:34:56:78:90:AB:CD:EF')},
+        identifiers={('serial', '4567')})
+    assert updated.id == second.id
+    assert registry.async_get_device({('serial', '4567')}, set()) is updated
@@ -11,6 +11,8 @@ import pytest
 
 import homeassistant.core as ha
 import homeassistant.loader as loader
+from homeassistant.const import (
+    EVENT_CALL_SERVICE, EVENT_HOMEASSISTANT_START)
 from homeassistant.exceptions import PlatformNotReady
 from homeassistant.components import group
 from homeassistant.helpers.entity_component import EntityComponent
@@ -140,7 +142,7 @@ class TestHelpersEntityComponent(unittest.TestCase):
             mock_setup.call_args[0]
 
     @patch('homeassistant.helpers.entity_platform.'
-           'async_track_time_interval')
+           'async_track_point_in_utc_time')
     def test_set_scan_interval_via_config(self, mock_track):
         """Test the setting of the scan interval via configuration."""
         def platform_setup(hass, config, add_entities, discovery_info=None):
@@ -161,7 +163,10 @@ class TestHelpersEntityComponent(unittest.TestCase):
 
         self.hass.block_till_done()
         assert mock_track.called
-        assert timedelta(seconds=30) == mock_track.call_args[0][2]
+        entity = list(component.entities)[0]
+        assert timedelta(seconds=30) == entity.platform.scan_interval
+        assert mock_track.call_args[0][2] - dt_util.utcnow() <= \
+            timedelta(seconds=30)
 
     def test_set_entity_namespace_via_config(self):
         """Test setting an entity namespace."""
@@ -431,3 +436,107 @@ async def test_update_entity(hass):
 
     assert len(entity.async_update_ha_state.mock_calls) == 2
     assert entity.async_update_ha_state.mock_calls[-1][1][0] is True
+
+
+async def test_prepare_reload_skip_reset(hass):
+    """Test preparing a reload can keep the entities."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass)
+    await component.async_add_entities([MockEntity(name='keep')])
+
+    with patch('homeassistant.config.async_hass_config_yaml',
+               return_value=mock_coro({DOMAIN: {}})):
+        conf = await component.async_prepare_reload(skip_reset=True)
+
+    assert DOMAIN in conf
+    assert len(list(component.entities)) == 1
+
+    with patch('homeassistant.config.async_hass_config_yaml',
+               return_value=mock_coro({DOMAIN: {}})):
+        await component.async_prepare_reload()
+
+    assert len(list(component.entities)) == 0
+
+
+async def test_group_updated_once_for_batches(hass):
+    """Test batches added at the same time result in one group update."""
+    assert await async_setup_component(hass, 'group', {'group': {}})
+    component = EntityComponent(_LOGGER, DOMAIN, hass, group_name='everyone')
+    calls = []
+    hass.bus.async_listen(
+        EVENT_CALL_SERVICE, ha.callback(
+            lambda event: calls.append(event)
+            if event.data['service'] == 'set' else None))
+
+    await asyncio.wait([
+        component.async_add_entities([MockEntity(name='b{}'.format(idx))
+                                      for idx in range(batch, 20, 4)])
+        for batch in range(4)], loop=hass.loop)
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert hass.states.get('group.everyone').attributes['entity_id'] == \
+        tuple(sorted('test_domain.b{}'.format(idx) for idx in range(20)))
+
+    await component.async_remove_entity('test_domain.b3')
+    await component.async_add_entities([MockEntity(name='a')])
+    await hass.async_block_till_done()
+
+    assert len(calls) == 2
+    entity_ids = hass.states.get('group.everyone').attributes['entity_id']
+    assert entity_ids[0] == 'test_domain.a'
+    assert 'test_domain.b3' not in entity_ids
+    assert len(entity_ids) == 20
+
+
+async def test_group_created_when_started(hass):
+    """Test the group is only created once Home Assistant starts."""
+    assert await async_setup_component(hass, 'group', {'group': {}})
+    hass.state = ha.CoreState.not_running
+    component = EntityComponent(_LOGGER, DOMAIN, hass, group_name='everyone')
+
+    await component.async_add_entities([MockEntity(name='first')])
+    await component.async_add_entities([MockEntity(name='second')])
+    await hass.async_block_till_done()
+
+    assert hass.states.get('group.everyone') is None
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+
+    assert hass.states.get('group.everyone').attributes['entity_id'] == \
+        ('test_domain.first', 'test_domain.second')
+
+
+async def test_group_resorted_after_rename(hass):
+    """Test a renamed entity is moved to its new place in the group."""
+    assert await async_setup_component(hass, 'group', {'group': {}})
+    component = EntityComponent(_LOGGER, DOMAIN, hass, group_name='everyone')
+    entity = MockEntity(name='a')
+
+    await component.async_add_entities([entity, MockEntity(name='b')])
+    await hass.async_block_till_done()
+    assert hass.states.get('group.everyone').attributes['entity_id'] == \
+        ('test_domain.a', 'test_domain.b')
+
+    entity._values['name'] = 'c'
+    await component.async_add_entities([MockEntity(name='d')])
+    await hass.async_block_till_done()
+    assert hass.states.get('group.everyone').attributes['entity_id'] == \
+        ('test_domain.b', 'test_domain.a', 'test_domain.d')
+
+
+async def test_group_update_after_reset(hass):
+    """Test a reset does not leave a pending group update behind."""
+    assert await async_setup_component(hass, 'group', {'group': {}})
+    hass.state = ha.CoreState.not_running
+    component = EntityComponent(_LOGGER, DOMAIN, hass, group_name='everyone')
+
+    await component.async_add_entities([MockEntity(name='first')])
+    await component._async_reset()
+    hass.state = ha.CoreState.running
+
+    await component.async_add_entities([MockEntity(name='second')])
+    await hass.async_block_till_done()
+
+    assert hass.states.get('group.everyone').attributes['entity_id'] == \
+        ('test_domain.second',)
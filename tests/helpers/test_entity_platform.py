@@ -18,7 +18,7 @@ import homeassistant.util.dt as dt_util
 
 from tests.common import (
     get_test_home_assistant, MockPlatform, fire_time_changed, mock_registry,
-    MockEntity, MockEntityPlatform, MockConfigEntry)
+    MockEntity, MockEntityPlatform, MockConfigEntry, async_fire_time_changed)
 
 _LOGGER = logging.getLogger(__name__)
 DOMAIN = "test_domain"
@@ -139,7 +139,7 @@ class TestHelpersEntityPlatform(unittest.TestCase):
         assert not ent.update.called
 
     @patch('homeassistant.helpers.entity_platform.'
-           'async_track_time_interval')
+           'async_track_point_in_utc_time')
     def test_set_scan_interval_via_platform(self, mock_track):
         """Test the setting of the scan interval via platform."""
         def platform_setup(hass, config, add_entities, discovery_info=None):
@@ -161,7 +161,10 @@ class TestHelpersEntityPlatform(unittest.TestCase):
 
         self.hass.block_till_done()
         assert mock_track.called
-        assert timedelta(seconds=30) == mock_track.call_args[0][2]
+        entity = list(component.entities)[0]
+        assert timedelta(seconds=30) == entity.platform.scan_interval
+        assert mock_track.call_args[0][2] - dt_util.utcnow() <= \
+            timedelta(seconds=30)
 
     def test_adding_entities_with_generator_and_thread_callback(self):
         """Test generator in add_entities that calls thread method.
@@ -772,3 +775,98 @@ async def test_device_info_not_overrides(hass):
     assert device.id == device2.id
     assert device2.manufacturer == 'test-manufacturer'
     assert device2.model == 'test-model'
+
+
+async def test_polls_spread_over_scan_interval(hass):
+    """Test entities are polled at their own phase of the scan interval."""
+    scan_interval = timedelta(seconds=30)
+    component = EntityComponent(_LOGGER, DOMAIN, hass, scan_interval)
+    entity_ids = sorted(
+        ('test_domain.kitchen', 'test_domain.hallway'),
+        key=lambda entity_id: entity_platform.poll_offset(
+            entity_id, scan_interval))
+    offsets = [entity_platform.poll_offset(entity_id, scan_interval)
+               for entity_id in entity_ids]
+    assert offsets[1] - offsets[0] > 1
+
+    await component.async_add_entities([
+        MockEntity(entity_id=entity_id, should_poll=True)
+        for entity_id in entity_ids])
+
+    # Run the polls due in the current period
+    period_start = (dt_util.utcnow().timestamp() // 30 + 1) * 30
+    async_fire_time_changed(hass, dt_util.utc_from_timestamp(period_start))
+    await hass.async_block_till_done()
+    stats = hass.helpers.entity_component.async_poll_stats()
+    updates = [stats[entity_id].updates for entity_id in entity_ids]
+
+    async_fire_time_changed(hass, dt_util.utc_from_timestamp(
+        period_start + offsets[0] + 0.5))
+    await hass.async_block_till_done()
+
+    assert stats[entity_ids[0]].updates == updates[0] + 1
+    assert stats[entity_ids[1]].updates == updates[1]
+
+    async_fire_time_changed(hass, dt_util.utc_from_timestamp(
+        period_start + offsets[1] + 0.5))
+    await hass.async_block_till_done()
+
+    assert stats[entity_ids[0]].updates == updates[0] + 1
+    assert stats[entity_ids[1]].updates == updates[1] + 1
+    assert stats[entity_ids[1]].last_duration is not None
+
+
+async def test_poll_overrun_skipped(hass):
+    """Test a poll is skipped while the previous update still runs."""
+    component = EntityComponent(
+        _LOGGER, DOMAIN, hass, timedelta(seconds=20))
+    release = asyncio.Event(loop=hass.loop)
+    updates = []
+
+    async def async_update():
+        """Block until released."""
+        updates.append(None)
+        await release.wait()
+
+    entity = MockEntity(should_poll=True)
+    entity.async_update = async_update
+    await component.async_add_entities([entity])
+
+    now = dt_util.utcnow()
+    async_fire_time_changed(hass, now + timedelta(seconds=20))
+    await asyncio.sleep(0)
+    async_fire_time_changed(hass, now + timedelta(seconds=40))
+    await asyncio.sleep(0)
+
+    assert len(updates) == 1
+    stats = entity.platform.poll_stats[entity.entity_id]
+    assert stats.overruns == 1
+    assert stats.updates == 0
+
+    release.set()
+    await hass.async_block_till_done()
+    assert stats.updates == 1
+
+    # Removed entities are no longer polled
+    await entity.async_remove()
+    assert entity.entity_id not in entity.platform.poll_stats
+    async_fire_time_changed(hass, now + timedelta(seconds=60))
+    await hass.async_block_till_done()
+    assert len(updates) == 1
+
+
+async def test_should_poll_checked_on_every_poll(hass):
+    """Test an entity that starts polling later is polled."""
+    component = EntityComponent(
+        _LOGGER, DOMAIN, hass, timedelta(seconds=20))
+    late = MockEntity(should_poll=False)
+    late.async_update = Mock()
+    await component.async_add_entities([late])
+    await component.async_add_entities([MockEntity(should_poll=True)])
+
+    late._values['should_poll'] = True
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+    await hass.async_block_till_done()
+
+    assert len(late.async_update.mock_calls) == 1
+    assert late.platform.poll_stats[late.entity_id].updates == 1
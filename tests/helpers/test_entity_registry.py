@@ -175,6 +175,30 @@ def test_async_get_entity_id(registry):
     assert registry.async_get_entity_id('light', 'hue', '123') is None
 
 
+async def test_async_get_entity_id_after_rename(registry):
+    """Test the unique id points at the new entity_id after a rename."""
+    registry.async_get_or_create('light', 'hue', '1234')
+    registry.async_update_entity(
+        'light.hue_1234', new_entity_id='light.kitchen')
+
+    assert registry.async_get_entity_id(
+        'light', 'hue', '1234') == 'light.kitchen'
+    assert registry.async_get_or_create(
+        'light', 'hue', '1234').entity_id == 'light.kitchen'
+
+
+async def test_async_get_entity_id_mocked_entries(hass):
+    """Test entries assigned to the registry are indexed."""
+    registry = mock_registry(hass, {
+        'light.kitchen': entity_registry.RegistryEntry(
+            entity_id='light.kitchen', unique_id='1234', platform='hue'),
+    })
+
+    assert registry.async_get_entity_id(
+        'light', 'hue', '1234') == 'light.kitchen'
+    assert registry.async_get_entity_id('switch', 'hue', '1234') is None
+
+
 async def test_updating_config_entry_id(registry):
     """Test that we update config entry id in registry."""
     entry = registry.async_get_or_create(
@@ -12,13 +12,18 @@ from homeassistant.setup import setup_component
 import homeassistant.core as ha
 from homeassistant.const import MATCH_ALL
 from homeassistant.helpers.event import (
+    TRACK_STATE_CHANGE_CALLBACKS,
     async_call_later,
+    async_track_point_in_utc_time,
+    async_track_same_state,
+    async_track_template,
     call_later,
     track_point_in_utc_time,
     track_point_in_time,
     track_utc_time_change,
     track_time_change,
     track_state_change,
+    track_state_change_event,
     track_time_interval,
     track_template,
     track_same_state,
@@ -29,7 +34,8 @@ from homeassistant.helpers.template import Template
 from homeassistant.components import sun
 import homeassistant.util.dt as dt_util
 
-from tests.common import get_test_home_assistant, fire_time_changed
+from tests.common import (
+    get_test_home_assistant, fire_time_changed, async_fire_time_changed)
 from unittest.mock import patch
 
 
@@ -164,6 +170,56 @@ class TestEventHelpers(unittest.TestCase):
         assert 5 == len(wildcard_runs)
         assert 6 == len(wildercard_runs)
 
+    def test_track_state_change_shares_listener(self):
+        """Test state change trackers share one indexed bus listener."""
+        runs = []
+
+        @ha.callback
+        def run_callback(entity_id, old_state, new_state):
+            runs.append(entity_id)
+
+        unsubs = [
+            track_state_change(self.hass, 'light.{}'.format(idx),
+                               run_callback)
+            for idx in range(10)]
+        assert self.hass.bus.listeners['state_changed'] == 1
+
+        self.hass.states.set('light.3', 'on')
+        self.hass.states.set('switch.3', 'on')
+        self.hass.block_till_done()
+        assert runs == ['light.3']
+
+        unsubs.pop(3)()
+        self.hass.states.set('light.3', 'off')
+        self.hass.block_till_done()
+        assert runs == ['light.3']
+
+        for unsub in unsubs:
+            unsub()
+        assert 'state_changed' not in self.hass.bus.listeners
+
+    def test_track_state_change_event(self):
+        """Test tracking state changes of entities and domains."""
+        runs = []
+
+        @ha.callback
+        def run_callback(event):
+            runs.append(event.data['entity_id'])
+
+        unsub = track_state_change_event(
+            self.hass, ['Light.Kitchen'], run_callback, ['sensor'])
+
+        self.hass.states.set('light.kitchen', 'on')
+        self.hass.states.set('light.hallway', 'on')
+        self.hass.states.set('sensor.temperature', '20')
+        self.hass.block_till_done()
+        assert runs == ['light.kitchen', 'sensor.temperature']
+
+        unsub()
+        self.hass.states.set('light.kitchen', 'off')
+        self.hass.block_till_done()
+        assert len(runs) == 2
+
     def test_track_template(self):
         """Test tracking template."""
         specific_runs = []
@@ -771,3 +827,99 @@ def test_async_call_later(hass):
     assert p_action is action
     assert p_point == now + timedelta(seconds=3)
     assert remove is mock()
+
+
+async def test_async_track_point_in_utc_time_loop_timer(hass):
+    """Test point in time listeners fire without time changed events."""
+    runs = []
+
+    async_track_point_in_utc_time(
+        hass, callback(lambda now: runs.append(now)),
+        dt_util.utcnow() + timedelta(milliseconds=50))
+    remove = async_track_point_in_utc_time(
+        hass, callback(lambda now: runs.append(now)),
+        dt_util.utcnow() + timedelta(milliseconds=50))
+    remove()
+
+    await asyncio.sleep(0.2)
+    await hass.async_block_till_done()
+
+    assert len(runs) == 1
+    assert 'time_changed' not in hass.bus.async_listeners()
+
+
+async def test_async_track_template_follows_render(hass):
+    """Test track template only listens to the entities it rendered."""
+    runs = []
+
+    hass.states.async_set('input_boolean.use_a', 'on')
+    template = Template(
+        "{% if is_state('input_boolean.use_a', 'on') %}"
+        "{{ is_state('switch.a', 'on') }}{% else %}"
+        "{{ is_state('switch.b', 'on') }}{% endif %}", hass)
+
+    async_track_template(
+        hass, template, callback(lambda *args: runs.append(args[0])))
+
+    hass.states.async_set('switch.b', 'on')
+    await hass.async_block_till_done()
+    assert runs == []
+
+    hass.states.async_set('switch.a', 'on')
+    await hass.async_block_till_done()
+    assert runs == ['switch.a']
+
+    hass.states.async_set('switch.a', 'off')
+    await hass.async_block_till_done()
+    hass.states.async_set('input_boolean.use_a', 'off')
+    await hass.async_block_till_done()
+    assert runs == ['switch.a', 'input_boolean.use_a']
+    assert set(hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == {
+        'input_boolean.use_a', 'switch.b'}
+
+
+async def test_async_track_same_state_shares_listener(hass):
+    """Test pending periods share one state listener."""
+    runs = []
+
+    for index in range(10):
+        entity_id = 'light.light_{}'.format(index)
+        hass.states.async_set(entity_id, 'on')
+        async_track_same_state(
+            hass, timedelta(minutes=5),
+            callback(lambda entity_id=entity_id: runs.append(entity_id)),
+            lambda _, _2, to_s: to_s.state == 'on', entity_ids=entity_id)
+
+    assert hass.data[TRACK_STATE_CHANGE_CALLBACKS] == {
+        MATCH_ALL: (hass.data[TRACK_STATE_CHANGE_CALLBACKS][MATCH_ALL][0],)}
+
+    # Attribute changes pass the check, a state change cancels the period
+    hass.states.async_set('light.light_1', 'on', {'brightness': 100})
+    hass.states.async_set('light.light_2', 'off')
+    await hass.async_block_till_done()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=5))
+    await hass.async_block_till_done()
+
+    assert sorted(runs) == sorted(
+        'light.light_{}'.format(index) for index in range(10) if index != 2)
+    assert TRACK_STATE_CHANGE_CALLBACKS not in hass.data
+
+
+async def test_async_track_same_state_cancel(hass):
+    """Test cancelling a period removes the state listener when idle."""
+    runs = []
+
+    unsub = async_track_same_state(
+        hass, timedelta(minutes=5), callback(lambda: runs.append(1)),
+        lambda _, _2, to_s: to_s.state == 'on',
+        entity_ids=['light.kitchen', 'light.bed'])
+    assert TRACK_STATE_CHANGE_CALLBACKS in hass.data
+
+    unsub()
+    unsub()
+    assert TRACK_STATE_CHANGE_CALLBACKS not in hass.data
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=5))
+    await hass.async_block_till_done()
+    assert runs == []
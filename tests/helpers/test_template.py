@@ -1023,3 +1023,74 @@ def test_length_of_states(hass):
 
     tpl = template.Template('{{ states.sensor | length }}', hass)
     assert tpl.async_render() == '2'
+
+
+async def test_render_to_info_entities(hass):
+    """Test render info collects the entities that were accessed."""
+    hass.states.async_set('light.kitchen', 'on')
+
+    info = template.Template(
+        "{{ states.light.kitchen.state }} {{ is_state('switch.a', 'on') }} "
+        "{{ state_attr('sensor.b', 'unit') }} {{ states('lock.c') }}",
+        hass).async_render_to_info()
+
+    assert info.result == 'on False None unknown'
+    assert info.entities == {
+        'light.kitchen', 'switch.a', 'sensor.b', 'lock.c'}
+    assert info.domains == set()
+    assert not info.all_states
+    assert info.listeners() == (
+        frozenset(('light.kitchen', 'switch.a', 'sensor.b', 'lock.c')),
+        frozenset())
+
+
+async def test_render_to_info_domains_and_all_states(hass):
+    """Test render info collects iterated domains and all states."""
+    hass.states.async_set('sensor.test', '23')
+
+    info = template.Template(
+        '{{ states.sensor | length }} {{ states.sensor.test.state }}',
+        hass).async_render_to_info()
+    assert info.domains == {'sensor'}
+    assert info.listeners() == (frozenset(), frozenset(('sensor',)))
+
+    info = template.Template(
+        '{{ states | length }}', hass).async_render_to_info()
+    assert info.all_states
+    assert info.listeners() == (frozenset((MATCH_ALL,)), frozenset())
+
+
+async def test_render_to_info_fallback(hass):
+    """Test render info tracks everything when nothing was accessed."""
+    info = template.Template('{{ now() }}', hass).async_render_to_info()
+    assert info.listeners() == (frozenset((MATCH_ALL,)), frozenset())
+
+    info = template.Template(
+        '{{ states.sensor.test.state | no_filter }}',
+        hass).async_render_to_info()
+    assert info.exception is not None
+    assert info.listeners() == (frozenset((MATCH_ALL,)), frozenset())
+
+
+async def test_compiled_template_cache(hass):
+    """Test identical templates share their compiled template."""
+    source = '{{ states("sensor.cache_test") }} cache test'
+    first = template.Template(source, hass)
+    second = template.Template(source, hass)
+
+    before = template.cache_info(hass)
+    assert first.async_render() == 'unknown cache test'
+    assert second.async_render() == 'unknown cache test'
+    after = template.cache_info(hass)
+
+    assert after['compile']['hits'] - before['compile']['hits'] == 1
+    assert after['bind']['hits'] - before.get(
+        'bind', {'hits': 0})['hits'] == 1
+    assert first._compiled is second._compiled
+
+
+async def test_render_to_info_static(hass):
+    """Test render info does not track templates without Jinja syntax."""
+    info = template.Template('static', hass).async_render_to_info()
+    assert info.result == 'static'
+    assert info.listeners() == (frozenset(), frozenset())
@@ -1,15 +1,18 @@
 """Test the bootstrapping."""
 # pylint: disable=protected-access
 import asyncio
+import importlib
 import os
 from unittest.mock import Mock, patch
 import logging
 
 import homeassistant.config as config_util
-from homeassistant import bootstrap
+from homeassistant import bootstrap, loader
 import homeassistant.util.dt as dt_util
 
-from tests.common import patch_yaml_files, get_test_config_dir, mock_coro
+from tests.common import (
+    patch_yaml_files, get_test_config_dir, mock_coro, MockModule,
+    MockPlatform)
 
 ORIG_TIMEZONE = dt_util.DEFAULT_TIME_ZONE
 VERSION_PATH = os.path.join(get_test_config_dir(), config_util.VERSION_FILE)
@@ -52,6 +55,91 @@ def test_home_assistant_core_config_validation(hass):
     assert result is None
 
 
+async def test_requirements_installed_in_one_batch(hass):
+    """Test requirements of components and platforms are batched."""
+    loader.set_component(hass, 'comp_a', MockModule(
+        'comp_a', requirements=['a==1.0'], dependencies=['comp_b']))
+    loader.set_component(hass, 'comp_b', MockModule(
+        'comp_b', requirements=['b==1.0']))
+    loader.set_component(hass, 'switch', MockModule('switch'))
+    loader.set_component(hass, 'switch.plat', MockPlatform(
+        requirements=['plat==1.0'], dependencies=['comp_b']))
+
+    with patch('homeassistant.bootstrap.conf_util.'
+               'process_ha_config_upgrade'), \
+            patch('homeassistant.bootstrap.async_setup_component',
+                  side_effect=lambda *args: mock_coro(True)), \
+            patch('homeassistant.requirements.'
+                  'async_process_requirements_batch',
+                  return_value=mock_coro(True)) as mock_batch:
+        await bootstrap.async_from_config_dict({
+            'comp_a': {},
+            'switch': [{'platform': 'plat'}, {'platform': 'plat'}],
+            'switch 2': {'platform': 'missing'},
+        }, hass)
+
+    assert len(mock_batch.mock_calls) == 1
+    assert mock_batch.mock_calls[0][1][1] == {
+        'comp_a': ['a==1.0'],
+        'comp_b': ['b==1.0'],
+        'switch': [],
+        'switch.plat': ['plat==1.0'],
+    }
+
+    with patch('homeassistant.bootstrap.conf_util.'
+               'process_ha_config_upgrade'), \
+            patch('homeassistant.bootstrap.async_setup_component',
+                  side_effect=lambda *args: mock_coro(True)), \
+            patch('homeassistant.requirements.'
+                  'async_process_requirements_batch',
+                  return_value=mock_coro(True)) as mock_batch:
+        await bootstrap.async_from_config_dict({'comp_a': {}}, hass,
+                                               skip_pip=True)
+
+    assert len(mock_batch.mock_calls) == 0
+
+
+async def test_requirements_collected_without_load_errors(hass, caplog):
+    """Test modules that need their requirements don't log while collected."""
+    import_module = importlib.import_module
+
+    def mock_import_module(name):
+        """Fail to import comp_c as its requirement is not installed."""
+        if name.endswith('.comp_c'):
+            raise ImportError("No module named 'some_lib'")
+        return import_module(name)
+
+    with patch('homeassistant.bootstrap.conf_util.'
+               'process_ha_config_upgrade'), \
+            patch('homeassistant.bootstrap.async_setup_component',
+                  side_effect=lambda *args: mock_coro(True)), \
+            patch('homeassistant.requirements.'
+                  'async_process_requirements_batch',
+                  return_value=mock_coro(True)), \
+            patch('homeassistant.loader.importlib.import_module',
+                  side_effect=mock_import_module):
+        await bootstrap.async_from_config_dict({'comp_c': {}}, hass)
+
+        assert 'comp_c' not in caplog.text
+
+        assert loader.get_component(hass, 'comp_c') is None
+        assert 'Error loading homeassistant.components.comp_c' in \
+            caplog.text
+
+
+async def test_template_cache_info_logged(hass, caplog):
+    """Test the template cache counters are logged after setup."""
+    caplog.set_level(logging.DEBUG, logger='homeassistant.bootstrap')
+
+    with patch('homeassistant.bootstrap.conf_util.'
+               'process_ha_config_upgrade'), \
+            patch('homeassistant.bootstrap.template.cache_info',
+                  return_value={'compile': {'hits': 42}}):
+        await bootstrap.async_from_config_dict({}, hass, skip_pip=True)
+
+    assert "Template caches: {'compile': {'hits': 42}}" in caplog.text
+
+
 def test_from_config_dict_not_mount_deps_folder(loop):
     """Test that we do not mount the deps folder inside from_config_dict."""
     with patch('homeassistant.bootstrap.is_virtual_env', return_value=False), \
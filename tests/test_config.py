@@ -973,3 +973,18 @@ def test_merge_split_component_definition(hass):
     assert len(config['light one']) == 1
     assert len(config['light two']) == 1
     assert len(config['light three']) == 1
+
+
+async def test_loading_executor_workers(hass):
+    """Test the size of executor pools is configurable."""
+    hass.async_get_executor('database')
+
+    await config_util.async_process_ha_core_config(hass, {
+        'executor_workers': {'database': 8, 'io': 2},
+    })
+
+    assert hass.async_get_executor('database').stats['max_workers'] == 8
+    assert hass.async_get_executor('io').stats['max_workers'] == 2
+
+    with pytest.raises(Invalid):
+        config_util.CORE_CONFIG_SCHEMA({'executor_workers': {'io': 0}})
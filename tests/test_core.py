@@ -3,6 +3,7 @@
 import asyncio
 import logging
 import os
+import threading
 import unittest
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
@@ -21,7 +22,8 @@ from homeassistant.const import (
     __version__, EVENT_STATE_CHANGED, ATTR_FRIENDLY_NAME, CONF_UNIT_SYSTEM,
     ATTR_NOW, EVENT_TIME_CHANGED, EVENT_TIMER_OUT_OF_SYNC, ATTR_SECONDS,
     EVENT_HOMEASSISTANT_STOP, EVENT_HOMEASSISTANT_CLOSE,
-    EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED, EVENT_SERVICE_EXECUTED)
+    EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED, EVENT_SERVICE_EXECUTED,
+    EVENT_CALL_SERVICE)
 
 from tests.common import get_test_home_assistant, async_mock_service
 
@@ -1006,3 +1008,65 @@ async def test_service_executed_with_subservices(hass):
     assert [call.service for call in calls] == [
         'outer', 'inner', 'inner', 'outer']
     assert len(hass.bus.async_listeners().get(EVENT_SERVICE_EXECUTED, [])) == 0
+
+
+async def test_service_call_direct_dispatch(hass):
+    """Test services are executed directly and observers see the call."""
+    calls = async_mock_service(hass, 'test', 'direct')
+    events = []
+    executed = []
+
+    hass.bus.async_listen(
+        EVENT_CALL_SERVICE, ha.callback(lambda event: events.append(event)))
+    hass.bus.async_listen(
+        EVENT_SERVICE_EXECUTED,
+        ha.callback(lambda event: executed.append(event)))
+
+    assert await hass.services.async_call(
+        'test', 'direct', {'hello': 'world'}, blocking=True)
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert calls[0].data == {'hello': 'world'}
+    assert len(events) == 1
+    assert events[0].data['service_data'] == {'hello': 'world'}
+    assert len(executed) == 0
+
+
+async def test_service_call_remote_event(hass):
+    """Test service call events from remote instances are executed."""
+    calls = async_mock_service(hass, 'test', 'remote')
+    executed = []
+
+    hass.bus.async_listen(
+        EVENT_SERVICE_EXECUTED,
+        ha.callback(lambda event: executed.append(event)))
+
+    hass.bus.async_fire(EVENT_CALL_SERVICE, {
+        'domain': 'test',
+        'service': 'remote',
+        'service_call_id': 'abcd',
+    }, ha.EventOrigin.remote)
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert executed[0].data['service_call_id'] == 'abcd'
+
+
+async def test_executor_pools(hass):
+    """Test executor jobs run in the requested pool."""
+    def thread_name():
+        """Return the name of the worker thread."""
+        return threading.current_thread().name
+
+    assert not (await hass.async_add_executor_job(thread_name)).startswith(
+        'SyncWorker_io')
+    assert (await hass.async_add_executor_job(
+        thread_name, executor=ha.EXECUTOR_IO)).startswith('SyncWorker_io_')
+
+    stats = hass.executor_stats()
+    assert stats[ha.EXECUTOR_DEFAULT]['started'] >= 1
+    assert stats[ha.EXECUTOR_IO]['max_workers'] == 4
+    assert stats[ha.EXECUTOR_IO]['started'] == 1
+    assert stats[ha.EXECUTOR_IO]['active'] == 0
+    assert ha.EXECUTOR_DATABASE not in stats
@@ -4,7 +4,8 @@ from unittest.mock import patch, call
 
 from homeassistant import loader, setup
 from homeassistant.requirements import (
-    CONSTRAINT_FILE, PackageLoadable, async_process_requirements)
+    CONSTRAINT_FILE, DATA_PKG_CACHE, PackageLoadable,
+    async_process_requirements, async_process_requirements_batch)
 
 import pkg_resources
 
@@ -89,6 +90,61 @@ async def test_install_existing_package(hass):
     assert len(mock_inst.mock_calls) == 0
 
 
+async def test_install_requirements_batch(hass):
+    """Test missing requirements of components are installed at once."""
+    async def loadable(self, req):
+        return req == 'installed==1.0.0'
+
+    with patch('homeassistant.requirements.PackageLoadable.loadable',
+               loadable), \
+            patch('homeassistant.util.package.install_packages',
+                  return_value=True) as mock_inst:
+        hass.data[DATA_PKG_CACHE] = PackageLoadable(hass)
+        hass.data[DATA_PKG_CACHE].dist_cache['stale'] = None
+        assert await async_process_requirements_batch(hass, {
+            'comp_a': ['hello==1.0.0', 'installed==1.0.0'],
+            'comp_b': ['world==2.0.0', 'hello==1.0.0'],
+        })
+
+    assert len(mock_inst.mock_calls) == 1
+    assert mock_inst.mock_calls[0][1][0] == ['hello==1.0.0', 'world==2.0.0']
+    assert hass.data[DATA_PKG_CACHE].dist_cache == {}
+
+
+async def test_install_requirements_batch_met(hass):
+    """Test pip is not run when all requirements are met."""
+    with patch('homeassistant.requirements.PackageLoadable.loadable',
+               return_value=mock_coro(True)), \
+            patch('homeassistant.util.package.install_packages') as mock_inst:
+        assert await async_process_requirements_batch(hass, {
+            'comp_a': ['hello==1.0.0'],
+        })
+
+    assert len(mock_inst.mock_calls) == 0
+
+
+async def test_install_requirements_batch_fails(hass):
+    """Test requirements are installed one by one if the batch fails."""
+    with patch('homeassistant.requirements.PackageLoadable.loadable',
+               side_effect=lambda req: mock_coro(False)), \
+            patch('homeassistant.util.package.install_packages',
+                  return_value=False), \
+            patch('homeassistant.util.package.install_package',
+                  side_effect=lambda req, **kwargs: req != 'bad==1.0.0') \
+            as mock_inst:
+        assert not await async_process_requirements_batch(hass, {
+            'comp_a': ['hello==1.0.0'],
+            'comp_b': ['bad==1.0.0'],
+        })
+
+        assert await async_process_requirements(
+            hass, 'comp_a', ['hello==1.0.0'])
+        assert not await async_process_requirements(
+            hass, 'comp_b', ['bad==1.0.0'])
+
+    assert len(mock_inst.mock_calls) == 2
+
+
 async def test_check_package_global(hass):
     """Test for an installed package."""
     installed_package = list(pkg_resources.working_set)[0].project_name
@@ -0,0 +1,50 @@
+"""Test the coalescing queue."""
+import asyncio
+
+import pytest
+
+from homeassistant.util.coalescing_queue import CoalescingQueue
+
+
+async def test_coalesce_keeps_position(loop):
+    """Test a message replaces the queued message with the same key."""
+    queue = CoalescingQueue(loop)
+    queue.put_nowait('a1', 'a')
+    queue.put_nowait('b1', 'b')
+    queue.put_nowait('plain')
+    queue.put_nowait('a2', 'a')
+
+    assert queue.qsize() == 3
+    assert queue.coalesced == 1
+    assert await queue.get() == 'a2'
+    assert await queue.get_batch() == ['b1', 'plain']
+    assert queue.max_qsize == 3
+
+    # A key that was already read is queued again
+    queue.put_nowait('a3', 'a')
+    assert await queue.get() == 'a3'
+
+
+async def test_maxsize(loop):
+    """Test the queue is bounded, unless a message is replaced."""
+    queue = CoalescingQueue(loop, maxsize=2)
+    queue.put_nowait('a1', 'a')
+    queue.put_nowait('b1', 'b')
+    queue.put_nowait('a2', 'a')
+
+    with pytest.raises(asyncio.QueueFull):
+        queue.put_nowait('c1', 'c')
+
+    with pytest.raises(asyncio.QueueFull):
+        queue.put_nowait('plain')
+
+
+async def test_get_waits(loop):
+    """Test get waits for a message."""
+    queue = CoalescingQueue(loop)
+    task = loop.create_task(queue.get_batch())
+    await asyncio.sleep(0, loop=loop)
+    assert not task.done()
+
+    queue.put_nowait('message')
+    assert await task == ['message']
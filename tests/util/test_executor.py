@@ -0,0 +1,53 @@
+"""Test the instrumented thread pool executor."""
+import threading
+
+import pytest
+
+from homeassistant.util.executor import InstrumentedThreadPoolExecutor
+
+
+def test_stats():
+    """Test the executor keeps track of waiting and running jobs."""
+    executor = InstrumentedThreadPoolExecutor(1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_job():
+        """Block the only worker."""
+        started.set()
+        release.wait(10)
+        return 'blocked'
+
+    first = executor.submit(blocking_job)
+    started.wait(10)
+    second = executor.submit(lambda value: value, 'waited')
+
+    stats = executor.stats
+    assert stats['queued'] == 1
+    assert stats['active'] == 1
+    assert stats['max_workers'] == 1
+    assert stats['started'] == 1
+
+    release.set()
+    assert first.result(10) == 'blocked'
+    assert second.result(10) == 'waited'
+
+    stats = executor.stats
+    assert stats['queued'] == 0
+    assert stats['active'] == 0
+    assert stats['started'] == 2
+    assert stats['wait_time_max'] > 0
+    assert stats['wait_time_avg'] <= stats['wait_time_max']
+    executor.shutdown()
+
+
+def test_set_max_workers():
+    """Test changing the number of workers."""
+    executor = InstrumentedThreadPoolExecutor(1)
+    executor.set_max_workers(3)
+    assert executor.stats['max_workers'] == 3
+
+    with pytest.raises(ValueError):
+        executor.set_max_workers(0)
+
+    executor.shutdown()
@@ -90,6 +90,20 @@ def test_install(mock_sys, mock_popen, mock_env_copy, mock_venv):
     assert mock_popen.return_value.communicate.call_count == 1
 
 
+def test_install_packages(mock_sys, mock_popen, mock_env_copy, mock_venv):
+    """Test installing several packages in one pip run."""
+    env = mock_env_copy()
+    assert package.install_packages([TEST_NEW_REQ, 'hello==1.0.0'], False)
+    assert mock_popen.call_count == 1
+    assert (
+        mock_popen.call_args ==
+        call([
+            mock_sys.executable, '-m', 'pip', 'install', '--quiet',
+            TEST_NEW_REQ, 'hello==1.0.0'
+        ], stdin=PIPE, stdout=PIPE, stderr=PIPE, env=env)
+    )
+
+
 def test_install_upgrade(
         mock_sys, mock_popen, mock_env_copy, mock_venv):
     """Test an upgrade attempt on a package."""